@@ -0,0 +1,247 @@
+# ==============================================================================
+# AGREGAÇÃO ESPACIAL E NÍVEL DE DETALHE DOS MAPAS
+# ==============================================================================
+# Em anos de pico o conjunto filtrado tem centenas de milhares de focos, e
+# enviar todos os pontos ao navegador (JSON do pydeck) trava a página. Aqui
+# os focos são agrupados no servidor em uma grade regular de graus, com
+# contagem e bioma dominante por célula. O tamanho da célula acompanha o
+# zoom escolhido; pontos brutos só são enviados abaixo de um limite.
+# ==============================================================================
+import os
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+# Acima deste número de focos o mapa passa a usar a grade agregada
+LIMITE_PONTOS_BRUTOS = int(os.environ.get("QUEIMADAS_LIMITE_PONTOS", 20_000))
+
+# Níveis de zoom oferecidos pelas páginas de mapa (e pré-renderizados por mapas_renderizados.py)
+NIVEIS_ZOOM = [3.0, 3.5, 4.0, 5.0, 6.0, 7.0]
+
+# Largura aproximada de uma célula da grade na tela, em pixels
+PIXELS_POR_CELULA = 8
+KM_POR_GRAU = 111.32
+
+# Canto de referência da grade (sudoeste do Brasil, com folga)
+ORIGEM_LON, ORIGEM_LAT = -75.0, -35.0
+
+CORES_BIOMA = {
+    'Amazônia': [34, 139, 34],
+    'Cerrado': [255, 165, 0],
+    'Mata Atlântica': [0, 100, 0],
+    'Caatinga': [218, 165, 32],
+    'Pantanal': [0, 191, 255],
+    'Pampa': [189, 183, 107]
+}
+COR_PADRAO = [128, 128, 128]
+
+# Escala divergente do mapa de diferença: queda (azul) → sem mudança → aumento (vermelho)
+ESCALA_DIVERGENTE = np.array([
+    [33, 102, 172], [103, 169, 207], [209, 229, 240], [247, 247, 247],
+    [253, 219, 199], [239, 138, 98], [178, 24, 43],
+], dtype=np.float64)
+
+
+def adicionar_cores(df, cores_bioma=CORES_BIOMA):
+    """Acrescenta as colunas uint8 cor_r/cor_g/cor_b a partir do bioma.
+
+    A cor é resolvida uma vez por categoria e espalhada pelos códigos, em vez
+    de um `.map` linha a linha.
+    """
+    categorias = pd.Categorical(df["bioma"])
+    tabela = np.array([cores_bioma.get(b, COR_PADRAO) for b in categorias.categories] + [COR_PADRAO],
+                      dtype=np.uint8).reshape(-1, 3)
+    rgb = tabela[categorias.codes]  # código -1 (nulo) cai na última linha
+    return df.assign(cor_r=rgb[:, 0], cor_g=rgb[:, 1], cor_b=rgb[:, 2])
+
+
+def tamanho_celula_para_zoom(zoom):
+    """Converte o zoom do mapa (Web Mercator, tiles de 256 px) em graus por célula."""
+    graus_por_pixel = 360.0 / (256 * 2 ** zoom)
+    return graus_por_pixel * PIXELS_POR_CELULA
+
+
+def agregar_em_grade(df, tamanho_graus):
+    """Agrupa os focos em células quadradas de `tamanho_graus`.
+
+    Tudo é feito com operações vetorizadas do NumPy (sem groupby por linha).
+    Retorna um DataFrame com o centro da célula, o total de focos, o bioma
+    dominante e a fração de focos desse bioma.
+    """
+    colunas = ["longitude", "latitude", "contagem", "bioma", "fracao_dominante"]
+    if df.empty:
+        return pd.DataFrame(columns=colunas)
+
+    lon = df["longitude"].to_numpy(np.float64)
+    lat = df["latitude"].to_numpy(np.float64)
+    # Focos sem coordenadas não caem em nenhuma célula
+    validos = np.isfinite(lon) & np.isfinite(lat)
+    if not validos.any():
+        return pd.DataFrame(columns=colunas)
+    ix = np.floor((lon[validos] - ORIGEM_LON) / tamanho_graus).astype(np.int64)
+    iy = np.floor((lat[validos] - ORIGEM_LAT) / tamanho_graus).astype(np.int64)
+    # Índices relativos ao canto da extensão dos dados (como em
+    # diferenca_em_grade): focos a oeste ou ao sul da origem não se misturam
+    # com as células de outra linha; os centros continuam na mesma grade
+    ix0, iy0 = int(ix.min()), int(iy.min())
+    largura = int(ix.max()) - ix0 + 1
+    celula = (iy - iy0) * largura + (ix - ix0)
+
+    categorias = pd.Categorical(df["bioma"])[validos]
+    # Bioma nulo (código -1) ocupa uma posição extra, no fim
+    nomes = np.append(np.asarray(categorias.categories, dtype=object), None)
+    n_biomas = len(nomes)
+    chave = celula * n_biomas + np.where(categorias.codes < 0, n_biomas - 1, categorias.codes)
+
+    # Contagem por (célula, bioma)
+    chaves_unicas, contagens = np.unique(chave, return_counts=True)
+    celula_cb = chaves_unicas // n_biomas
+    bioma_cb = chaves_unicas % n_biomas
+
+    # Bioma dominante: ordena por célula e contagem e fica com o último de cada célula
+    ordem = np.lexsort((contagens, celula_cb))
+    celula_ord = celula_cb[ordem]
+    ultimo = np.r_[celula_ord[1:] != celula_ord[:-1], True]
+    celulas, inverso = np.unique(celula_cb, return_inverse=True)
+    totais = np.bincount(inverso, weights=contagens).astype(np.int64)
+    dominante = bioma_cb[ordem][ultimo]
+    contagem_dominante = contagens[ordem][ultimo]
+
+    return pd.DataFrame({
+        "longitude": ORIGEM_LON + (ix0 + celulas % largura + 0.5) * tamanho_graus,
+        "latitude": ORIGEM_LAT + (iy0 + celulas // largura + 0.5) * tamanho_graus,
+        "contagem": totais,
+        "bioma": nomes[dominante],
+        "fracao_dominante": contagem_dominante / totais,
+    })
+
+
+def construir_camada_focos(df, zoom, cores_bioma=CORES_BIOMA, limite=LIMITE_PONTOS_BRUTOS):
+    """Cria a camada pydeck dos focos: pontos brutos ou grade agregada.
+
+    Usa as colunas cor_r/cor_g/cor_b se já existirem (ver cache_fatias.py).
+    Retorna (camada, tooltip, agregado).
+    """
+    if len(df) <= limite:
+        if "cor_r" not in df.columns:
+            df = adicionar_cores(df, cores_bioma)
+        localizacao = [c for c in ("estado", "municipio") if c in df.columns]
+        dados = df[["longitude", "latitude", "bioma", "cor_r", "cor_g", "cor_b"] + localizacao]
+        camada = pdk.Layer(
+            "ScatterplotLayer", data=dados, get_position='[longitude, latitude]',
+            get_fill_color="[cor_r, cor_g, cor_b]", get_radius=15000, pickable=True, opacity=0.6
+        )
+        html = "<b>Bioma:</b> {bioma}<br/><b>Coords:</b> {latitude:.4f}, {longitude:.4f}"
+        if localizacao == ["estado", "municipio"]:
+            html += "<br/><b>Local:</b> {municipio} ({estado})"
+        tooltip = {"html": html}
+        return camada, tooltip, False
+
+    tamanho = tamanho_celula_para_zoom(zoom)
+    grade = agregar_em_grade(df, tamanho)
+
+    # Cor do bioma dominante, com opacidade proporcional ao log da contagem
+    rgb = np.array([cores_bioma.get(b, COR_PADRAO) for b in grade["bioma"]], dtype=np.int64).reshape(-1, 3)
+    log_contagem = np.log1p(grade["contagem"].to_numpy())
+    alfa = (60 + 195 * log_contagem / max(log_contagem.max(), 1e-9)).astype(np.int64)
+    grade["color"] = np.column_stack([rgb, alfa]).tolist()
+
+    camada = pdk.Layer(
+        "ScatterplotLayer", data=grade, get_position='[longitude, latitude]',
+        get_fill_color="color", get_radius=tamanho * KM_POR_GRAU * 1000 / 2, pickable=True
+    )
+    tooltip = {"html": "<b>Focos na célula:</b> {contagem}<br/><b>Bioma dominante:</b> {bioma}"}
+    return camada, tooltip, True
+
+
+def diferenca_em_grade(df_a, df_b, tamanho_graus):
+    """Conta os focos de dois conjuntos (ex.: dois anos) na mesma grade.
+
+    Os dois conjuntos são binados juntos, em uma única passagem vetorizada.
+    Retorna, por célula com focos em algum dos dois, o centro, as contagens
+    de cada lado, a diferença (b - a), a razão (b + 1) / (a + 1) e o bioma
+    dominante somando os dois lados.
+    """
+    colunas = ["longitude", "latitude", "contagem_a", "contagem_b", "diferenca", "razao", "bioma"]
+    if df_a.empty and df_b.empty:
+        return pd.DataFrame(columns=colunas)
+
+    lon = np.concatenate([df_a["longitude"].to_numpy(np.float64), df_b["longitude"].to_numpy(np.float64)])
+    lat = np.concatenate([df_a["latitude"].to_numpy(np.float64), df_b["latitude"].to_numpy(np.float64)])
+    lado = np.repeat(np.array([0, 1], dtype=np.int64), [len(df_a), len(df_b)])
+    biomas = pd.api.types.union_categoricals(
+        [pd.Categorical(df_a["bioma"]), pd.Categorical(df_b["bioma"])], ignore_order=True
+    )
+    # Focos sem coordenadas não caem em nenhuma célula
+    validos = np.isfinite(lon) & np.isfinite(lat)
+    if not validos.any():
+        return pd.DataFrame(columns=colunas)
+    lon, lat, lado, biomas = lon[validos], lat[validos], lado[validos], biomas[validos]
+
+    ix = np.floor((lon - ORIGEM_LON) / tamanho_graus).astype(np.int64)
+    iy = np.floor((lat - ORIGEM_LAT) / tamanho_graus).astype(np.int64)
+    # Grade densa só sobre a extensão dos dados: contagens por bincount, sem ordenar
+    ix0, iy0 = int(ix.min()), int(iy.min())
+    largura = int(ix.max()) - ix0 + 1
+    n_celulas = largura * (int(iy.max()) - iy0 + 1)
+    celula = (iy - iy0) * largura + (ix - ix0)
+
+    contagens = np.bincount(celula * 2 + lado, minlength=2 * n_celulas).reshape(-1, 2)
+    ocupadas = np.flatnonzero(contagens.sum(axis=1))
+    # Bioma nulo (código -1) ocupa uma posição extra, no fim (como em agregar_em_grade)
+    nomes = np.append(np.asarray(biomas.categories, dtype=object), None)
+    n_biomas = len(nomes)
+    codigos = np.where(biomas.codes < 0, n_biomas - 1, biomas.codes)
+    por_bioma = np.bincount(celula * n_biomas + codigos,
+                            minlength=n_celulas * n_biomas).reshape(-1, n_biomas)[ocupadas]
+
+    a, b = contagens[ocupadas, 0], contagens[ocupadas, 1]
+    return pd.DataFrame({
+        "longitude": ORIGEM_LON + (ix0 + ocupadas % largura + 0.5) * tamanho_graus,
+        "latitude": ORIGEM_LAT + (iy0 + ocupadas // largura + 0.5) * tamanho_graus,
+        "contagem_a": a,
+        "contagem_b": b,
+        "diferenca": b - a,
+        "razao": (b + 1) / (a + 1),
+        "bioma": nomes[por_bioma.argmax(axis=1)],
+    })
+
+
+def diferenca_por_bioma(df_a, df_b):
+    """Focos de cada lado, diferença e variação percentual por bioma."""
+    tabela = pd.DataFrame({
+        "contagem_a": df_a["bioma"].astype(str).value_counts(),
+        "contagem_b": df_b["bioma"].astype(str).value_counts(),
+    }).fillna(0).astype(np.int64)
+    tabela["diferenca"] = tabela["contagem_b"] - tabela["contagem_a"]
+    tabela["variacao"] = tabela["diferenca"] / tabela["contagem_a"].replace(0, np.nan)
+    return tabela.rename_axis("bioma").reset_index().sort_values("diferenca", key=np.abs, ascending=False)
+
+
+def construir_camada_diferenca(grade, tamanho_graus):
+    """Camada pydeck única com a diferença por célula em escala divergente.
+
+    A cor segue o log da diferença (com sinal), normalizado pela maior
+    variação absoluta; células sem mudança ficam quase transparentes.
+    """
+    diferenca = grade["diferenca"].to_numpy(np.float64)
+    escala = np.log1p(np.abs(diferenca)) / max(np.log1p(np.abs(diferenca)).max(initial=0.0), 1e-9)
+    t = np.sign(diferenca) * escala  # em [-1, 1]
+
+    posicao = (t + 1) / 2 * (len(ESCALA_DIVERGENTE) - 1)
+    base = np.minimum(posicao.astype(np.int64), len(ESCALA_DIVERGENTE) - 2)
+    peso = (posicao - base)[:, None]
+    rgb = ESCALA_DIVERGENTE[base] * (1 - peso) + ESCALA_DIVERGENTE[base + 1] * peso
+    alfa = 40 + 200 * escala
+    # Só as colunas usadas na posição, na cor e no tooltip vão para o navegador
+    dados = grade[["longitude", "latitude", "contagem_a", "contagem_b", "diferenca", "bioma"]].assign(
+        longitude=grade["longitude"].round(4), latitude=grade["latitude"].round(4),
+        color=np.column_stack([rgb, alfa]).astype(np.int64).tolist(),
+    )
+
+    camada = pdk.Layer(
+        "ScatterplotLayer", data=dados, get_position='[longitude, latitude]',
+        get_fill_color="color", get_radius=tamanho_graus * KM_POR_GRAU * 1000 / 2, pickable=True
+    )
+    return camada
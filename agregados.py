@@ -0,0 +1,97 @@
+# ==============================================================================
+# CUBO DE AGREGADOS ANO × MÊS × BIOMA
+# ==============================================================================
+# Materializa, uma única vez, as agregações usadas pela página "Análise
+# Histórica" (evolução anual, heatmap de sazonalidade e ciclo por bioma),
+# incluindo os totais de "Todos". As abas passam a fazer apenas consultas em
+# dicionários. Novos meses são somados ao cubo sem reprocessar o histórico.
+#
+# Geração offline (opcional):
+#     python agregados.py dados_para_dashboard.csv cubo_focos.parquet
+# ==============================================================================
+import sys
+
+import pandas as pd
+
+TODOS = "Todos"
+CHAVES = ["bioma", "ano", "mes"]
+VALOR = "contagem_focos"
+
+
+def _somar_por_chave(df):
+    soma = df.groupby(CHAVES, observed=True)[VALOR].sum().astype("int64")
+    # Bioma categórico (tabelas compactas) vira texto no índice do cubo
+    return soma.set_axis(soma.index.set_levels(soma.index.levels[0].astype(str), level="bioma"))
+
+
+class CuboFocos:
+    """Rollup de `contagem_focos` indexado por (bioma, ano, mes).
+
+    `tabela` guarda apenas os biomas reais; as visões prontas de cada bioma
+    (e de "Todos") ficam em `por_ano`, `heatmap` e `sazonal`.
+    """
+
+    def __init__(self, tabela):
+        self.tabela = tabela.sort_index()
+        self.por_ano = {}
+        self.heatmap = {}
+        self.sazonal = {}
+        self._recalcular_visoes(self.biomas + [TODOS])
+
+    @classmethod
+    def a_partir_de_dados(cls, df):
+        return cls(_somar_por_chave(df))
+
+    @property
+    def biomas(self):
+        return sorted(self.tabela.index.get_level_values("bioma").unique())
+
+    @property
+    def total_por_bioma(self):
+        return (self.tabela.groupby(level="bioma").sum()
+                .sort_values(ascending=False).reset_index())
+
+    def atualizar(self, novos_dados):
+        """Soma novas linhas (ex.: um novo mês) ao cubo.
+
+        Só as visões dos biomas afetados e de "Todos" são refeitas, e a
+        partir do próprio cubo, nunca dos dados brutos.
+        """
+        incremento = _somar_por_chave(novos_dados)
+        if incremento.empty:
+            return self
+        self.tabela = self.tabela.add(incremento, fill_value=0).astype(self.tabela.dtype).sort_index()
+        afetados = sorted(incremento.index.get_level_values("bioma").unique())
+        self._recalcular_visoes(afetados + [TODOS])
+        return self
+
+    def _fatia(self, bioma):
+        if bioma == TODOS:
+            return self.tabela.groupby(level=["ano", "mes"]).sum()
+        return self.tabela.xs(bioma, level="bioma")
+
+    def _recalcular_visoes(self, biomas):
+        for bioma in biomas:
+            fatia = self._fatia(bioma)
+            self.por_ano[bioma] = fatia.groupby(level="ano").sum().reset_index()
+            self.heatmap[bioma] = fatia.unstack("mes", fill_value=0)
+            if bioma == TODOS:
+                self.sazonal[bioma] = self.tabela.groupby(level=["bioma", "mes"]).sum().reset_index()
+            else:
+                self.sazonal[bioma] = fatia.groupby(level="mes").sum().reset_index().assign(bioma=bioma)
+
+
+def salvar_cubo(cubo, caminho):
+    cubo.tabela.reset_index().to_parquet(caminho, index=False)
+
+
+def carregar_cubo(caminho):
+    return CuboFocos(pd.read_parquet(caminho).set_index(CHAVES)[VALOR])
+
+
+if __name__ == "__main__":
+    origem = sys.argv[1] if len(sys.argv) > 1 else "dados_para_dashboard.csv"
+    destino = sys.argv[2] if len(sys.argv) > 2 else "cubo_focos.parquet"
+    cubo = CuboFocos.a_partir_de_dados(pd.read_csv(origem))
+    salvar_cubo(cubo, destino)
+    print(f"✅ Cubo com {len(cubo.tabela):,} células salvo em '{destino}'.")
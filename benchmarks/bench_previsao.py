@@ -0,0 +1,88 @@
+# ==============================================================================
+# MICRO-BENCHMARK - PREVISÃO DE UMA LINHA
+# ==============================================================================
+# Compara a latência por chamada do caminho original da página de previsão
+# (DataFrame de 17 colunas + modelo.predict) com a floresta compilada de
+# modelo_risco.py, e confere que os dois caminhos dão o mesmo resultado.
+#
+# Uso:
+#     python benchmarks/bench_previsao.py [--modelo modelo_risco_fogo.joblib] [--repeticoes 200]
+# ==============================================================================
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import modelo_risco  # noqa: E402
+
+
+def prever_com_dataframe(modelo, dias_sem_chuva, precipitacao, mes, latitude, longitude, bioma, satelite):
+    # Reprodução do caminho original de app.py
+    input_df = pd.DataFrame(0, index=[0], columns=modelo_risco.COLUNAS_DO_MODELO)
+    input_df['dias_sem_chuva'] = dias_sem_chuva
+    input_df['precipitacao'] = precipitacao
+    input_df['mes'] = mes
+    input_df['latitude'] = latitude
+    input_df['longitude'] = longitude
+    if f'bioma_{bioma}' in input_df.columns:
+        input_df[f'bioma_{bioma}'] = 1
+    if f'satelite_{satelite}' in input_df.columns:
+        input_df[f'satelite_{satelite}'] = 1
+    return modelo.predict(input_df)[0]
+
+
+def gerar_entradas(n, semente=0):
+    rng = np.random.default_rng(semente)
+    biomas = modelo_risco.opcoes_categoria("bioma_", modelo_risco.BIOMA_BASE)
+    satelites = modelo_risco.opcoes_categoria("satelite_", modelo_risco.SATELITE_BASE)
+    return [
+        (int(rng.integers(0, 101)), float(rng.uniform(0, 200)), int(rng.integers(1, 13)),
+         float(rng.uniform(-34, 5)), float(rng.uniform(-74, -34)),
+         str(rng.choice(biomas)), str(rng.choice(satelites)))
+        for _ in range(n)
+    ]
+
+
+def medir(funcao, entradas):
+    tempos = np.empty(len(entradas))
+    for i, entrada in enumerate(entradas):
+        inicio = time.perf_counter()
+        funcao(*entrada)
+        tempos[i] = time.perf_counter() - inicio
+    return tempos * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência da previsão de uma linha.")
+    parser.add_argument("--modelo", default="modelo_risco_fogo.joblib")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args()
+
+    modelo = joblib.load(args.modelo)
+    inicio = time.perf_counter()
+    floresta = modelo_risco.FlorestaCompilada.a_partir_de_modelo(modelo)
+    print(f"Compilação da floresta: {time.perf_counter() - inicio:.3f} s "
+          f"({floresta.n_arvores} árvores, {len(floresta.valor):,} nós, profundidade {floresta.profundidade})")
+
+    entradas = gerar_entradas(args.repeticoes)
+    divergencias = sum(
+        prever_com_dataframe(modelo, *e) != floresta.prever_um(*e) for e in entradas
+    )
+    print(f"Divergências em relação a modelo.predict: {divergencias} de {len(entradas)}")
+
+    for nome, funcao in [
+        ("DataFrame + modelo.predict", lambda *e: prever_com_dataframe(modelo, *e)),
+        ("FlorestaCompilada.prever_um", floresta.prever_um),
+    ]:
+        medir(funcao, entradas[:10])  # aquecimento
+        tempos = medir(funcao, entradas)
+        print(f"{nome:<30} mediana {np.median(tempos):9.1f} µs   p95 {np.percentile(tempos, 95):9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
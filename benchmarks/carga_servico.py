@@ -0,0 +1,73 @@
+# ==============================================================================
+# TESTE DE CARGA - SERVIÇO DE PREVISÃO
+# ==============================================================================
+# Dispara requisições concorrentes contra uma instância local de
+# servico_previsao.py e reporta vazão e percentis de latência. Sem --url, sobe
+# o serviço no próprio processo em uma porta livre.
+#
+# Uso:
+#     python benchmarks/carga_servico.py [--url http://127.0.0.1:8000]
+#                                        [--requisicoes 5000] [--concorrencia 32]
+# ==============================================================================
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import servico_previsao  # noqa: E402
+from bench_previsao import gerar_entradas  # noqa: E402
+
+CAMPOS = ("dias_sem_chuva", "precipitacao", "mes", "latitude", "longitude", "bioma", "satelite")
+
+
+def enviar(url, registro):
+    requisicao = urllib.request.Request(
+        f"{url}/prever", data=json.dumps(registro).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST",
+    )
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(requisicao) as resposta:
+        resposta.read()
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço de previsão.")
+    parser.add_argument("--url")
+    parser.add_argument("--modelo", default="modelo_risco_fogo.joblib")
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    parser.add_argument("--concorrencia", type=int, default=32)
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        servidor = servico_previsao.criar_servidor(args.modelo, porta=0)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    registros = [dict(zip(CAMPOS, e)) for e in gerar_entradas(args.requisicoes)]
+    enviar(url, registros[0])  # aquecimento
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concorrencia) as executor:
+        latencias = np.array(list(executor.map(lambda r: enviar(url, r), registros))) * 1000
+    duracao = time.perf_counter() - inicio
+
+    print(f"{args.requisicoes} requisições, concorrência {args.concorrencia}: "
+          f"{args.requisicoes / duracao:,.0f} req/s")
+    print(f"Latência (ms): p50 {np.percentile(latencias, 50):.2f}  "
+          f"p95 {np.percentile(latencias, 95):.2f}  p99 {np.percentile(latencias, 99):.2f}")
+    with urllib.request.urlopen(f"{url}/saude") as resposta:
+        saude = json.loads(resposta.read())
+    print(f"Lotes avaliados: {saude['lotes']} ({saude['registros'] / max(saude['lotes'], 1):.1f} registros/lote)")
+
+
+if __name__ == "__main__":
+    main()
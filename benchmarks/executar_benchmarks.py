@@ -0,0 +1,221 @@
+# ==============================================================================
+# BENCHMARKS DO CAMINHO DE DADOS DE CADA PÁGINA
+# ==============================================================================
+# Executa, sem o Streamlit, o caminho de dados de cada página do dashboard
+# sobre os conjuntos gerados por gerar_dados_sinteticos.py:
+#   - analise_historica: leitura da tabela, cubo ano × mês × bioma e gráficos
+#   - mapa_anual:        filtragem (ano mais recente, todos os biomas), camada
+#                        pydeck e serialização JSON do mapa
+#   - comparativo_mapas: o mesmo para dois anos
+#   - previsao_risco:    compilação da floresta, previsões de uma linha e um lote
+#
+# Cada (página, tamanho) roda em um processo novo, para medir tempo de parede
+# e pico de memória (ru_maxrss) de forma isolada. Os resultados são gravados
+# em benchmarks/resultados/<commit>.json para comparação entre commits.
+#
+# Uso:
+#     python benchmarks/executar_benchmarks.py dados_sinteticos/10k dados_sinteticos/1M
+#                                              [--modelo modelo_risco_fogo.joblib]
+#     python benchmarks/executar_benchmarks.py --comparar resultados/a.json resultados/b.json
+# ==============================================================================
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+DIRETORIO_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+PAGINAS = ["analise_historica", "mapa_anual", "comparativo_mapas", "previsao_risco"]
+
+
+class Cronometro:
+    """Tempo de cada etapa nomeada de uma página."""
+
+    def __init__(self):
+        self.etapas = {}
+
+    def medir(self, nome, funcao, *args, **kwargs):
+        inicio = time.perf_counter()
+        resultado = funcao(*args, **kwargs)
+        self.etapas[nome] = time.perf_counter() - inicio
+        return resultado
+
+
+def _fonte_mapa(diretorio):
+    import cache_fatias
+    import dados_mapa
+    import tabelas_compartilhadas
+
+    caminho_parquet = os.path.join(diretorio, dados_mapa.CAMINHO_PARQUET_MAPA)
+    if dados_mapa.existe_parquet_mapa(caminho_parquet):
+        dataset = dados_mapa.abrir_dataset_mapa(caminho_parquet)
+        return dados_mapa.listar_particoes(dataset), cache_fatias.CacheFatiasMapa.para_dataset(dataset)
+    df = tabelas_compartilhadas.carregar_tabela_compartilhada(os.path.join(diretorio, dados_mapa.CAMINHO_CSV_MAPA))
+    anos_biomas = sorted(int(a) for a in df["ano"].unique()), sorted(df["bioma"].unique())
+    return anos_biomas, cache_fatias.CacheFatiasMapa.para_tabela(df)
+
+
+def _deck_json(fatia):
+    import pydeck as pdk
+
+    import agregacao_espacial
+
+    camada, tooltip, _ = agregacao_espacial.construir_camada_focos(fatia, 3.5)
+    view_state = pdk.ViewState(latitude=-14, longitude=-55, zoom=3.5, pitch=0)
+    return pdk.Deck(layers=[camada], initial_view_state=view_state, tooltip=tooltip).to_json()
+
+
+def pagina_analise_historica(diretorio, cronometro, **_):
+    import plotly.express as px
+
+    import agregados
+    import tabelas_compartilhadas
+
+    df = cronometro.medir("carregamento", tabelas_compartilhadas.carregar_tabela_compartilhada,
+                          os.path.join(diretorio, "dados_para_dashboard.csv"))
+    cubo = cronometro.medir("agregacao", agregados.CuboFocos.a_partir_de_dados, df)
+
+    def graficos():
+        for bioma in [agregados.TODOS] + cubo.biomas:
+            px.line(cubo.por_ano[bioma], x="ano", y="contagem_focos")
+            px.imshow(cubo.heatmap[bioma])
+            px.line(cubo.sazonal[bioma], x="mes", y="contagem_focos", color="bioma")
+
+    cronometro.medir("graficos", graficos)
+
+
+def pagina_mapa_anual(diretorio, cronometro, **_):
+    (anos, biomas), cache = cronometro.medir("carregamento", _fonte_mapa, diretorio)
+    fatia = cronometro.medir("filtragem", cache.obter, max(anos), biomas)
+    cronometro.medir("filtragem_cache", cache.obter, max(anos), biomas)
+    cronometro.medir("camada_json", _deck_json, fatia)
+
+
+def pagina_comparativo_mapas(diretorio, cronometro, **_):
+    (anos, biomas), cache = cronometro.medir("carregamento", _fonte_mapa, diretorio)
+    ano_a, ano_b = sorted(anos)[-2:] if len(anos) > 1 else (anos[0], anos[0])
+    fatias = cronometro.medir("filtragem", lambda: [cache.obter(ano_a, biomas), cache.obter(ano_b, biomas)])
+    cronometro.medir("camada_json", lambda: [_deck_json(f) for f in fatias])
+
+
+def pagina_previsao_risco(diretorio, cronometro, modelo=None, **_):
+    import joblib
+    import numpy as np
+
+    import modelo_risco
+    from bench_previsao import gerar_entradas
+
+    if not modelo or not os.path.exists(modelo):
+        raise FileNotFoundError("modelo não informado (--modelo)")
+    carregado = cronometro.medir("carregamento", joblib.load, modelo)
+    floresta = cronometro.medir("compilacao", modelo_risco.FlorestaCompilada.a_partir_de_modelo, carregado)
+    entradas = gerar_entradas(1000)
+    cronometro.medir("previsao_1000_unitarias", lambda: [floresta.prever_um(*e) for e in entradas])
+    rng, n = np.random.default_rng(0), 100_000
+    lote = modelo_risco.codificar_lote(
+        rng.integers(0, 101, n), rng.uniform(0, 200, n), rng.integers(1, 13, n),
+        rng.uniform(-34, 5, n), rng.uniform(-74, -34, n),
+        rng.choice(modelo_risco.opcoes_categoria("bioma_", modelo_risco.BIOMA_BASE), n),
+        rng.choice(modelo_risco.opcoes_categoria("satelite_", modelo_risco.SATELITE_BASE), n),
+    )
+    cronometro.medir("previsao_lote_100k", floresta.prever, lote)
+
+
+def executar_pagina(pagina, diretorio, modelo):
+    """Roda uma página neste processo e devolve as métricas."""
+    sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+    cronometro = Cronometro()
+    rss_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        globals()[f"pagina_{pagina}"](diretorio, cronometro, modelo=modelo)
+    except Exception as excecao:
+        erro = f"{type(excecao).__name__}: {excecao}"
+    return {
+        "pagina": pagina,
+        "dados": os.path.basename(os.path.normpath(diretorio)),
+        "tempo_total_s": time.perf_counter() - inicio,
+        "etapas_s": cronometro.etapas,
+        # ru_maxrss é em KB no Linux e em bytes no macOS
+        "pico_memoria_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform != "darwin" else 1024 ** 2),
+        "pico_memoria_inicial_mb": rss_inicial / (1024 if sys.platform != "darwin" else 1024 ** 2),
+        "erro": erro,
+    }
+
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "sem-git"
+
+
+def comparar(caminho_a, caminho_b):
+    with open(caminho_a) as a, open(caminho_b) as b:
+        antes, depois = json.load(a), json.load(b)
+    indice = {(r["pagina"], r["dados"]): r for r in antes["resultados"]}
+    print(f"{'página':<20} {'dados':<10} {'tempo (s)':>22} {'pico memória (MB)':>26}")
+    for r in depois["resultados"]:
+        base = indice.get((r["pagina"], r["dados"]))
+        if base is None or r["erro"] or base["erro"]:
+            continue
+        print(f"{r['pagina']:<20} {r['dados']:<10} "
+              f"{base['tempo_total_s']:9.3f} → {r['tempo_total_s']:9.3f} "
+              f"{base['pico_memoria_mb']:11.0f} → {r['pico_memoria_mb']:9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do caminho de dados das páginas.")
+    parser.add_argument("diretorios", nargs="*")
+    parser.add_argument("--modelo")
+    parser.add_argument("--paginas", nargs="+", default=PAGINAS, choices=PAGINAS)
+    parser.add_argument("--saida")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"))
+    parser.add_argument("--executar-pagina", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+    if args.executar_pagina:
+        print(json.dumps(executar_pagina(args.executar_pagina, args.diretorios[0], args.modelo)))
+        return
+
+    resultados = []
+    for diretorio in args.diretorios:
+        for pagina in args.paginas:
+            comando = [sys.executable, os.path.abspath(__file__), diretorio, "--executar-pagina", pagina]
+            if args.modelo:
+                comando += ["--modelo", args.modelo]
+            saida = subprocess.run(comando, capture_output=True, text=True, check=True)
+            resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+            resultados.append(resultado)
+            situacao = resultado["erro"] or ", ".join(f"{k} {v:.3f}s" for k, v in resultado["etapas_s"].items())
+            print(f"{pagina:<20} {resultado['dados']:<10} {resultado['tempo_total_s']:8.3f} s "
+                  f"{resultado['pico_memoria_mb']:8.0f} MB  ({situacao})")
+
+    commit = commit_atual()
+    os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+    saida = args.saida or os.path.join(DIRETORIO_RESULTADOS, f"{commit}.json")
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump({
+            "commit": commit,
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "maquina": platform.platform(),
+            "cpus": os.cpu_count(),
+            "resultados": resultados,
+        }, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados salvos em '{saida}'.")
+
+
+if __name__ == "__main__":
+    main()
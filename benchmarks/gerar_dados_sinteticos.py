@@ -0,0 +1,139 @@
+# ==============================================================================
+# GERADOR DE DADOS SINTÉTICOS PARA BENCHMARKS
+# ==============================================================================
+# Gera um conjunto de dados do mapa (focos individuais) e o respectivo
+# 'dados_para_dashboard.csv' (contagem por ano × mês × bioma) em tamanhos
+# configuráveis, para medir o dashboard em escala. As proporções por bioma e
+# a sazonalidade mensal de cada bioma vêm do 'dados_para_dashboard.csv' real
+# do repositório; a distribuição entre os anos segue, de forma aproximada,
+# os totais anuais do INPE de 2003 a 2025. As posições são sorteadas em
+# torno de uma região típica de cada bioma (aproximação grosseira, suficiente
+# para exercitar filtros e agregação espacial).
+#
+# Os focos são gerados e gravados em blocos, com memória limitada, direto no
+# formato das páginas de mapa (Parquet particionado por ano/bioma ou CSV).
+#
+# Uso:
+#     python benchmarks/gerar_dados_sinteticos.py --focos 1000000 --destino dados_sinteticos/1M
+#     (tamanhos típicos: 10000, 1000000, 50000000)
+# ==============================================================================
+import argparse
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dados_mapa  # noqa: E402
+import modelo_risco  # noqa: E402
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pesos relativos aproximados dos focos anuais do INPE (satélite de referência)
+PESOS_ANO = {
+    2003: 340, 2004: 380, 2005: 362, 2006: 249, 2007: 393, 2008: 211, 2009: 123,
+    2010: 319, 2011: 132, 2012: 193, 2013: 115, 2014: 183, 2015: 236, 2016: 184,
+    2017: 207, 2018: 132, 2019: 197, 2020: 222, 2021: 184, 2022: 200, 2023: 189,
+    2024: 278, 2025: 80,
+}
+
+# Região típica de cada bioma: (lon central, lat central, desvio lon, desvio lat)
+REGIAO_BIOMA = {
+    "Amazônia": (-60.0, -5.0, 6.0, 4.0),
+    "Cerrado": (-48.0, -13.0, 4.0, 4.0),
+    "Caatinga": (-40.0, -8.0, 2.5, 2.5),
+    "Mata Atlântica": (-44.0, -20.0, 3.0, 4.0),
+    "Pantanal": (-57.0, -18.0, 1.0, 1.2),
+    "Pampa": (-54.0, -30.5, 1.5, 1.0),
+}
+
+TAMANHO_BLOCO = 1_000_000
+
+
+def distribuicoes_reais(caminho=os.path.join(RAIZ, "dados_para_dashboard.csv")):
+    """(biomas, peso de cada bioma, matriz bioma × mês de pesos sazonais)."""
+    df = pd.read_csv(caminho)
+    por_bioma_mes = df.pivot_table(index="bioma", columns="mes", values="contagem_focos",
+                                   aggfunc="sum", fill_value=0).reindex(columns=range(1, 13), fill_value=0)
+    biomas = list(por_bioma_mes.index)
+    totais = por_bioma_mes.sum(axis=1).to_numpy(dtype=float)
+    sazonalidade = por_bioma_mes.to_numpy(dtype=float) + 1.0
+    return biomas, totais / totais.sum(), sazonalidade / sazonalidade.sum(axis=1, keepdims=True)
+
+
+def gerar_bloco(rng, n, biomas, pesos_bioma, sazonalidade):
+    anos = np.array(list(PESOS_ANO))
+    pesos_ano = np.array(list(PESOS_ANO.values()), dtype=float)
+    codigo_bioma = rng.choice(len(biomas), size=n, p=pesos_bioma)
+
+    # Mês sorteado conforme a sazonalidade do bioma (amostragem inversa vetorizada)
+    acumulada = np.cumsum(sazonalidade, axis=1)[codigo_bioma]
+    mes = (rng.random(n)[:, None] > acumulada).sum(axis=1) + 1
+
+    regioes = np.array([REGIAO_BIOMA.get(b, (-55.0, -12.0, 5.0, 5.0)) for b in biomas])[codigo_bioma]
+    longitude = np.clip(rng.normal(regioes[:, 0], regioes[:, 2]), -73.9, -34.1)
+    latitude = np.clip(rng.normal(regioes[:, 1], regioes[:, 3]), -33.7, 5.2)
+
+    # Meteorologia coerente com a estação seca (jul-out)
+    seca = np.isin(mes, [7, 8, 9, 10])
+    dias_sem_chuva = np.minimum(rng.gamma(np.where(seca, 4.0, 1.2), 8.0), 120).astype(np.int16)
+    precipitacao = np.round(rng.exponential(np.where(seca, 0.5, 6.0)), 1)
+    risco_fogo = np.clip(0.15 + dias_sem_chuva / 60 - precipitacao / 20 + rng.normal(0, 0.1, n), 0, 1)
+    satelites = modelo_risco.opcoes_categoria("satelite_", modelo_risco.SATELITE_BASE)
+
+    return pd.DataFrame({
+        "ano": rng.choice(anos, size=n, p=pesos_ano / pesos_ano.sum()),
+        "mes": mes,
+        "bioma": np.asarray(biomas)[codigo_bioma],
+        "latitude": np.round(latitude, 5),
+        "longitude": np.round(longitude, 5),
+        "satelite": rng.choice(satelites, size=n),
+        "dias_sem_chuva": dias_sem_chuva,
+        "precipitacao": precipitacao,
+        "risco_fogo": np.round(risco_fogo, 3),
+    })
+
+
+def gerar(focos, destino, formato="parquet", semente=0, tamanho_bloco=TAMANHO_BLOCO):
+    if os.path.exists(destino):
+        shutil.rmtree(destino)
+    os.makedirs(destino)
+    rng = np.random.default_rng(semente)
+    biomas, pesos_bioma, sazonalidade = distribuicoes_reais()
+
+    caminho_parquet = os.path.join(destino, dados_mapa.CAMINHO_PARQUET_MAPA)
+    caminho_csv = os.path.join(destino, dados_mapa.CAMINHO_CSV_MAPA)
+    contagens = None
+    for i, inicio in enumerate(range(0, focos, tamanho_bloco)):
+        bloco = gerar_bloco(rng, min(tamanho_bloco, focos - inicio), biomas, pesos_bioma, sazonalidade)
+        if formato == "parquet":
+            dados_mapa.escrever_bloco_parquet(bloco, caminho_parquet, i)
+        else:
+            bloco.to_csv(caminho_csv, mode="a", header=(i == 0), index=False)
+        parcial = bloco.groupby(["ano", "mes", "bioma"]).size()
+        contagens = parcial if contagens is None else contagens.add(parcial, fill_value=0)
+
+    dashboard = contagens.astype("int64").rename("contagem_focos").reset_index()
+    dashboard.to_csv(os.path.join(destino, "dados_para_dashboard.csv"), index=False)
+    return len(dashboard)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos do dashboard e do mapa.")
+    parser.add_argument("--focos", type=int, default=1_000_000)
+    parser.add_argument("--destino", required=True)
+    parser.add_argument("--formato", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    linhas_dashboard = gerar(args.focos, args.destino, args.formato, args.semente)
+    print(f"✅ {args.focos:,} focos ({args.formato}) e {linhas_dashboard:,} linhas do dashboard "
+          f"em '{args.destino}' ({time.perf_counter() - inicio:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
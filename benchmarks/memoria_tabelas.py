@@ -0,0 +1,68 @@
+# ==============================================================================
+# RELATÓRIO DE MEMÓRIA - TABELAS DO DASHBOARD E DO MAPA
+# ==============================================================================
+# Compara o footprint dos DataFrames carregados como antes (pd.read_csv com
+# tipos padrão) e com tipos compactos mapeados de Arrow IPC. Também mostra
+# quanto da memória residente do processo é privada (anônima) e quanto é
+# página de arquivo compartilhável entre processos (Linux, /proc/self/status).
+#
+# Uso:
+#     python benchmarks/memoria_tabelas.py [dados_para_dashboard.csv dados_para_mapa.csv ...]
+# ==============================================================================
+import gc
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tabelas_compartilhadas  # noqa: E402
+
+
+def rss_mb():
+    """(privada, compartilhável) da memória residente, em MB."""
+    campos = {}
+    try:
+        with open("/proc/self/status") as arquivo:
+            for linha in arquivo:
+                nome, _, valor = linha.partition(":")
+                if nome in ("RssAnon", "RssFile"):
+                    campos[nome] = int(valor.split()[0]) / 1024
+    except FileNotFoundError:
+        return float("nan"), float("nan")
+    return campos.get("RssAnon", float("nan")), campos.get("RssFile", float("nan"))
+
+
+def main():
+    arquivos = sys.argv[1:] or ["dados_para_dashboard.csv", "dados_para_mapa.csv"]
+    for caminho in arquivos:
+        if not os.path.exists(caminho):
+            print(f"(ignorado: '{caminho}' não encontrado)")
+            continue
+
+        gc.collect()
+        privada_0, _ = rss_mb()
+        df = pd.read_csv(caminho)
+        antes = tabelas_compartilhadas.memoria_dataframe(df)
+        privada_csv = rss_mb()[0] - privada_0
+        del df
+        gc.collect()
+
+        tabelas_compartilhadas.converter_csv_para_arrow(caminho)
+        privada_0, arquivo_0 = rss_mb()
+        df = tabelas_compartilhadas.carregar_tabela_compartilhada(caminho)
+        depois = tabelas_compartilhadas.memoria_dataframe(df)
+        df.select_dtypes("number").sum()  # toca todas as páginas mapeadas
+        privada_mmap, arquivo_mmap = rss_mb()
+        del df
+
+        print(f"\n{caminho}")
+        print(f"  DataFrame (deep): {antes / 1e6:10.2f} MB  →  {depois / 1e6:10.2f} MB "
+              f"({antes / max(depois, 1):.1f}x menor)")
+        print(f"  RSS privada do processo: +{privada_csv:8.1f} MB (read_csv)  vs  "
+              f"+{privada_mmap - privada_0:8.1f} MB (Arrow mmap, "
+              f"+{arquivo_mmap - arquivo_0:.1f} MB em páginas compartilhadas)")
+
+
+if __name__ == "__main__":
+    main()
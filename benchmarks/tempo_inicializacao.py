@@ -0,0 +1,85 @@
+# ==============================================================================
+# TEMPO DE INICIALIZAÇÃO (PARTIDA A FRIO) DO DASHBOARD
+# ==============================================================================
+# Mede, em processos Python novos, quanto tempo o app leva para executar a
+# primeira vez e desenhar uma página (time-to-first-paint do lado do
+# servidor, via streamlit.testing.AppTest), e quais bibliotecas pesadas
+# acabaram importadas. Com --revisao, mede também o app.py de uma revisão do
+# git (ex.: o commit anterior à divisão em páginas) para comparação.
+#
+# Uso (na raiz do repositório):
+#     python benchmarks/tempo_inicializacao.py [--pagina "Página Inicial"]
+#                                              [--revisao HEAD~1] [--repeticoes 3]
+# ==============================================================================
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BIBLIOTECAS_PESADAS = ("pandas", "pyarrow", "plotly", "pydeck", "joblib", "sklearn")
+
+CODIGO_MEDICAO = """
+import json, sys, time
+caminho_app, pagina, bibliotecas = sys.argv[1], sys.argv[2], sys.argv[3].split(",")
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+importacao = time.perf_counter() - inicio
+app = AppTest.from_file(caminho_app, default_timeout=600)
+inicio = time.perf_counter()
+app.run()
+if pagina != "Página Inicial":
+    app.sidebar.radio[0].set_value(pagina).run()
+primeira_pintura = time.perf_counter() - inicio
+print(json.dumps({
+    "importacao_streamlit_s": importacao,
+    "primeira_pintura_s": primeira_pintura,
+    "excecao": bool(app.exception),
+    "bibliotecas": [b for b in bibliotecas if b in sys.modules],
+}))
+"""
+
+
+def medir(caminho_app, pagina, repeticoes):
+    resultados = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", CODIGO_MEDICAO, caminho_app, pagina, ",".join(BIBLIOTECAS_PESADAS)],
+            cwd=RAIZ, capture_output=True, text=True, check=True,
+        )
+        resultados.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    return resultados
+
+
+def relatar(rotulo, resultados):
+    tempos = [r["primeira_pintura_s"] for r in resultados]
+    print(f"{rotulo:<22} primeira pintura: mediana {statistics.median(tempos):6.2f} s "
+          f"(min {min(tempos):.2f}, máx {max(tempos):.2f})  "
+          f"bibliotecas: {', '.join(resultados[0]['bibliotecas']) or '-'}"
+          + ("  ⚠️ exceção no app" if any(r["excecao"] for r in resultados) else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de partida a frio do dashboard.")
+    parser.add_argument("--pagina", default="Página Inicial")
+    parser.add_argument("--revisao", help="revisão do git cujo app.py também será medido")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.revisao:
+        caminho_antigo = os.path.join(RAIZ, f".app_{args.revisao.replace('/', '_').replace('~', '_')}.py")
+        with open(caminho_antigo, "w", encoding="utf-8") as arquivo:
+            arquivo.write(subprocess.run(["git", "show", f"{args.revisao}:app.py"], cwd=RAIZ,
+                                         capture_output=True, text=True, check=True).stdout)
+        try:
+            relatar(f"app.py @ {args.revisao}", medir(caminho_antigo, args.pagina, args.repeticoes))
+        finally:
+            os.remove(caminho_antigo)
+
+    relatar("app.py atual", medir(os.path.join(RAIZ, "app.py"), args.pagina, args.repeticoes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# ==============================================================================
+# CACHE LRU DE FATIAS FILTRADAS DO MAPA
+# ==============================================================================
+# Cada movimento do slider ou do multiselect refazia o filtro
+# `ano == ... & bioma.isin(...)` sobre a tabela inteira e o mapeamento de
+# cores linha a linha. Aqui cada fatia (ano, conjunto de biomas) é guardada
+# já com as colunas de cor, em um cache limitado por bytes com descarte do
+# item usado há mais tempo (LRU) e contadores de acertos/faltas.
+#
+# Numa falta, a fatia vem de:
+#   - o dataset Parquet particionado (lê só as partições pedidas), ou
+#   - a tabela em memória, via um índice por ano (posições das linhas de
+#     cada ano), sem varrer a tabela inteira.
+# ==============================================================================
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import agregacao_espacial
+import dados_mapa
+
+MAX_BYTES_PADRAO = 256 * 1024 ** 2
+
+
+class IndiceAnualMapa:
+    """Posições das linhas de cada ano em uma tabela (sem copiar a tabela)."""
+
+    def __init__(self, df):
+        self.df = df
+        self.colunas = dados_mapa.colunas_mapa(df.columns)
+        anos = df["ano"].to_numpy()
+        tipo = np.int32 if len(df) < 2 ** 31 else np.int64
+        self.ordem = np.argsort(anos, kind="stable").astype(tipo)
+        anos_ordenados = anos[self.ordem]
+        self.anos, inicios = np.unique(anos_ordenados, return_index=True)
+        self.limites = np.append(inicios, len(anos_ordenados))
+
+    def fatia(self, ano, biomas, colunas=None):
+        colunas = colunas or self.colunas
+        i = np.searchsorted(self.anos, ano)
+        if i == len(self.anos) or self.anos[i] != ano:
+            return self.df.iloc[:0][list(colunas)]
+        linhas = self.df.iloc[self.ordem[self.limites[i]:self.limites[i + 1]]]
+        return linhas.loc[linhas["bioma"].isin(biomas), list(colunas)]
+
+
+class CacheFatiasMapa:
+    """Cache LRU, limitado em bytes, de fatias (ano, biomas) já coloridas."""
+
+    def __init__(self, carregar_fatia, max_bytes=MAX_BYTES_PADRAO):
+        self.carregar_fatia = carregar_fatia
+        self.max_bytes = max_bytes
+        self.itens = OrderedDict()
+        self.bytes = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+        self._trava = threading.Lock()
+
+    @classmethod
+    def para_dataset(cls, dataset, **kwargs):
+        return cls(lambda ano, biomas: dados_mapa.ler_particoes(dataset, ano, biomas), **kwargs)
+
+    @classmethod
+    def para_tabela(cls, df, **kwargs):
+        return cls(IndiceAnualMapa(df).fatia, **kwargs)
+
+    def obter(self, ano, biomas):
+        chave = (int(ano), frozenset(biomas))
+        with self._trava:
+            if chave in self.itens:
+                self.itens.move_to_end(chave)
+                self.acertos += 1
+                return self.itens[chave][0]
+            self.faltas += 1
+
+        fatia = agregacao_espacial.adicionar_cores(self.carregar_fatia(chave[0], sorted(chave[1])))
+        tamanho = int(fatia.memory_usage(deep=True).sum())
+
+        with self._trava:
+            if chave not in self.itens:
+                self.itens[chave] = (fatia, tamanho)
+                self.bytes += tamanho
+                # Descarta os menos usados, mas mantém sempre a fatia recém-lida
+                while self.bytes > self.max_bytes and len(self.itens) > 1:
+                    _, (_, tamanho_antigo) = self.itens.popitem(last=False)
+                    self.bytes -= tamanho_antigo
+                    self.descartes += 1
+        return fatia
+
+    def estatisticas(self):
+        with self._trava:
+            consultas = self.acertos + self.faltas
+            return {
+                "itens": len(self.itens),
+                "bytes": self.bytes,
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+                "descartes": self.descartes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
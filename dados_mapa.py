@@ -0,0 +1,134 @@
+# ==============================================================================
+# ARMAZENAMENTO COLUNAR DOS DADOS DO MAPA
+# ==============================================================================
+# Converte 'dados_para_mapa.csv' em um dataset Parquet particionado por ano e
+# bioma, e lê apenas as partições e colunas pedidas pelos filtros das páginas
+# de mapa. O CSV continua sendo aceito como fallback pelo app.
+#
+# Conversão (offline, uma vez por atualização dos dados):
+#     python dados_mapa.py dados_para_mapa.csv dados_mapa_parquet
+# ==============================================================================
+import os
+import shutil
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+import tabelas_compartilhadas
+
+CAMINHO_CSV_MAPA = "dados_para_mapa.csv"
+CAMINHO_PARQUET_MAPA = "dados_mapa_parquet"
+
+# Colunas de partição e colunas efetivamente usadas pelos mapas
+COLUNAS_PARTICAO = ["ano", "bioma"]
+COLUNAS_MAPA = ["longitude", "latitude", "bioma"]
+# Preenchidas por geocodificacao.py; lidas junto quando existem
+COLUNAS_LOCALIZACAO = ["estado", "municipio"]
+
+TAMANHO_BLOCO_CSV = 1_000_000
+
+
+def escrever_bloco_parquet(bloco, destino, numero_bloco, prefixo="parte"):
+    """Acrescenta um bloco de linhas ao dataset particionado em `destino`.
+
+    Os arquivos se chamam '<prefixo>-<numero_bloco>-<i>.parquet'; acréscimos
+    posteriores devem usar outro prefixo para não sobrescrever os existentes.
+    """
+    bloco = bloco.dropna(subset=COLUNAS_PARTICAO)
+    # Tipos compactos (coordenadas em float32 etc.); o bioma vai como texto
+    # porque vira nome de diretório da partição
+    bloco = tabelas_compartilhadas.otimizar_tipos(bloco).astype({"bioma": str})
+    tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+    ds.write_dataset(
+        tabela,
+        destino,
+        format="parquet",
+        partitioning=COLUNAS_PARTICAO,
+        partitioning_flavor="hive",
+        basename_template=f"{prefixo}-{numero_bloco:05d}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return len(bloco)
+
+
+def converter_csv_para_parquet(caminho_csv=CAMINHO_CSV_MAPA, destino=CAMINHO_PARQUET_MAPA,
+                               tamanho_bloco=TAMANHO_BLOCO_CSV):
+    """Reescreve o CSV do mapa como dataset Parquet particionado por ano/bioma.
+
+    O CSV é lido em blocos para não precisar caber inteiro na memória.
+    Retorna o número de linhas escritas.
+    """
+    if os.path.exists(destino):
+        shutil.rmtree(destino)
+
+    total = 0
+    for i, bloco in enumerate(pd.read_csv(caminho_csv, chunksize=tamanho_bloco)):
+        total += escrever_bloco_parquet(bloco, destino, i)
+    return total
+
+
+def existe_parquet_mapa(destino=CAMINHO_PARQUET_MAPA):
+    return os.path.isdir(destino)
+
+
+def abrir_dataset_mapa(destino=CAMINHO_PARQUET_MAPA):
+    """Abre o dataset particionado sem ler nenhum dado (apenas metadados).
+
+    O esquema une o de todas as partes: as da conversão do CSV e as
+    acrescentadas por ingestao_inpe.py podem ter colunas e tipos diferentes,
+    e o Arrow usaria só o da primeira parte encontrada.
+    """
+    dataset = ds.dataset(destino, format="parquet", partitioning="hive")
+    esquemas = [fragmento.physical_schema for fragmento in dataset.get_fragments()]
+    if not esquemas:
+        return dataset
+    return ds.dataset(destino, schema=_unificar_esquemas(esquemas, dataset.schema),
+                      format="parquet", partitioning="hive")
+
+
+def _unificar_esquemas(esquemas, esquema_dataset):
+    # Categorias (dicionários) são unidas pelos valores e voltam como
+    # dicionário com índices int32, que comporta as categorias de todas as partes
+    categoricas = {campo.name for esquema in esquemas for campo in esquema if pa.types.is_dictionary(campo.type)}
+    simples = [
+        pa.schema([campo.with_type(campo.type.value_type) if pa.types.is_dictionary(campo.type) else campo
+                   for campo in esquema], metadata=esquema.metadata)
+        for esquema in esquemas
+    ]
+    unificado = pa.unify_schemas(simples, promote_options="permissive")
+    campos = [campo.with_type(pa.dictionary(pa.int32(), campo.type)) if campo.name in categoricas else campo
+              for campo in unificado]
+    # Colunas de partição (ano, bioma) vêm dos nomes dos diretórios
+    campos += [campo for campo in esquema_dataset if campo.name not in unificado.names]
+    return pa.schema(campos, metadata=unificado.metadata)
+
+
+def listar_particoes(dataset):
+    """Retorna (anos, biomas) disponíveis a partir dos nomes das partições."""
+    anos, biomas = set(), set()
+    for fragmento in dataset.get_fragments():
+        chaves = ds.get_partition_keys(fragmento.partition_expression)
+        anos.add(int(chaves["ano"]))
+        biomas.add(chaves["bioma"])
+    return sorted(anos), sorted(biomas)
+
+
+def colunas_mapa(disponiveis):
+    """Colunas lidas pelos mapas: as básicas e as de localização presentes."""
+    return COLUNAS_MAPA + [c for c in COLUNAS_LOCALIZACAO if c in disponiveis]
+
+
+def ler_particoes(dataset, ano, biomas, colunas=None):
+    """Lê somente as partições (ano, bioma) selecionadas e as colunas pedidas."""
+    colunas = colunas or colunas_mapa(dataset.schema.names)
+    filtro = (ds.field("ano") == int(ano)) & ds.field("bioma").isin(list(biomas))
+    return tabelas_compartilhadas.otimizar_tipos(dataset.to_table(columns=list(colunas), filter=filtro).to_pandas())
+
+
+if __name__ == "__main__":
+    origem = sys.argv[1] if len(sys.argv) > 1 else CAMINHO_CSV_MAPA
+    destino = sys.argv[2] if len(sys.argv) > 2 else CAMINHO_PARQUET_MAPA
+    linhas = converter_csv_para_parquet(origem, destino)
+    print(f"✅ {linhas:,} linhas convertidas de '{origem}' para '{destino}'.")
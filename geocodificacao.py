@@ -0,0 +1,336 @@
+# ==============================================================================
+# ESTADO E MUNICÍPIO DE CADA FOCO (GEOCODIFICAÇÃO REVERSA OFFLINE)
+# ==============================================================================
+# Atribui estado e município a todos os focos do mapa de uma vez, sem rede:
+# usa a base de localidades que acompanha o pacote `reverse_geocoder`
+# (GeoNames, cidades com mais de 1000 habitantes), restrita ao Brasil, em uma
+# KD-tree construída uma única vez por processo. Cada foco recebe a UF e o
+# município (admin2) da localidade mais próxima; as consultas são em lote
+# (vetorizadas) e os arquivos do mapa são processados em paralelo, em vários
+# processos.
+#
+# O resultado vira as colunas 'estado' e 'municipio' do próprio dataset do
+# mapa (Parquet particionado ou CSV) e um rollup estado × bioma × ano × mês
+# ('focos_por_estado.parquet') para os filtros e agregados por estado das
+# páginas, que nunca geocodificam linha a linha.
+#
+# Uso (offline, depois de converter ou ingerir os dados do mapa):
+#     python geocodificacao.py [dados_mapa_parquet | dados_para_mapa.csv]
+#                              [--processos 4] [--sobrescrever]
+#
+# Limitação: a base tem ~2 mil localidades brasileiras, menos densas na
+# Amazônia; perto de divisas a localidade mais próxima pode ser do estado
+# vizinho. Estados e municípios já informados pelo INPE são mantidos (só os
+# nomes são padronizados), a não ser com --sobrescrever.
+# ==============================================================================
+import argparse
+import functools
+import importlib.util
+import os
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import dados_mapa
+import tabelas_compartilhadas
+
+CAMINHO_ROLLUP_ESTADOS = "focos_por_estado.parquet"
+CHAVES_ROLLUP = ["estado", "bioma", "ano", "mes"]
+VALOR = "contagem_focos"
+PAISES = ("BR",)
+TAMANHO_BLOCO = 1_000_000
+
+# Nomes oficiais das UFs, indexados pelo nome sem acentos e em maiúsculas
+# (como aparecem na base do GeoNames e nas exportações do INPE)
+ESTADOS = {
+    "ACRE": "Acre", "ALAGOAS": "Alagoas", "AMAPA": "Amapá", "AMAZONAS": "Amazonas",
+    "BAHIA": "Bahia", "CEARA": "Ceará", "DISTRITO FEDERAL": "Distrito Federal",
+    "FEDERAL DISTRICT": "Distrito Federal", "ESPIRITO SANTO": "Espírito Santo",
+    "GOIAS": "Goiás", "MARANHAO": "Maranhão", "MATO GROSSO": "Mato Grosso",
+    "MATO GROSSO DO SUL": "Mato Grosso do Sul", "MINAS GERAIS": "Minas Gerais",
+    "PARA": "Pará", "PARAIBA": "Paraíba", "PARANA": "Paraná", "PERNAMBUCO": "Pernambuco",
+    "PIAUI": "Piauí", "RIO DE JANEIRO": "Rio de Janeiro", "RIO GRANDE DO NORTE": "Rio Grande do Norte",
+    "RIO GRANDE DO SUL": "Rio Grande do Sul", "RONDONIA": "Rondônia", "RORAIMA": "Roraima",
+    "SANTA CATARINA": "Santa Catarina", "SAO PAULO": "São Paulo", "SERGIPE": "Sergipe",
+    "TOCANTINS": "Tocantins",
+}
+
+
+def _chave(nome):
+    """Nome sem acentos, em maiúsculas e sem espaços extras."""
+    sem_acentos = unicodedata.normalize("NFKD", str(nome)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(sem_acentos.upper().split())
+
+
+def _normalizar_categorias(serie, funcao):
+    # Padroniza só as categorias (poucas) e remapeia os códigos, sem tocar
+    # em strings linha a linha; categorias que viram o mesmo nome se fundem
+    serie = serie.astype("category")
+    novas = pd.Index([funcao(c) for c in serie.cat.categories], dtype=object)
+    unicas = pd.Index(novas.dropna().unique(), dtype=object)
+    remapeamento = np.append(unicas.get_indexer(novas), -1)
+    codigos = remapeamento[serie.cat.codes.to_numpy()]  # código -1 (nulo) cai no -1 acrescentado
+    return pd.Series(pd.Categorical.from_codes(codigos, unicas), index=serie.index)
+
+
+def normalizar_estados(serie):
+    """Troca os nomes de estado pelos nomes oficiais das UFs (desconhecidos ficam nulos)."""
+    return _normalizar_categorias(serie, lambda nome: ESTADOS.get(_chave(nome)))
+
+
+def normalizar_municipios(serie):
+    return _normalizar_categorias(serie, _chave)
+
+
+# ==============================================================================
+# KD-TREE DAS LOCALIDADES
+# ==============================================================================
+def _caminho_localidades():
+    # A base vem dentro do pacote reverse_geocoder; não é preciso importá-lo
+    especificacao = importlib.util.find_spec("reverse_geocoder")
+    if especificacao is None:
+        raise ImportError("O pacote 'reverse_geocoder' é necessário para a geocodificação (requirements.txt).")
+    return os.path.join(os.path.dirname(especificacao.origin), "rg_cities1000.csv")
+
+
+def _cartesianas(latitude, longitude):
+    # Pontos na esfera unitária: o vizinho mais próximo em 3D é o mais
+    # próximo na superfície, sem a distorção de usar graus como distância
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+@functools.lru_cache(maxsize=None)
+def carregar_localidades(paises=PAISES):
+    """KD-tree das localidades e, para cada uma, os códigos de estado e município.
+
+    Construída uma vez por processo. Retorna (arvore, codigos_estado,
+    estados, codigos_municipio, municipios).
+    """
+    # Importado aqui: o app só lê o rollup e não precisa do scipy
+    from scipy.spatial import cKDTree
+
+    base = pd.read_csv(_caminho_localidades(), dtype={"admin1": str, "admin2": str, "name": str},
+                       keep_default_na=False)
+    base = base[base["cc"].str.strip().isin(paises)].reset_index(drop=True)
+    if base.empty:
+        raise ValueError(f"Nenhuma localidade para os países {paises}.")
+
+    estado = pd.Categorical(base["admin1"].map(lambda nome: ESTADOS.get(_chave(nome), nome.strip())))
+    # Algumas localidades não têm admin2; usa o próprio nome da localidade
+    municipio = pd.Categorical(base["admin2"].where(base["admin2"].str.strip() != "", base["name"]).map(_chave))
+    arvore = cKDTree(_cartesianas(base["lat"], base["lon"]))
+    return arvore, estado.codes, estado.categories, municipio.codes, municipio.categories
+
+
+def geocodificar(latitude, longitude, workers=1):
+    """Estado e município (Categorical) de cada ponto, em uma única consulta em lote."""
+    arvore, codigos_estado, estados, codigos_municipio, municipios = carregar_localidades()
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    validos = np.isfinite(latitude) & np.isfinite(longitude)
+
+    vizinho = np.full(len(latitude), -1, dtype=np.int64)
+    if validos.any():
+        _, vizinho[validos] = arvore.query(_cartesianas(latitude[validos], longitude[validos]), workers=workers)
+    # Pontos sem coordenadas ficam com código -1 (nulo)
+    estado = np.where(validos, codigos_estado[np.maximum(vizinho, 0)], -1)
+    municipio = np.where(validos, codigos_municipio[np.maximum(vizinho, 0)], -1)
+    return (pd.Categorical.from_codes(estado, estados),
+            pd.Categorical.from_codes(municipio, municipios))
+
+
+def _recodificar(categorico, categorias):
+    # Códigos de `categorico` em relação a `categorias` (o -1 dos nulos é mantido)
+    return np.append(categorias.get_indexer(categorico.categories), -1)[categorico.codes]
+
+
+def preencher_localizacao(df, sobrescrever=False, workers=1):
+    """Acrescenta/preenche as colunas 'estado' e 'municipio' de `df`.
+
+    Valores já presentes são mantidos (com os nomes padronizados), a menos
+    que `sobrescrever` seja verdadeiro; só as linhas faltantes são consultadas.
+    """
+    df = df.copy(deep=False)
+    n = len(df)
+    colunas = {"estado": normalizar_estados, "municipio": normalizar_municipios}
+    atuais = {}
+    for coluna, normalizar in colunas.items():
+        if coluna in df.columns and not sobrescrever:
+            atuais[coluna] = normalizar(df[coluna])
+        else:
+            atuais[coluna] = pd.Series(pd.Categorical.from_codes(np.full(n, -1), []), index=df.index)
+
+    faltando = (atuais["estado"].isna() | atuais["municipio"].isna()).to_numpy()
+    if faltando.any():
+        novos = dict(zip(colunas, geocodificar(df["latitude"].to_numpy()[faltando],
+                                               df["longitude"].to_numpy()[faltando], workers)))
+        for coluna, serie in atuais.items():
+            # Une as categorias e preenche só os códigos nulos, sem strings por linha
+            categorias = serie.cat.categories.union(novos[coluna].categories)
+            codigos = _recodificar(serie.array, categorias)
+            geocodificados = np.full(n, -1, dtype=np.int64)
+            geocodificados[faltando] = _recodificar(novos[coluna], categorias)
+            codigos = np.where(codigos < 0, geocodificados, codigos)
+            atuais[coluna] = pd.Series(pd.Categorical.from_codes(codigos, categorias), index=df.index)
+    for coluna, serie in atuais.items():
+        df[coluna] = serie
+    return df
+
+
+# ==============================================================================
+# ENRIQUECIMENTO DO DATASET DO MAPA
+# ==============================================================================
+def contar_por_estado(df):
+    """Rollup estado × bioma × ano × mês de um DataFrame de focos."""
+    df = df.astype({"bioma": "category", "estado": "category"})
+    return df.groupby(CHAVES_ROLLUP, observed=True).size().rename(VALOR)
+
+
+def _somar_contagens(partes):
+    partes = [p for p in partes if len(p)]
+    if not partes:
+        return pd.Series([], dtype="int64", name=VALOR,
+                         index=pd.MultiIndex.from_arrays([[]] * len(CHAVES_ROLLUP), names=CHAVES_ROLLUP))
+    total = pd.concat([p.reset_index() for p in partes], ignore_index=True).astype({"estado": str, "bioma": str})
+    return total.groupby(CHAVES_ROLLUP)[VALOR].sum().astype("int64")
+
+
+def salvar_rollup_estados(contagens, caminho=CAMINHO_ROLLUP_ESTADOS):
+    temporario = caminho + ".tmp"
+    contagens.reset_index().to_parquet(temporario, index=False)
+    os.replace(temporario, caminho)
+
+
+def carregar_rollup_estados(caminho=CAMINHO_ROLLUP_ESTADOS):
+    return tabelas_compartilhadas.otimizar_tipos(pd.read_parquet(caminho))
+
+
+def atualizar_rollup_estados(contagens, caminho=CAMINHO_ROLLUP_ESTADOS, destino=None):
+    """Soma novas contagens ao rollup existente (ex.: depois de uma ingestão).
+
+    Com `destino`, o resultado vai para outro arquivo e `caminho` fica intacto.
+    """
+    atual = pd.read_parquet(caminho).set_index(CHAVES_ROLLUP)[VALOR]
+    salvar_rollup_estados(_somar_contagens([atual, contagens]), destino or caminho)
+
+
+def rollup_da_fonte(fonte):
+    """Rollup por estado lido direto da fonte já enriquecida (None se ela não tem 'estado')."""
+    if os.path.isdir(fonte):
+        dataset = dados_mapa.abrir_dataset_mapa(fonte)
+        if "estado" not in dataset.schema.names:
+            return None
+        df = dataset.to_table(columns=CHAVES_ROLLUP).to_pandas()
+    else:
+        if "estado" not in pd.read_csv(fonte, nrows=0).columns:
+            return None
+        df = pd.read_csv(fonte, usecols=CHAVES_ROLLUP)
+    contagens = contar_por_estado(df.assign(estado=normalizar_estados(df["estado"])))
+    return tabelas_compartilhadas.otimizar_tipos(contagens.reset_index())
+
+
+def _enriquecer_arquivo_parquet(arquivo, ano, bioma, sobrescrever):
+    # Roda em um processo de trabalho: um arquivo do dataset por vez
+    tabela = pq.ParquetFile(arquivo).read()
+    df = tabela.to_pandas()
+    completo = ("estado" in df.columns and "municipio" in df.columns
+                and not df["estado"].isna().any() and not df["municipio"].isna().any())
+    alterado = sobrescrever or not completo
+    if alterado:
+        df = preencher_localizacao(df, sobrescrever)
+        temporario = arquivo + ".tmp"
+        pq.write_table(pa.Table.from_pandas(tabelas_compartilhadas.otimizar_tipos(df), preserve_index=False),
+                       temporario)
+        os.replace(temporario, arquivo)
+    else:
+        df = df.assign(estado=normalizar_estados(df["estado"]))
+    return contar_por_estado(df.assign(ano=int(ano), bioma=bioma)), len(df), alterado
+
+
+def _enriquecer_bloco_csv(bloco, sobrescrever):
+    bloco = preencher_localizacao(bloco, sobrescrever)
+    return bloco, contar_por_estado(bloco)
+
+
+def _em_ordem(executor, funcao, itens, janela, *args):
+    """Como executor.map, mas com no máximo `janela` tarefas pendentes."""
+    pendentes = []
+    for item in itens:
+        pendentes.append(executor.submit(funcao, *item, *args))
+        if len(pendentes) >= janela:
+            yield pendentes.pop(0).result()
+    for futuro in pendentes:
+        yield futuro.result()
+
+
+def enriquecer_mapa(fonte=dados_mapa.CAMINHO_PARQUET_MAPA, caminho_rollup=CAMINHO_ROLLUP_ESTADOS,
+                    processos=None, sobrescrever=False, tamanho_bloco=TAMANHO_BLOCO):
+    """Grava estado e município em todos os focos da fonte e o rollup por estado.
+
+    Parquet: cada arquivo do dataset é reescrito (no lugar) por um processo de
+    trabalho. CSV: o arquivo é lido em blocos e reescrito com as novas colunas.
+    Retorna (focos, arquivos_ou_blocos_alterados).
+    """
+    processos = processos or os.cpu_count() or 1
+    partes, focos, alterados = [], 0, 0
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        if os.path.isdir(fonte):
+            dataset = dados_mapa.abrir_dataset_mapa(fonte)
+            tarefas = []
+            for fragmento in dataset.get_fragments():
+                chaves = ds.get_partition_keys(fragmento.partition_expression)
+                tarefas.append((fragmento.path, chaves["ano"], chaves["bioma"]))
+            for contagens, linhas, alterado in _em_ordem(executor, _enriquecer_arquivo_parquet, tarefas,
+                                                         2 * processos, sobrescrever):
+                partes.append(contagens)
+                focos += linhas
+                alterados += alterado
+        else:
+            temporario = fonte + ".tmp"
+            blocos = ((bloco,) for bloco in pd.read_csv(fonte, chunksize=tamanho_bloco))
+            try:
+                for i, (bloco, contagens) in enumerate(_em_ordem(executor, _enriquecer_bloco_csv, blocos,
+                                                                 2 * processos, sobrescrever)):
+                    bloco.to_csv(temporario, mode="a" if i else "w", header=not i, index=False)
+                    partes.append(contagens)
+                    focos += len(bloco)
+                    alterados += 1
+                os.replace(temporario, fonte)
+            finally:
+                if os.path.exists(temporario):
+                    os.remove(temporario)
+
+    salvar_rollup_estados(_somar_contagens(partes), caminho_rollup)
+    return focos, alterados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estado e município de cada foco do mapa (offline).")
+    parser.add_argument("fonte", nargs="?", default=None,
+                        help="dataset Parquet do mapa ou CSV (padrão: o Parquet, se existir)")
+    parser.add_argument("--rollup", default=CAMINHO_ROLLUP_ESTADOS)
+    parser.add_argument("--processos", type=int, help="processos de trabalho (padrão: número de CPUs)")
+    parser.add_argument("--sobrescrever", action="store_true",
+                        help="geocodifica também os focos que já têm estado/município")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    args = parser.parse_args()
+
+    fonte = args.fonte or (dados_mapa.CAMINHO_PARQUET_MAPA if dados_mapa.existe_parquet_mapa()
+                           else dados_mapa.CAMINHO_CSV_MAPA)
+    inicio = time.perf_counter()
+    focos, alterados = enriquecer_mapa(fonte, args.rollup, args.processos, args.sobrescrever, args.tamanho_bloco)
+    print(f"✅ {focos:,} focos com estado e município em '{fonte}' ({alterados} parte(s) reescrita(s)), "
+          f"rollup em '{args.rollup}' ({time.perf_counter() - inicio:.1f} s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+# ==============================================================================
+# ÍNDICE ESPACIAL DOS FOCOS HISTÓRICOS
+# ==============================================================================
+# Responde "quantos focos houve a até N km deste ponto, por ano e mês" e
+# "quais os focos registrados mais próximos" sem varrer a tabela inteira.
+#
+# Os focos são ordenados pela célula de uma grade regular de graus (como um
+# CSR): `inicios[c]` é a posição do primeiro foco da célula c. Como as células
+# de uma mesma linha da grade são contíguas, a caixa que envolve o círculo de
+# busca vira algumas poucas fatias dos arrays, e só esses candidatos têm a
+# distância (haversine) calculada.
+#
+# O índice é construído em duas passagens por blocos (contagem por célula e
+# depois distribuição nas posições finais, direto em arquivos .npy), sem
+# ordenar a tabela inteira na memória, e gravado ao lado dos dados. Na
+# leitura os arrays são mapeados em memória (mmap) e compartilhados entre as
+# sessões e processos.
+#
+# Construção (offline, depois de cada atualização dos dados do mapa; a
+# construção sobre a base completa leva dezenas de segundos, então o app não
+# a faz durante uma requisição):
+#     python indice_espacial.py [dados_mapa_parquet | dados_para_mapa.csv]
+# ==============================================================================
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+import dados_mapa
+
+CAMINHO_INDICE = "indice_espacial"
+RESOLUCAO = 0.1
+
+# Grade fixa cobrindo o Brasil com folga (focos fora dela são ignorados)
+ORIGEM_LON, ORIGEM_LAT = -75.0, -35.0
+FIM_LON, FIM_LAT = -33.0, 6.0
+
+RAIO_TERRA_KM = 6371.0088
+KM_POR_GRAU = np.pi * RAIO_TERRA_KM / 180
+
+COLUNAS_INDICE = ["latitude", "longitude", "ano", "mes", "bioma"]
+TIPOS_INDICE = {"latitude": np.float32, "longitude": np.float32, "ano": np.int16, "mes": np.int8, "bioma": np.int8}
+TAMANHO_BLOCO = 2_000_000
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Distância (km) de um ponto a um conjunto de pontos."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    lats, lons = np.radians(np.asarray(lats, dtype=np.float64)), np.radians(np.asarray(lons, dtype=np.float64))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _dimensoes(resolucao):
+    return (int(np.ceil((FIM_LON - ORIGEM_LON) / resolucao)),
+            int(np.ceil((FIM_LAT - ORIGEM_LAT) / resolucao)))
+
+
+def _celulas(lat, lon, resolucao, nx, ny):
+    """Célula de cada ponto (-1 fora da grade)."""
+    lon, lat = np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64)
+    with np.errstate(invalid="ignore"):  # coordenadas nulas caem fora da grade
+        ix = np.floor((lon - ORIGEM_LON) / resolucao).astype(np.int64)
+        iy = np.floor((lat - ORIGEM_LAT) / resolucao).astype(np.int64)
+    dentro = np.isfinite(lon) & np.isfinite(lat) & (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    return np.where(dentro, iy * nx + ix, -1)
+
+
+# ==============================================================================
+# CONSTRUÇÃO
+# ==============================================================================
+def _tabelas_da_fonte(fonte, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera tabelas Arrow de ~`tamanho_bloco` linhas com as colunas do índice.
+
+    Tudo fica em Arrow/NumPy: as partições geram lotes pequenos, e converter
+    cada um para pandas custaria mais que o próprio índice.
+    """
+    if os.path.isdir(fonte):
+        dataset = dados_mapa.abrir_dataset_mapa(fonte)
+        lotes = dataset.to_batches(columns=[c for c in COLUNAS_INDICE if c in dataset.schema.names],
+                                   batch_size=tamanho_bloco)
+    else:
+        # strings_can_be_null: o bioma vazio do CSV é nulo, como no pandas
+        # (senão vira um bioma "" no índice)
+        lotes = pa_csv.open_csv(fonte, convert_options=pa_csv.ConvertOptions(
+            include_columns=COLUNAS_INDICE, include_missing_columns=True, strings_can_be_null=True))
+    pendentes, linhas = [], 0
+    for lote in lotes:
+        pendentes.append(lote)
+        linhas += lote.num_rows
+        if linhas >= tamanho_bloco:
+            yield pa.Table.from_batches(pendentes)
+            pendentes, linhas = [], 0
+    if pendentes:
+        yield pa.Table.from_batches(pendentes)
+
+
+def _coluna(tabela, nome):
+    return tabela.column(nome).to_numpy()
+
+
+def _celulas_da_tabela(tabela, resolucao, nx, ny):
+    """Célula de cada foco da tabela (-1 fora da grade ou sem ano)."""
+    celula = _celulas(_coluna(tabela, "latitude"), _coluna(tabela, "longitude"), resolucao, nx, ny)
+    if tabela.column("ano").null_count:
+        celula[tabela.column("ano").is_null().to_numpy(zero_copy_only=False)] = -1
+    return celula
+
+
+def _tem_mes(tabela):
+    return "mes" in tabela.column_names and not pa.types.is_null(tabela.schema.field("mes").type)
+
+
+def modificacao_fonte(fonte):
+    """Momento da última modificação da fonte (o arquivo mais novo, num diretório)."""
+    if not os.path.isdir(fonte):
+        return os.path.getmtime(fonte)
+    return max((os.path.getmtime(os.path.join(raiz, nome))
+                for raiz, _, nomes in os.walk(fonte) for nome in nomes), default=0.0)
+
+
+def construir_indice(fonte, destino=CAMINHO_INDICE, resolucao=RESOLUCAO, tamanho_bloco=TAMANHO_BLOCO):
+    """Constrói e grava o índice a partir do dataset Parquet ou do CSV do mapa.
+
+    Retorna o número de focos indexados.
+    """
+    nx, ny = _dimensoes(resolucao)
+    modificada = modificacao_fonte(fonte)
+
+    # 1ª passagem: focos por célula e lista de biomas
+    contagens = np.zeros(nx * ny, dtype=np.int64)
+    biomas, tem_mes = set(), True
+    for tabela in _tabelas_da_fonte(fonte, tamanho_bloco):
+        celula = _celulas_da_tabela(tabela, resolucao, nx, ny)
+        contagens += np.bincount(celula[celula >= 0], minlength=nx * ny)
+        biomas.update(pc.unique(tabela.column("bioma").cast(pa.string())).drop_null().to_pylist())
+        tem_mes &= _tem_mes(tabela)
+    biomas = sorted(biomas)
+    inicios = np.concatenate([[0], np.cumsum(contagens)])
+    n = int(inicios[-1])
+
+    temporario = destino + ".tmp"
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+    arrays = {
+        coluna: np.lib.format.open_memmap(os.path.join(temporario, f"{coluna}.npy"), mode="w+",
+                                          dtype=tipo, shape=(n,))
+        for coluna, tipo in TIPOS_INDICE.items()
+    }
+
+    # 2ª passagem: cada foco vai para a próxima posição livre da sua célula
+    cursor = inicios[:-1].copy()
+    for tabela in _tabelas_da_fonte(fonte, tamanho_bloco):
+        celula = _celulas_da_tabela(tabela, resolucao, nx, ny)
+        validos = np.flatnonzero(celula >= 0)
+        ordem = validos[np.argsort(celula[validos])]
+        celula_ordenada = celula[ordem]
+        # Posição de cada foco dentro do grupo da sua célula
+        inicio_grupo = np.flatnonzero(np.diff(celula_ordenada, prepend=-1))
+        tamanho_grupo = np.diff(np.append(inicio_grupo, len(ordem)))
+        posicoes = cursor[celula_ordenada] + np.arange(len(ordem)) - np.repeat(inicio_grupo, tamanho_grupo)
+        cursor[celula_ordenada[inicio_grupo]] += tamanho_grupo
+
+        valores = {
+            "latitude": _coluna(tabela, "latitude"),
+            "longitude": _coluna(tabela, "longitude"),
+            "ano": _coluna(tabela, "ano"),
+            "mes": _coluna(tabela, "mes") if tem_mes else np.zeros(tabela.num_rows, dtype=np.int8),
+            "bioma": pc.index_in(tabela.column("bioma").cast(pa.string()), pa.array(biomas))
+                       .fill_null(-1).to_numpy(),
+        }
+        for coluna, array in arrays.items():
+            array[posicoes] = valores[coluna][ordem]
+
+    for array in arrays.values():
+        array.flush()
+    np.save(os.path.join(temporario, "inicios.npy"), inicios)
+    with open(os.path.join(temporario, "metadados.json"), "w", encoding="utf-8") as arquivo:
+        json.dump({
+            "resolucao": resolucao, "nx": nx, "ny": ny, "focos": n, "biomas": biomas,
+            "tem_mes": bool(tem_mes), "fonte": os.path.abspath(fonte), "fonte_modificada": modificada,
+            "construido_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }, arquivo, ensure_ascii=False, indent=2)
+    del arrays
+
+    # Troca o índice antigo pelo novo
+    if os.path.exists(destino):
+        antigo = destino + ".antigo"
+        shutil.rmtree(antigo, ignore_errors=True)
+        os.replace(destino, antigo)
+        os.replace(temporario, destino)
+        shutil.rmtree(antigo, ignore_errors=True)
+    else:
+        os.replace(temporario, destino)
+    return n
+
+
+# ==============================================================================
+# CONSULTAS
+# ==============================================================================
+class IndiceEspacial:
+    """Consultas por raio e vizinhos mais próximos sobre o índice gravado."""
+
+    def __init__(self, diretorio=CAMINHO_INDICE):
+        with open(os.path.join(diretorio, "metadados.json"), encoding="utf-8") as arquivo:
+            self.metadados = json.load(arquivo)
+        self.resolucao = self.metadados["resolucao"]
+        self.nx, self.ny = self.metadados["nx"], self.metadados["ny"]
+        self.biomas = np.array(self.metadados["biomas"], dtype=object)
+        # Focos sem bioma têm código -1, que indexa o None acrescentado no fim
+        self._nomes_biomas = np.append(self.biomas, None)
+        self.inicios = np.load(os.path.join(diretorio, "inicios.npy"))
+        self.arrays = {coluna: np.load(os.path.join(diretorio, f"{coluna}.npy"), mmap_mode="r")
+                       for coluna in TIPOS_INDICE}
+
+    def __len__(self):
+        return self.metadados["focos"]
+
+    def desatualizado(self, fonte):
+        return modificacao_fonte(fonte) > self.metadados["fonte_modificada"]
+
+    def _candidatos(self, lat, lon, raio_km):
+        """Fatias [início, fim) dos arrays cobrindo a caixa do círculo de busca."""
+        dlat = raio_km / KM_POR_GRAU
+        lat_extrema = min(max(abs(lat - dlat), abs(lat + dlat)), 89.0)
+        dlon = raio_km / (KM_POR_GRAU * np.cos(np.radians(lat_extrema)))
+        ix0 = max(int(np.floor((lon - dlon - ORIGEM_LON) / self.resolucao)), 0)
+        ix1 = min(int(np.floor((lon + dlon - ORIGEM_LON) / self.resolucao)), self.nx - 1)
+        iy0 = max(int(np.floor((lat - dlat - ORIGEM_LAT) / self.resolucao)), 0)
+        iy1 = min(int(np.floor((lat + dlat - ORIGEM_LAT) / self.resolucao)), self.ny - 1)
+        if ix0 > ix1 or iy0 > iy1:
+            return []
+        linhas = np.arange(iy0, iy1 + 1) * self.nx
+        return [(int(self.inicios[i + ix0]), int(self.inicios[i + ix1 + 1])) for i in linhas
+                if self.inicios[i + ix1 + 1] > self.inicios[i + ix0]]
+
+    def _ler(self, fatias, colunas):
+        if not fatias:
+            return {c: np.empty(0, dtype=TIPOS_INDICE[c]) for c in colunas}
+        return {c: np.concatenate([self.arrays[c][i:f] for i, f in fatias]) for c in colunas}
+
+    def consultar_raio(self, lat, lon, raio_km):
+        """Focos a até `raio_km` do ponto, com a distância de cada um."""
+        valores = self._ler(self._candidatos(lat, lon, raio_km), list(TIPOS_INDICE))
+        distancia = haversine_km(lat, lon, valores["latitude"], valores["longitude"])
+        dentro = distancia <= raio_km
+        return pd.DataFrame({
+            "latitude": valores["latitude"][dentro],
+            "longitude": valores["longitude"][dentro],
+            "ano": valores["ano"][dentro],
+            "mes": valores["mes"][dentro],
+            "bioma": self._nomes_biomas[valores["bioma"][dentro]],
+            "distancia_km": distancia[dentro],
+        })
+
+    def contar_por_ano_mes(self, lat, lon, raio_km):
+        """Matriz ano × mês com o número de focos a até `raio_km` do ponto."""
+        valores = self._ler(self._candidatos(lat, lon, raio_km), ["latitude", "longitude", "ano", "mes"])
+        dentro = haversine_km(lat, lon, valores["latitude"], valores["longitude"]) <= raio_km
+        anos, meses = valores["ano"][dentro].astype(np.int64), valores["mes"][dentro].astype(np.int64)
+        if not len(anos):
+            return pd.DataFrame(columns=range(1, 13), dtype=np.int64).rename_axis(index="ano", columns="mes")
+        ano_min = int(anos.min())
+        n_anos = int(anos.max()) - ano_min + 1
+        contagem = np.bincount((anos - ano_min) * 13 + meses, minlength=n_anos * 13).reshape(n_anos, 13)
+        tabela = pd.DataFrame(contagem[:, 1:], index=pd.RangeIndex(ano_min, ano_min + n_anos, name="ano"),
+                              columns=pd.RangeIndex(1, 13, name="mes"))
+        if not self.metadados["tem_mes"]:
+            tabela = pd.DataFrame({0: contagem.sum(axis=1)}, index=tabela.index)
+        return tabela
+
+    def mais_proximos(self, lat, lon, k=10, raio_inicial_km=25.0, raio_max_km=1000.0):
+        """Os `k` focos mais próximos, ampliando o raio de busca até achá-los."""
+        raio = raio_inicial_km
+        while True:
+            focos = self.consultar_raio(lat, lon, raio)
+            if len(focos) >= k or raio >= raio_max_km:
+                break
+            raio = min(raio * 4, raio_max_km)
+        if len(focos) > k:
+            focos = focos.iloc[np.argpartition(focos["distancia_km"].to_numpy(), k)[:k]]
+        return focos.sort_values("distancia_km").reset_index(drop=True)
+
+
+def carregar_indice(destino=CAMINHO_INDICE):
+    return IndiceEspacial(destino)
+
+
+if __name__ == "__main__":
+    origem = sys.argv[1] if len(sys.argv) > 1 else (
+        dados_mapa.CAMINHO_PARQUET_MAPA if dados_mapa.existe_parquet_mapa() else dados_mapa.CAMINHO_CSV_MAPA
+    )
+    destino = sys.argv[2] if len(sys.argv) > 2 else CAMINHO_INDICE
+    inicio = time.perf_counter()
+    focos = construir_indice(origem, destino)
+    print(f"✅ Índice espacial com {focos:,} focos salvo em '{destino}' ({time.perf_counter() - inicio:.1f} s).")
@@ -0,0 +1,486 @@
+# ==============================================================================
+# INGESTÃO INCREMENTAL DOS FOCOS BRUTOS DO INPE
+# ==============================================================================
+# Lê exportações brutas de focos do INPE (BDQueimadas / dados abertos, CSV,
+# opcionalmente .gz/.zip), em blocos de tamanho limitado, e acrescenta apenas
+# os dias novos:
+#   - ao armazenamento do mapa (dataset Parquet particionado de dados_mapa.py,
+#     ou 'dados_para_mapa.csv' quando o destino é um CSV);
+#   - à tabela ano × mês × bioma 'dados_para_dashboard.csv' e, se existirem,
+#     ao cubo 'cubo_focos.parquet' (agregados.py) e ao rollup por estado
+#     'focos_por_estado.parquet' (geocodificacao.py).
+#
+# Etapas:
+#   1. cada arquivo é lido em blocos, com as colunas normalizadas (os nomes
+#      mudam entre versões das exportações), e só o dia da marca d'água e os
+#      posteriores são mantidos; os blocos vão para uma área temporária em
+#      Parquet particionada por dia;
+#   2. cada dia é consolidado separadamente: duplicatas (mesmo horário,
+#      satélite e coordenadas, que aparecem quando arquivos diário e anual se
+#      sobrepõem) são removidas, os focos sem bioma recebem o da máscara de
+#      superficie_risco.py e os sem estado/município, os da geocodificação
+#      reversa offline de geocodificacao.py;
+#   3. os agregados são somados e a marca d'água (último dia e arquivos já
+#      lidos) é gravada, para que as próximas execuções leiam só o que é novo.
+#
+# O dia da marca d'água é sempre relido, porque o INPE publica focos desse
+# dia com atraso: as chaves (horário, satélite e coordenadas) dos focos já
+# ingeridos dele ficam em '<marca>-ultimo-dia.parquet', e só os que faltam
+# entram.
+#
+# Nada é alterado até todas as etapas terminarem: as partes novas do mapa e
+# os novos agregados são gravados em arquivos temporários, que substituem os
+# originais (os.replace) só no fim; a marca d'água é gravada por último. Uma
+# falha antes disso não deixa rastro, e a próxima execução refaz o mesmo
+# trabalho sem contar focos duas vezes. Com um CSV como destino, os focos
+# novos são acrescentados ao próprio arquivo (sem copiá-lo), depois de
+# guardar seu tamanho em '<destino>.acrescimo-pendente.json'; uma falha
+# trunca o CSV de volta a esse tamanho (se o processo morrer antes, a
+# próxima execução faz isso ao começar).
+#
+# A memória fica limitada pelo tamanho do bloco e pelo maior dia, e não pelo
+# tamanho do arquivo: dumps anuais de vários GB são processados em streaming.
+# O app lê os dados ao iniciar; reinicie-o (ou limpe o cache) após a ingestão.
+#
+# Uso:
+#     python ingestao_inpe.py focos_2025.csv diarios/ [--destino dados_mapa_parquet]
+#                             [--ate 2025-09-30] [--tamanho-bloco 500000]
+# ==============================================================================
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import agregados
+import dados_mapa
+import geocodificacao
+import marca_ingestao
+import superficie_risco
+import tabelas_compartilhadas
+
+CAMINHO_MARCA = marca_ingestao.CAMINHO_MARCA
+CAMINHO_DASHBOARD = "dados_para_dashboard.csv"
+CAMINHO_CUBO = "cubo_focos.parquet"
+TAMANHO_BLOCO = 500_000
+EXTENSOES = (".csv", ".csv.gz", ".csv.zip", ".zip", ".gz")
+
+# Nomes usados nas diferentes versões das exportações do INPE → nome interno
+APELIDOS_COLUNAS = {
+    "data_hora_gmt": "data", "datahora": "data", "data_hora": "data", "data_pas": "data",
+    "lat": "latitude", "latitude": "latitude",
+    "lon": "longitude", "longitude": "longitude",
+    "satelite": "satelite",
+    "bioma": "bioma",
+    "pais": "pais",
+    "estado": "estado",
+    "municipio": "municipio",
+    "numero_dias_sem_chuva": "dias_sem_chuva", "diasemchuva": "dias_sem_chuva",
+    "dias_sem_chuva": "dias_sem_chuva",
+    "precipitacao": "precipitacao",
+    "risco_fogo": "risco_fogo", "riscofogo": "risco_fogo",
+}
+
+# Esquema fixo da área temporária (colunas ausentes no arquivo ficam nulas)
+ESQUEMA_BRUTO = pa.schema([
+    ("data", pa.timestamp("s")),
+    ("satelite", pa.string()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("bioma", pa.string()),
+    ("estado", pa.string()),
+    ("municipio", pa.string()),
+    ("dias_sem_chuva", pa.float32()),
+    ("precipitacao", pa.float32()),
+    ("risco_fogo", pa.float32()),
+    ("dia", pa.string()),
+])
+CHAVE_FOCO = ["data", "satelite", "latitude", "longitude"]
+COLUNAS_OBRIGATORIAS = ["data", "latitude", "longitude"]
+
+# Colunas gravadas no armazenamento do mapa
+COLUNAS_SAIDA = ["ano", "mes", "bioma", "latitude", "longitude", "satelite",
+                 "estado", "municipio", "dias_sem_chuva", "precipitacao", "risco_fogo"]
+
+
+# ==============================================================================
+# MARCA D'ÁGUA
+# ==============================================================================
+# Leitura e gravação da marca ficam em marca_ingestao.py (leve, usado pelo app)
+def caminho_chaves_ultimo_dia(caminho_marca):
+    """Arquivo com as chaves dos focos já ingeridos do dia da marca d'água."""
+    return os.path.splitext(caminho_marca)[0] + "-ultimo-dia.parquet"
+
+
+def _assinatura(caminho):
+    estado = os.stat(caminho)
+    return {"tamanho": estado.st_size, "modificado": int(estado.st_mtime)}
+
+
+def listar_arquivos(entradas):
+    """Expande diretórios e padrões em uma lista ordenada de arquivos."""
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            arquivos += [os.path.join(entrada, nome) for nome in os.listdir(entrada)
+                         if nome.lower().endswith(EXTENSOES)]
+        else:
+            arquivos += glob.glob(entrada) or [entrada]
+    return sorted({os.path.abspath(a) for a in arquivos})
+
+
+# ==============================================================================
+# LEITURA E NORMALIZAÇÃO
+# ==============================================================================
+def normalizar_bloco(bloco):
+    """Renomeia as colunas, converte os tipos e descarta focos fora do Brasil."""
+    bloco = bloco.rename(columns=lambda c: APELIDOS_COLUNAS[c.strip().lower()])
+    ausentes = [c for c in COLUNAS_OBRIGATORIAS if c not in bloco.columns]
+    if ausentes:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(ausentes)}")
+    if "pais" in bloco.columns:
+        bloco = bloco[bloco["pais"].isna() | (bloco["pais"].str.lower() == "brasil")]
+
+    normalizado = pd.DataFrame(index=bloco.index)
+    # Horários em UTC (GMT nas exportações), sem fuso no armazenamento
+    normalizado["data"] = pd.to_datetime(bloco["data"], errors="coerce", utc=True).dt.tz_localize(None)
+    for coluna in ["latitude", "longitude", "dias_sem_chuva", "precipitacao", "risco_fogo"]:
+        normalizado[coluna] = pd.to_numeric(bloco[coluna], errors="coerce") if coluna in bloco.columns else np.nan
+    for coluna in ["satelite", "bioma", "estado", "municipio"]:
+        normalizado[coluna] = bloco[coluna].astype("string").str.strip() if coluna in bloco.columns else None
+    # Valores negativos (-999) são o "sem dado" do INPE
+    for coluna in ["dias_sem_chuva", "precipitacao", "risco_fogo"]:
+        normalizado[coluna] = normalizado[coluna].where(normalizado[coluna] >= 0)
+
+    normalizado = normalizado.dropna(subset=["data", "latitude", "longitude"])
+    normalizado["dia"] = normalizado["data"].dt.strftime("%Y-%m-%d")
+    return normalizado
+
+
+def ler_em_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    colunas = lambda c: c.strip().lower() in APELIDOS_COLUNAS  # noqa: E731
+    for bloco in pd.read_csv(caminho, chunksize=tamanho_bloco, usecols=colunas, dtype=str):
+        try:
+            yield normalizar_bloco(bloco)
+        except ValueError as erro:
+            raise ValueError(f"'{caminho}' não parece uma exportação de focos do INPE: {erro}") from None
+
+
+def _preparar_tabela(df):
+    faltantes = [c for c in ESQUEMA_BRUTO.names if c not in df.columns]
+    df = df.assign(**{c: None for c in faltantes})[ESQUEMA_BRUTO.names]
+    return pa.Table.from_pandas(df, schema=ESQUEMA_BRUTO, preserve_index=False)
+
+
+# ==============================================================================
+# CONSOLIDAÇÃO POR DIA
+# ==============================================================================
+def atribuir_biomas(df, mascara):
+    """Preenche o bioma ausente com o da máscara; sem máscara, o foco é descartado."""
+    sem_bioma = df["bioma"].isna()
+    if sem_bioma.any() and mascara is not None:
+        df.loc[sem_bioma, "bioma"] = superficie_risco.biomas_nos_pontos(
+            mascara, df.loc[sem_bioma, "longitude"], df.loc[sem_bioma, "latitude"]
+        )
+    return df.dropna(subset=["bioma"])
+
+
+def preparar_saida(df):
+    df = df.assign(ano=df["data"].dt.year, mes=df["data"].dt.month)
+    df["latitude"] = df["latitude"].round(5)
+    df["longitude"] = df["longitude"].round(5)
+    return tabelas_compartilhadas.otimizar_tipos(df[COLUNAS_SAIDA])
+
+
+def contar_focos(df):
+    return df.groupby(["ano", "mes", "bioma"], observed=True).size().astype("int64")
+
+
+def atualizar_dashboard(contagens, caminho=CAMINHO_DASHBOARD, destino=None):
+    """Soma as contagens à tabela do dashboard; com `destino`, grava nele e mantém `caminho`."""
+    novos = contagens.rename(agregados.VALOR).reset_index()
+    if os.path.exists(caminho):
+        novos = pd.concat([pd.read_csv(caminho), novos], ignore_index=True)
+    tabela = (novos.astype({"bioma": str})
+              .groupby(["ano", "mes", "bioma"], as_index=False)[agregados.VALOR].sum()
+              .sort_values(["ano", "mes", "bioma"]))
+    destino = destino or caminho
+    temporario = destino + ".tmp"
+    tabela.to_csv(temporario, index=False)
+    os.replace(temporario, destino)
+    return len(tabela)
+
+
+def _remover_arquivos_da_execucao(destino, prefixo):
+    if os.path.isdir(destino):
+        for caminho in glob.glob(os.path.join(destino, "**", f"{prefixo}-*.parquet"), recursive=True):
+            os.remove(caminho)
+
+
+def caminho_acrescimo_pendente(destino):
+    return destino + ".acrescimo-pendente.json"
+
+
+def _iniciar_acrescimo_csv(destino, caminho_pendente, execucao):
+    # Tamanho do CSV do mapa antes dos acréscimos (None se ele ainda não existe)
+    tamanho = os.path.getsize(destino) if os.path.exists(destino) else None
+    marca_ingestao.gravar_marca({"execucao": execucao, "tamanho": tamanho}, caminho_pendente)
+
+
+def _desfazer_acrescimo_csv(destino, caminho_pendente):
+    """Volta o CSV do mapa ao tamanho anterior aos acréscimos da execução."""
+    if not os.path.exists(caminho_pendente):
+        return
+    tamanho = marca_ingestao.ler_marca(caminho_pendente)["tamanho"]
+    if tamanho is None:
+        if os.path.exists(destino):
+            os.remove(destino)
+    elif os.path.exists(destino):
+        os.truncate(destino, tamanho)
+    os.remove(caminho_pendente)
+
+
+def _recuperar_acrescimo_csv(destino, caminho_pendente, marca):
+    # Um acréscimo pendente de uma execução interrompida (processo morto
+    # antes da limpeza) é desfeito, a menos que a marca d'água mostre que
+    # ela chegou ao fim
+    if not os.path.exists(caminho_pendente):
+        return
+    if marca_ingestao.ler_marca(caminho_pendente)["execucao"] == marca.get("execucao"):
+        os.remove(caminho_pendente)
+    else:
+        print(f"↩️  Desfazendo os acréscimos a '{destino}' de uma execução interrompida.", flush=True)
+        _desfazer_acrescimo_csv(destino, caminho_pendente)
+
+
+def _mover_partes(origem, destino):
+    # Move as partes gravadas na área temporária para as mesmas partições do destino
+    for raiz, _, nomes in os.walk(origem):
+        for nome in nomes:
+            final = os.path.join(destino, os.path.relpath(os.path.join(raiz, nome), origem))
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(os.path.join(raiz, nome), final)
+
+
+def _sem_chaves_vistas(df, chaves):
+    # Focos de `df` cujas chaves ainda não estão em `chaves`
+    marcados = df.merge(chaves.drop_duplicates(), on=CHAVE_FOCO, how="left", indicator=True)
+    return marcados[marcados["_merge"] == "left_only"].drop(columns="_merge").reset_index(drop=True)
+
+
+def ingerir(entradas, destino=dados_mapa.CAMINHO_PARQUET_MAPA, caminho_dashboard=CAMINHO_DASHBOARD,
+            caminho_cubo=CAMINHO_CUBO, caminho_marca=CAMINHO_MARCA,
+            caminho_rollup=geocodificacao.CAMINHO_ROLLUP_ESTADOS,
+            caminho_mascara=superficie_risco.CAMINHO_MASCARA, ate=None, tamanho_bloco=TAMANHO_BLOCO):
+    """Acrescenta os dias novos dos arquivos brutos ao mapa e aos agregados.
+
+    `ate` (AAAA-MM-DD) limita os dias ingeridos; arquivos com dias posteriores
+    não são marcados como lidos e serão relidos na próxima execução.
+    Retorna um dicionário com o resumo da execução.
+    """
+    marca = marca_ingestao.ler_marca(caminho_marca)
+    ultimo_dia = marca["ultimo_dia"]
+    destino_csv = destino.lower().endswith(".csv")
+    caminho_pendente = caminho_acrescimo_pendente(destino)
+    if destino_csv:
+        _recuperar_acrescimo_csv(destino, caminho_pendente, marca)
+    arquivos = [a for a in listar_arquivos(entradas) if marca["arquivos"].get(a) != _assinatura(a)]
+    resumo = {"arquivos": len(arquivos), "linhas_lidas": 0, "focos_novos": 0,
+              "duplicados": 0, "ja_ingeridos": 0, "sem_bioma": 0, "dias": 0}
+    if not arquivos:
+        return resumo
+
+    # Chaves do dia da marca já ingeridas; sem elas (marca de uma versão
+    # anterior), o dia da marca não pode ser relido sem duplicar focos
+    caminho_chaves = caminho_chaves_ultimo_dia(caminho_marca)
+    chaves_anteriores = pd.read_parquet(caminho_chaves) if os.path.exists(caminho_chaves) else None
+    reler_ultimo_dia = ultimo_dia is not None and chaves_anteriores is not None
+
+    mascara = superficie_risco.carregar_mascara(caminho_mascara) if os.path.exists(caminho_mascara) else None
+    # Único por execução (não só por segundo e processo): a limpeza de uma
+    # execução que falhou remove os arquivos com este prefixo
+    prefixo = f"inpe-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:12]}"
+    temporario = tempfile.mkdtemp(prefix=".ingestao-", dir=os.path.dirname(os.path.abspath(destino)))
+    area_bruta = os.path.join(temporario, "bruto")
+    area_saida = os.path.join(temporario, "saida")
+    # (arquivo temporário, arquivo final) substituídos só depois de todas as etapas
+    publicar = []
+
+    def temporario_de(caminho):
+        return f"{caminho}.{prefixo}.tmp"
+
+    try:
+        # 1. Leitura em blocos → área temporária particionada por dia
+        lidos_por_completo = []
+        for n, caminho in enumerate(arquivos):
+            completo = True
+            for i, bloco in enumerate(ler_em_blocos(caminho, tamanho_bloco)):
+                resumo["linhas_lidas"] += len(bloco)
+                if reler_ultimo_dia:
+                    bloco = bloco[bloco["dia"] >= ultimo_dia]
+                elif ultimo_dia is not None:
+                    bloco = bloco[bloco["dia"] > ultimo_dia]
+                if ate is not None:
+                    completo &= not (bloco["dia"] > ate).any()
+                    bloco = bloco[bloco["dia"] <= ate]
+                antes = len(bloco)
+                bloco = bloco.drop_duplicates(CHAVE_FOCO)
+                resumo["duplicados"] += antes - len(bloco)
+                if bloco.empty:
+                    continue
+                ds.write_dataset(
+                    _preparar_tabela(bloco), area_bruta, format="parquet",
+                    partitioning=ds.partitioning(pa.schema([("dia", pa.string())]), flavor="hive"),
+                    basename_template=f"{n}-{i}-{{i}}.parquet",
+                    existing_data_behavior="overwrite_or_ignore",
+                )
+            lidos_por_completo.append((caminho, completo))
+
+        # 2. Consolidação dia a dia, gravando as partes novas em blocos
+        dias = []
+        if os.path.isdir(area_bruta):
+            area = ds.dataset(area_bruta, format="parquet", schema=ESQUEMA_BRUTO,
+                              partitioning=ds.partitioning(pa.schema([("dia", pa.string())]), flavor="hive"))
+            dias = sorted({ds.get_partition_keys(f.partition_expression)["dia"] for f in area.get_fragments()})
+        contagens = None
+        contagens_estado = []
+        chaves_ultimo_dia = None
+        pendentes, n_pendentes, numero_bloco = [], 0, 0
+
+        def descarregar():
+            nonlocal pendentes, n_pendentes, numero_bloco
+            if not pendentes:
+                return
+            saida = pd.concat(pendentes, ignore_index=True)
+            if destino_csv:
+                # Acrescenta ao próprio CSV, seguindo o cabeçalho existente,
+                # depois de guardar o tamanho original para desfazer
+                if not os.path.exists(caminho_pendente):
+                    _iniciar_acrescimo_csv(destino, caminho_pendente, prefixo)
+                existe = os.path.exists(destino) and os.path.getsize(destino) > 0
+                if existe:
+                    saida = saida.reindex(columns=pd.read_csv(destino, nrows=0).columns)
+                saida.to_csv(destino, mode="a", header=not existe, index=False)
+            else:
+                dados_mapa.escrever_bloco_parquet(saida, area_saida, numero_bloco, prefixo=prefixo)
+            pendentes, n_pendentes, numero_bloco = [], 0, numero_bloco + 1
+
+        for dia in dias:
+            df = area.to_table(filter=ds.field("dia") == dia).to_pandas()
+            antes = len(df)
+            df = df.drop_duplicates(CHAVE_FOCO)
+            resumo["duplicados"] += antes - len(df)
+            if reler_ultimo_dia and dia == ultimo_dia:
+                antes = len(df)
+                df = _sem_chaves_vistas(df, chaves_anteriores)
+                resumo["ja_ingeridos"] += antes - len(df)
+            if dia == dias[-1]:
+                chaves_ultimo_dia = df[CHAVE_FOCO]
+            antes = len(df)
+            df = atribuir_biomas(df, mascara)
+            resumo["sem_bioma"] += antes - len(df)
+            if df.empty:
+                continue
+            df = geocodificacao.preencher_localizacao(df, workers=-1)
+
+            saida = preparar_saida(df)
+            contagens_estado.append(geocodificacao.contar_por_estado(saida))
+            parcial = contar_focos(saida)
+            contagens = parcial if contagens is None else contagens.add(parcial, fill_value=0)
+            resumo["focos_novos"] += len(saida)
+            resumo["dias"] += 1
+            pendentes.append(saida)
+            n_pendentes += len(saida)
+            if n_pendentes >= tamanho_bloco:
+                descarregar()
+        descarregar()
+
+        # 3. Agregados e marca d'água, primeiro em arquivos temporários
+        if contagens is not None:
+            contagens = contagens.astype("int64")
+            atualizar_dashboard(contagens, caminho_dashboard, temporario_de(caminho_dashboard))
+            publicar.append((temporario_de(caminho_dashboard), caminho_dashboard))
+            if os.path.exists(caminho_cubo):
+                cubo = agregados.carregar_cubo(caminho_cubo)
+                agregados.salvar_cubo(cubo.atualizar(contagens.rename(agregados.VALOR).reset_index()),
+                                      temporario_de(caminho_cubo))
+                publicar.append((temporario_de(caminho_cubo), caminho_cubo))
+            if os.path.exists(caminho_rollup):
+                geocodificacao.atualizar_rollup_estados(pd.concat(contagens_estado), caminho_rollup,
+                                                        temporario_de(caminho_rollup))
+                publicar.append((temporario_de(caminho_rollup), caminho_rollup))
+
+            novo_ultimo_dia = max([d for d in [ultimo_dia, dias[-1]] if d])
+            if novo_ultimo_dia == ultimo_dia and chaves_anteriores is not None:
+                chaves_ultimo_dia = pd.concat([chaves_anteriores, chaves_ultimo_dia], ignore_index=True)
+            if novo_ultimo_dia == dias[-1]:
+                chaves = pa.Table.from_pandas(chaves_ultimo_dia, preserve_index=False,
+                                              schema=pa.schema([ESQUEMA_BRUTO.field(c) for c in CHAVE_FOCO]))
+                pq.write_table(chaves, temporario_de(caminho_chaves))
+                publicar.append((temporario_de(caminho_chaves), caminho_chaves))
+            marca["ultimo_dia"] = novo_ultimo_dia
+        for caminho, completo in lidos_por_completo:
+            if completo:
+                marca["arquivos"][caminho] = _assinatura(caminho)
+        marca["focos"] += resumo["focos_novos"]
+        marca["execucao"] = prefixo
+
+        # 4. Publicação: partes do mapa, agregados e, por último, a marca d'água
+        if os.path.isdir(area_saida):
+            _mover_partes(area_saida, destino)
+        for origem, final in publicar:
+            os.replace(origem, final)
+        marca_ingestao.gravar_marca(marca, caminho_marca)
+        if os.path.exists(caminho_pendente):
+            os.remove(caminho_pendente)
+    except BaseException:
+        # Sem marca d'água nova, nada desta execução pode ficar no destino
+        if destino_csv:
+            _desfazer_acrescimo_csv(destino, caminho_pendente)
+        else:
+            _remover_arquivos_da_execucao(destino, prefixo)
+        for origem, _ in publicar:
+            if os.path.exists(origem):
+                os.remove(origem)
+        raise
+    finally:
+        shutil.rmtree(temporario, ignore_errors=True)
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão incremental dos focos brutos do INPE.")
+    parser.add_argument("entradas", nargs="+", help="arquivos CSV, diretórios ou padrões glob")
+    parser.add_argument("--destino", default=dados_mapa.CAMINHO_PARQUET_MAPA,
+                        help="dataset Parquet do mapa (ou um .csv)")
+    parser.add_argument("--dashboard", default=CAMINHO_DASHBOARD)
+    parser.add_argument("--cubo", default=CAMINHO_CUBO)
+    parser.add_argument("--marca", default=CAMINHO_MARCA)
+    parser.add_argument("--rollup", default=geocodificacao.CAMINHO_ROLLUP_ESTADOS)
+    parser.add_argument("--mascara", default=superficie_risco.CAMINHO_MASCARA)
+    parser.add_argument("--ate", help="último dia a ingerir (AAAA-MM-DD)")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resumo = ingerir(args.entradas, args.destino, args.dashboard, args.cubo, args.marca, args.rollup,
+                     args.mascara, args.ate, args.tamanho_bloco)
+    if not resumo["arquivos"]:
+        print("Nenhum arquivo novo para ingerir.")
+        return
+    print(f"✅ {resumo['focos_novos']:,} focos novos em {resumo['dias']} dia(s) de {resumo['arquivos']} arquivo(s) "
+          f"({resumo['linhas_lidas']:,} linhas lidas, {resumo['duplicados']:,} duplicados, "
+          f"{resumo['ja_ingeridos']:,} já ingeridos, "
+          f"{resumo['sem_bioma']:,} sem bioma) em {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
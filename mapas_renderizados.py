@@ -0,0 +1,334 @@
+# ==============================================================================
+# MAPAS PRÉ-RENDERIZADOS DOS ANOS PASSADOS
+# ==============================================================================
+# Os focos de anos encerrados não mudam, mas cada visita às páginas de mapa
+# lia, agregava e enviava ao navegador os mesmos pontos. Aqui cada ano ×
+# bioma é rasterizado, offline, em uma imagem PNG por nível de zoom da
+# página (NIVEIS_ZOOM), com a mesma grade de agregacao_espacial.py: cada
+# célula tem a cor do bioma e opacidade proporcional ao log da contagem
+# (normalizada pelo máximo do ano naquele zoom, para que os biomas de um ano
+# sejam comparáveis entre si). As linhas da imagem são espaçadas em
+# Mercator, como o mapa, para que a BitmapLayer não distorça as latitudes.
+#
+# As páginas usam essas imagens (BitmapLayer) para os anos anteriores ao
+# corrente, com custo constante qualquer que seja o número de focos; o ano
+# corrente, e qualquer filtro por estado, continuam dinâmicos.
+#
+# Invalidação: o manifesto guarda, por ano, um hash do conteúdo dos focos
+# (coordenadas de cada bioma) e a assinatura barata da fonte (tamanho e data
+# dos arquivos; com o CSV, a do arquivo inteiro). O app só confia nas imagens
+# de um ano se a assinatura não mudou, sem ler os focos; a nova execução do
+# passo offline recalcula o hash e só redesenha os anos cujo conteúdo mudou.
+# Os nomes das imagens levam o hash, então uma imagem antiga nunca é servida
+# por engano.
+#
+# Geração (offline, após cada atualização dos dados):
+#     python mapas_renderizados.py [dados_mapa_parquet | dados_para_mapa.csv]
+# ==============================================================================
+import argparse
+import base64
+import datetime
+import functools
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pydeck as pdk
+
+import agregacao_espacial
+import dados_mapa
+
+CAMINHO_MAPAS = "mapas_renderizados"
+ARQUIVO_MANIFESTO = "manifesto.json"
+FORMATO = 1
+
+# Caixa das imagens (a mesma grade fixa do índice espacial)
+LON_MIN, LAT_MIN = agregacao_espacial.ORIGEM_LON, agregacao_espacial.ORIGEM_LAT
+LON_MAX, LAT_MAX = -33.0, 6.0
+
+# Pixels da imagem por célula (ampliação sem interpolação): metade da largura
+# da célula na tela no zoom nominal, para o navegador quase não borrar as bordas
+PIXELS_POR_CELULA = 4
+
+
+def ano_corrente():
+    return datetime.date.today().year
+
+
+# ==============================================================================
+# FONTE: ASSINATURAS E LEITURA POR ANO
+# ==============================================================================
+def _resumo(valor):
+    return hashlib.sha256(json.dumps(valor, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def assinatura_csv(fonte):
+    """Assinatura barata (tamanho e data) de um CSV: a mesma para todos os seus anos."""
+    estado = os.stat(fonte)
+    return _resumo([estado.st_size, int(estado.st_mtime)])
+
+
+def assinaturas_da_fonte(fonte):
+    """Assinatura barata (tamanho e data dos arquivos) de cada ano da fonte.
+
+    No Parquet, só metadados. No CSV, listar os anos exige ler a coluna
+    'ano' inteira: por isso só o passo offline a usa (o app fica com
+    assinatura_csv).
+    """
+    if not os.path.isdir(fonte):
+        assinatura = assinatura_csv(fonte)
+        anos = pd.read_csv(fonte, usecols=["ano"])["ano"].dropna().astype(int).unique()
+        return {int(ano): assinatura for ano in anos}
+
+    por_ano = {}
+    for fragmento in dados_mapa.abrir_dataset_mapa(fonte).get_fragments():
+        ano = int(ds.get_partition_keys(fragmento.partition_expression)["ano"])
+        estado = os.stat(fragmento.path)
+        por_ano.setdefault(ano, []).append([os.path.relpath(fragmento.path, fonte), estado.st_size,
+                                            int(estado.st_mtime)])
+    return {ano: _resumo(sorted(arquivos)) for ano, arquivos in por_ano.items()}
+
+
+def _leitor_focos(fonte):
+    """Função ano → focos do ano (longitude, latitude, bioma).
+
+    No Parquet cada ano vem da própria partição; o CSV é lido uma única vez,
+    na primeira consulta, e dividido por ano.
+    """
+    colunas = ["longitude", "latitude", "bioma"]
+    if os.path.isdir(fonte):
+        dataset = dados_mapa.abrir_dataset_mapa(fonte)
+        return lambda ano: dataset.to_table(columns=colunas, filter=ds.field("ano") == int(ano)).to_pandas()
+
+    @functools.cache
+    def por_ano():
+        df = pd.read_csv(fonte, usecols=colunas + ["ano"]).dropna(subset=["ano"])
+        return {int(ano): grupo[colunas] for ano, grupo in df.groupby(df["ano"].astype(int))}
+
+    return lambda ano: por_ano().get(int(ano), pd.DataFrame(columns=colunas))
+
+
+def hash_conteudo(df):
+    """Hash das coordenadas de cada bioma (independe da ordem dos biomas)."""
+    resumo = hashlib.sha256()
+    for bioma, grupo in sorted(df.groupby(df["bioma"].astype(str), observed=True), key=lambda g: g[0]):
+        resumo.update(bioma.encode())
+        resumo.update(grupo["longitude"].to_numpy(np.float32).tobytes())
+        resumo.update(grupo["latitude"].to_numpy(np.float32).tobytes())
+    return resumo.hexdigest()
+
+
+# ==============================================================================
+# RASTERIZAÇÃO
+# ==============================================================================
+def _mercator(lat):
+    return np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+
+
+def grade_do_zoom(zoom):
+    """(tamanho da célula em graus, nx, ny, limites [oeste, sul, leste, norte]) da imagem de um zoom."""
+    tamanho = agregacao_espacial.tamanho_celula_para_zoom(zoom)
+    passo_y = np.radians(tamanho)
+    nx = int(np.ceil((LON_MAX - LON_MIN) / tamanho))
+    ny = int(np.ceil((_mercator(LAT_MAX) - _mercator(LAT_MIN)) / passo_y))
+    norte = np.degrees(2 * np.arctan(np.exp(_mercator(LAT_MIN) + ny * passo_y)) - np.pi / 2)
+    return tamanho, nx, ny, [LON_MIN, LAT_MIN, LON_MIN + nx * tamanho, float(norte)]
+
+
+def contar_celulas(longitude, latitude, zoom):
+    """Contagem de focos por célula (linha 0 ao norte) na grade do zoom."""
+    tamanho, nx, ny, _ = grade_do_zoom(zoom)
+    ix = np.floor((np.asarray(longitude, dtype=np.float64) - LON_MIN) / tamanho).astype(np.int64)
+    iy = ny - 1 - np.floor((_mercator(np.asarray(latitude, dtype=np.float64)) - _mercator(LAT_MIN))
+                           / np.radians(tamanho)).astype(np.int64)
+    dentro = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    return np.bincount(iy[dentro] * nx + ix[dentro], minlength=nx * ny).reshape(ny, nx)
+
+
+def imagem_contagens(contagens, cor, maximo):
+    """PNG com paleta: cor do bioma e opacidade pelo log da contagem (transparente sem focos).
+
+    Como cada imagem tem uma única cor, o índice da paleta é a própria
+    opacidade; o arquivo fica com 1 byte por pixel em vez de 4.
+    """
+    # Importado aqui: só o passo offline gera imagens, o app apenas as lê
+    from PIL import Image
+
+    log_contagem = np.log1p(contagens)
+    alfa = np.where(contagens > 0, 60 + 195 * log_contagem / max(np.log1p(maximo), 1e-9), 0).astype(np.uint8)
+    imagem = Image.fromarray(alfa.repeat(PIXELS_POR_CELULA, axis=0).repeat(PIXELS_POR_CELULA, axis=1))
+    imagem.putpalette(list(cor) * 256)
+    imagem.info["transparency"] = bytes(range(256))
+    return imagem
+
+
+def _renderizar_ano(df, ano, chave, destino):
+    # Uma imagem por bioma e zoom; devolve {bioma: {zoom: caminho relativo}}
+    biomas = sorted(df["bioma"].astype(str).unique())
+    imagens = {bioma: {} for bioma in biomas}
+    for zoom in agregacao_espacial.NIVEIS_ZOOM:
+        contagens = {bioma: contar_celulas(grupo["longitude"], grupo["latitude"], zoom)
+                     for bioma, grupo in df.groupby(df["bioma"].astype(str), observed=True)}
+        maximo = max(int(c.max()) for c in contagens.values())
+        for bioma, contagem in contagens.items():
+            cor = agregacao_espacial.CORES_BIOMA.get(bioma, agregacao_espacial.COR_PADRAO)
+            relativo = os.path.join(str(ano), f"{bioma}-z{zoom}-{chave[:12]}.png")
+            caminho = os.path.join(destino, relativo)
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            imagem = imagem_contagens(contagem, cor, maximo)
+            imagem.save(caminho + ".tmp", format="PNG", transparency=imagem.info["transparency"])
+            os.replace(caminho + ".tmp", caminho)
+            imagens[bioma][str(zoom)] = relativo
+    return imagens
+
+
+# ==============================================================================
+# MANIFESTO E GERAÇÃO OFFLINE
+# ==============================================================================
+def carregar_manifesto(destino=CAMINHO_MAPAS):
+    caminho = os.path.join(destino, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {"formato": FORMATO, "anos": {}}
+    with open(caminho, encoding="utf-8") as arquivo:
+        manifesto = json.load(arquivo)
+    return manifesto if manifesto.get("formato") == FORMATO else {"formato": FORMATO, "anos": {}}
+
+
+def _gravar_manifesto(manifesto, destino):
+    caminho = os.path.join(destino, ARQUIVO_MANIFESTO)
+    with open(caminho + ".tmp", "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+    os.replace(caminho + ".tmp", caminho)
+
+
+def _remover_imagens(entrada, destino):
+    for por_zoom in entrada.get("imagens", {}).values():
+        for relativo in por_zoom.values():
+            caminho = os.path.join(destino, relativo)
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+
+def pre_renderizar(fonte, destino=CAMINHO_MAPAS, ate_ano=None):
+    """Renderiza os anos anteriores a `ate_ano` (padrão: o ano corrente) que mudaram.
+
+    Retorna {ano: "inalterado" | "revalidado" | "renderizado" | "vazio"}.
+    Anos sem focos não têm imagens: as páginas os mostram pelo caminho dinâmico.
+    """
+    ate_ano = ate_ano or ano_corrente()
+    os.makedirs(destino, exist_ok=True)
+    manifesto = carregar_manifesto(destino)
+    focos_do_ano = _leitor_focos(fonte)
+    assinaturas = assinaturas_da_fonte(fonte)
+    situacao = {}
+    for ano, assinatura in sorted(assinaturas.items()):
+        if ano >= ate_ano:
+            continue
+        entrada = manifesto["anos"].get(str(ano), {})
+        if entrada.get("assinatura") == assinatura:
+            situacao[ano] = "inalterado"
+            continue
+        # Assinatura nova: só redesenha se o conteúdo (coordenadas) mudou
+        df = focos_do_ano(ano)
+        if df.empty:
+            _remover_imagens(entrada, destino)
+            manifesto["anos"].pop(str(ano), None)
+            _gravar_manifesto(manifesto, destino)
+            situacao[ano] = "vazio"
+            continue
+        chave = hash_conteudo(df)
+        if entrada.get("hash") == chave:
+            entrada["assinatura"] = assinatura
+            situacao[ano] = "revalidado"
+        else:
+            imagens = _renderizar_ano(df, ano, chave, destino)
+            _remover_imagens(entrada, destino)
+            entrada = {
+                "assinatura": assinatura,
+                "hash": chave,
+                "focos": {b: int(n) for b, n in df["bioma"].astype(str).value_counts().items()},
+                "imagens": imagens,
+            }
+            situacao[ano] = "renderizado"
+        manifesto["anos"][str(ano)] = entrada
+        # Manifesto gravado a cada ano: uma execução interrompida não perde o que já foi feito
+        _gravar_manifesto(manifesto, destino)
+
+    # Anos que saíram da fonte: as imagens deles não valem mais
+    for ano in [a for a in manifesto["anos"] if int(a) not in assinaturas]:
+        _remover_imagens(manifesto["anos"].pop(ano), destino)
+        _gravar_manifesto(manifesto, destino)
+        situacao[int(ano)] = "vazio"
+    return situacao
+
+
+# ==============================================================================
+# USO PELAS PÁGINAS
+# ==============================================================================
+@functools.lru_cache(maxsize=256)
+def _imagem_base64(caminho):
+    with open(caminho, "rb") as arquivo:
+        return "data:image/png;base64," + base64.b64encode(arquivo.read()).decode("ascii")
+
+
+class MapasRenderizados:
+    """Imagens pré-renderizadas válidas para a fonte atual (conferidas uma vez, na criação)."""
+
+    def __init__(self, fonte, destino=CAMINHO_MAPAS):
+        self.destino = destino
+        manifesto = carregar_manifesto(destino)
+        if os.path.isdir(fonte):
+            assinaturas = assinaturas_da_fonte(fonte)
+        else:
+            # CSV: sem ler o arquivo (roda na primeira visita a uma página de
+            # mapa); os anos vêm do manifesto e a assinatura é a do arquivo
+            assinaturas = dict.fromkeys(map(int, manifesto["anos"]), assinatura_csv(fonte))
+        limite = ano_corrente()
+        self.anos = {
+            int(ano): entrada for ano, entrada in manifesto["anos"].items()
+            if int(ano) < limite and assinaturas.get(int(ano)) == entrada["assinatura"]
+        }
+
+    def disponivel(self, ano, zoom):
+        entrada = self.anos.get(int(ano))
+        return entrada is not None and all(str(zoom) in por_zoom for por_zoom in entrada["imagens"].values())
+
+    def focos(self, ano, biomas):
+        """Número de focos de cada bioma selecionado no ano."""
+        focos = self.anos[int(ano)]["focos"]
+        return {b: focos[b] for b in biomas if b in focos}
+
+    def camadas(self, ano, biomas, zoom):
+        """Uma BitmapLayer por bioma selecionado com focos no ano."""
+        _, _, _, limites = grade_do_zoom(zoom)
+        imagens = self.anos[int(ano)]["imagens"]
+        return [
+            pdk.Layer("BitmapLayer", image=_imagem_base64(os.path.join(self.destino, imagens[b][str(zoom)])),
+                      bounds=limites)
+            for b in biomas if b in imagens
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-renderiza os mapas de focos dos anos passados.")
+    parser.add_argument("fonte", nargs="?", default=None,
+                        help="dataset Parquet do mapa ou CSV (padrão: o Parquet, se existir)")
+    parser.add_argument("--destino", default=CAMINHO_MAPAS)
+    parser.add_argument("--ate-ano", type=int, help="renderiza os anos anteriores a este (padrão: o ano corrente)")
+    args = parser.parse_args()
+
+    fonte = args.fonte or (dados_mapa.CAMINHO_PARQUET_MAPA if dados_mapa.existe_parquet_mapa()
+                           else dados_mapa.CAMINHO_CSV_MAPA)
+    inicio = time.perf_counter()
+    situacao = pre_renderizar(fonte, args.destino, args.ate_ano)
+    for ano, estado in situacao.items():
+        print(f"  {ano}: {estado}")
+    print(f"✅ {len(situacao)} ano(s) em '{args.destino}' ({time.perf_counter() - inicio:.1f} s).")
+
+
+if __name__ == "__main__":
+    main()
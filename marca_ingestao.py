@@ -0,0 +1,27 @@
+# ==============================================================================
+# MARCA D'ÁGUA DA INGESTÃO DOS FOCOS DO INPE
+# ==============================================================================
+# 'marca_ingestao.json' guarda o último dia ingerido por ingestao_inpe.py, os
+# arquivos já lidos (com tamanho e data de modificação) e o total de focos.
+# Fica em um módulo à parte, só com a biblioteca padrão, para que o app possa
+# consultar o último dia ingerido (previsao_volume.py) sem importar a
+# ingestão e suas dependências (geocodificação, máscara de biomas...).
+# ==============================================================================
+import json
+import os
+
+CAMINHO_MARCA = "marca_ingestao.json"
+
+
+def ler_marca(caminho=CAMINHO_MARCA):
+    if not os.path.exists(caminho):
+        return {"ultimo_dia": None, "arquivos": {}, "focos": 0}
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def gravar_marca(marca, caminho=CAMINHO_MARCA):
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(marca, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
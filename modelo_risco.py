@@ -0,0 +1,312 @@
+# ==============================================================================
+# MODELO DE RISCO DE FOGO - CODIFICAÇÃO E AVALIAÇÃO COMPILADA
+# ==============================================================================
+# Para uma única linha, montar um DataFrame de 17 colunas e passar pela
+# validação do pandas/sklearn custa mais do que percorrer as árvores. Aqui a
+# RandomForestRegressor carregada é achatada, uma vez, em arrays contíguos
+# (filhos, feature, limiar e valor de cada nó) e percorrida com NumPy a
+# partir de um buffer pré-alocado, preenchido direto com os valores do
+# formulário.
+#
+# O resultado é idêntico bit a bit ao de `modelo.predict` (mesma conversão
+# para float32, mesma comparação `x <= limiar` e mesma ordem de soma das
+# árvores), desde que o modelo seja avaliado com n_jobs=None/1.
+# ==============================================================================
+import threading
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_DO_MODELO = [
+    'dias_sem_chuva', 'precipitacao', 'mes', 'latitude', 'longitude',
+    'bioma_Caatinga', 'bioma_Cerrado', 'bioma_Mata Atlântica', 'bioma_Pampa', 'bioma_Pantanal',
+    'satelite_AQUA_M-T', 'satelite_GOES-16', 'satelite_NOAA-20', 'satelite_NPP-375',
+    'satelite_NPP-375D', 'satelite_TERRA_M-M', 'satelite_TERRA_M-T'
+]
+COLUNAS_NUMERICAS = ['dias_sem_chuva', 'precipitacao', 'mes', 'latitude', 'longitude']
+
+# Categorias de referência do one-hot (sem coluna própria no modelo)
+BIOMA_BASE = "Amazônia"
+SATELITE_BASE = "AQUA_M"
+
+_INDICE_COLUNA = {coluna: i for i, coluna in enumerate(COLUNAS_DO_MODELO)}
+
+# Limite de elementos (amostras × árvores) avaliados de uma vez em lote
+ELEMENTOS_POR_BLOCO = 2_000_000
+
+
+def opcoes_categoria(prefixo, base):
+    """Valores aceitos de uma variável one-hot, incluindo a categoria base."""
+    opcoes = [c[len(prefixo):] for c in COLUNAS_DO_MODELO if c.startswith(prefixo)]
+    if base not in opcoes:
+        opcoes.insert(0, base)
+    return sorted(opcoes)
+
+
+def codificar_entrada(buffer, dias_sem_chuva, precipitacao, mes, latitude, longitude, bioma, satelite):
+    """Preenche `buffer` (float32, 17 posições) com a linha codificada."""
+    buffer[:] = 0
+    buffer[0] = dias_sem_chuva
+    buffer[1] = precipitacao
+    buffer[2] = mes
+    buffer[3] = latitude
+    buffer[4] = longitude
+    # Categorias base ou desconhecidas ficam com todas as flags zeradas
+    i = _INDICE_COLUNA.get(f'bioma_{bioma}')
+    if i is not None:
+        buffer[i] = 1
+    i = _INDICE_COLUNA.get(f'satelite_{satelite}')
+    if i is not None:
+        buffer[i] = 1
+    return buffer
+
+
+def codificar_lote(dias_sem_chuva, precipitacao, mes, latitude, longitude, bioma, satelite):
+    """Codifica vários registros de uma vez em uma matriz float32 (n, 17).
+
+    Cada argumento pode ser um array/Series ou um escalar (repetido em todas
+    as linhas).
+    """
+    numericas = np.broadcast_arrays(*(np.asarray(v, dtype=np.float32) for v in
+                                      (dias_sem_chuva, precipitacao, mes, latitude, longitude)))
+    n = max(len(np.atleast_1d(v)) for v in (*numericas, bioma, satelite))
+    X = np.zeros((n, len(COLUNAS_DO_MODELO)), dtype=np.float32)
+    for i, valores in enumerate(numericas):
+        X[:, i] = valores
+    linhas = np.arange(n)
+    for prefixo, valores in (('bioma_', bioma), ('satelite_', satelite)):
+        codigos, unicos = pd.factorize(np.broadcast_to(np.asarray(valores, dtype=object), (n,)))
+        indices = np.array([_INDICE_COLUNA.get(f'{prefixo}{v}', -1) for v in unicos] + [-1], dtype=np.intp)[codigos]
+        conhecidos = indices >= 0
+        X[linhas[conhecidos], indices[conhecidos]] = 1
+    return X
+
+
+class FlorestaCompilada:
+    """Floresta de regressão achatada em arrays para avaliação rápida.
+
+    Os nós de todas as árvores ficam concatenados; `raizes` guarda o índice
+    da raiz de cada árvore. Folhas apontam para si mesmas, então todas as
+    árvores podem ser percorridas juntas por `profundidade` passos.
+    """
+
+    def __init__(self, esquerda, direita, feature, limiar, falta_esquerda, valor, raizes, profundidade):
+        self.esquerda = esquerda
+        self.direita = direita
+        self.feature = feature
+        self.limiar = limiar
+        self.falta_esquerda = falta_esquerda
+        self.valor = valor
+        self.raizes = raizes
+        self.profundidade = profundidade
+        self.n_arvores = len(raizes)
+        # Um buffer pré-alocado por thread (sessões do Streamlit rodam em threads)
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Permite enviar a floresta para processos de trabalho (joblib)
+        estado = self.__dict__.copy()
+        del estado["_local"]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._local = threading.local()
+
+    @classmethod
+    def a_partir_de_modelo(cls, modelo):
+        # Índice de cada feature do modelo na ordem de COLUNAS_DO_MODELO
+        nomes = list(getattr(modelo, "feature_names_in_", COLUNAS_DO_MODELO))
+        if sorted(nomes) != sorted(COLUNAS_DO_MODELO):
+            raise ValueError("As features do modelo não correspondem a COLUNAS_DO_MODELO.")
+        permutacao = np.array([_INDICE_COLUNA[n] for n in nomes], dtype=np.intp)
+
+        esquerda, direita, feature, limiar, falta_esquerda, valor, raizes = [], [], [], [], [], [], []
+        deslocamento, profundidade = 0, 0
+        for estimador in modelo.estimators_:
+            arvore = estimador.tree_
+            n_nos = arvore.node_count
+            ids = np.arange(n_nos, dtype=np.intp)
+            folha = arvore.children_left == -1
+            esquerda.append(np.where(folha, ids, arvore.children_left) + deslocamento)
+            direita.append(np.where(folha, ids, arvore.children_right) + deslocamento)
+            feature.append(np.where(folha, 0, permutacao[np.maximum(arvore.feature, 0)]))
+            limiar.append(arvore.threshold)
+            falta = getattr(arvore, "missing_go_to_left", None)
+            falta_esquerda.append(np.zeros(n_nos, dtype=bool) if falta is None else falta.astype(bool))
+            valor.append(arvore.value[:, 0, 0])
+            raizes.append(deslocamento)
+            deslocamento += n_nos
+            profundidade = max(profundidade, arvore.max_depth)
+
+        return cls(
+            np.concatenate(esquerda).astype(np.intp),
+            np.concatenate(direita).astype(np.intp),
+            np.concatenate(feature).astype(np.intp),
+            np.concatenate(limiar).astype(np.float64),
+            np.concatenate(falta_esquerda),
+            np.concatenate(valor).astype(np.float64),
+            np.array(raizes, dtype=np.intp),
+            profundidade,
+        )
+
+    def _folhas(self, X):
+        """Índice da folha alcançada em cada árvore, shape (n_amostras, n_arvores)."""
+        nos = np.broadcast_to(self.raizes, (X.shape[0], self.n_arvores)).copy()
+        linhas = np.arange(X.shape[0])[:, None]
+        for _ in range(self.profundidade):
+            x = X[linhas, self.feature[nos]]
+            vai_esquerda = (x <= self.limiar[nos]) | (np.isnan(x) & self.falta_esquerda[nos])
+            nos = np.where(vai_esquerda, self.esquerda[nos], self.direita[nos])
+        return nos
+
+    def _media_arvores(self, valores):
+        # Soma acumulada na ordem das árvores, como em RandomForestRegressor.predict
+        return np.cumsum(valores, axis=-1)[..., -1] / self.n_arvores
+
+    def prever(self, X):
+        """Previsão em lote para uma matriz já codificada (n, 17)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        passo = max(1, ELEMENTOS_POR_BLOCO // self.n_arvores)
+        saida = np.empty(X.shape[0], dtype=np.float64)
+        for inicio in range(0, X.shape[0], passo):
+            bloco = X[inicio:inicio + passo]
+            saida[inicio:inicio + passo] = self._media_arvores(self.valor[self._folhas(bloco)])
+        return saida
+
+    def _buffer_codificado(self, *entrada):
+        # Buffer da thread preenchido com a linha do formulário (sem DataFrame nem factorize)
+        x_todos = getattr(self._local, "buffer", None)
+        if x_todos is None:
+            x_todos = self._local.buffer = np.zeros(len(COLUNAS_DO_MODELO), dtype=np.float32)
+        codificar_entrada(x_todos, *entrada)
+        return x_todos
+
+    def prever_um(self, dias_sem_chuva, precipitacao, mes, latitude, longitude, bioma, satelite):
+        """Previsão de uma linha a partir dos valores do formulário."""
+        x_todos = self._buffer_codificado(dias_sem_chuva, precipitacao, mes, latitude, longitude, bioma, satelite)
+        nos = self.raizes
+        for _ in range(self.profundidade):
+            x = x_todos[self.feature[nos]]
+            vai_esquerda = (x <= self.limiar[nos]) | (np.isnan(x) & self.falta_esquerda[nos])
+            nos = np.where(vai_esquerda, self.esquerda[nos], self.direita[nos])
+        return float(self._media_arvores(self.valor[nos]))
+
+    def explicar_um(self, dias_sem_chuva, precipitacao, mes, latitude, longitude, bioma, satelite,
+                    quantis=(0.1, 0.9)):
+        """Como `explicar`, para uma linha do formulário: dict de escalares e
+        'contribuicoes' com shape (17,)."""
+        x_todos = self._buffer_codificado(dias_sem_chuva, precipitacao, mes, latitude, longitude, bioma, satelite)
+        nos = self.raizes
+        contribuicoes = np.zeros(len(COLUNAS_DO_MODELO))
+        for _ in range(self.profundidade):
+            feature = self.feature[nos]
+            x = x_todos[feature]
+            vai_esquerda = (x <= self.limiar[nos]) | (np.isnan(x) & self.falta_esquerda[nos])
+            filhos = np.where(vai_esquerda, self.esquerda[nos], self.direita[nos])
+            contribuicoes += np.bincount(feature, weights=self.valor[filhos] - self.valor[nos],
+                                         minlength=len(COLUNAS_DO_MODELO))
+            nos = filhos
+        folhas = self.valor[nos]
+        inferior, superior = np.quantile(folhas, quantis)
+        return {
+            "previsao": float(self._media_arvores(folhas)), "desvio": float(folhas.std()),
+            "inferior": float(inferior), "superior": float(superior),
+            "contribuicoes": contribuicoes / self.n_arvores, "base": float(np.mean(self.valor[self.raizes])),
+        }
+
+    def explicar(self, X, quantis=(0.1, 0.9)):
+        """Previsão, dispersão entre as árvores e contribuições das features, em lote.
+
+        Uma única passada percorre todas as árvores juntas, como em `prever`:
+        a cada nível, a variação do valor do nó ao descer para o filho é
+        creditada à feature da divisão (decomposição de Saabas). Retorna um
+        dict de arrays com uma posição por linha de X:
+          - 'previsao': idêntica à de `prever`;
+          - 'desvio', 'inferior', 'superior': desvio-padrão e `quantis` das
+            previsões das árvores individuais;
+          - 'contribuicoes': (n, 17) na ordem de COLUNAS_DO_MODELO, que
+            somadas a 'base' (média das raízes) dão a previsão.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        n, n_colunas = X.shape
+        saida = {
+            "previsao": np.empty(n), "desvio": np.empty(n), "inferior": np.empty(n), "superior": np.empty(n),
+            "contribuicoes": np.empty((n, n_colunas)), "base": float(np.mean(self.valor[self.raizes])),
+        }
+        passo = max(1, ELEMENTOS_POR_BLOCO // self.n_arvores)
+        for inicio in range(0, n, passo):
+            bloco = X[inicio:inicio + passo]
+            m = bloco.shape[0]
+            nos = np.broadcast_to(self.raizes, (m, self.n_arvores)).copy()
+            linhas = np.arange(m)[:, None]
+            contribuicoes = np.zeros(m * n_colunas)
+            for _ in range(self.profundidade):
+                feature = self.feature[nos]
+                x = bloco[linhas, feature]
+                vai_esquerda = (x <= self.limiar[nos]) | (np.isnan(x) & self.falta_esquerda[nos])
+                filhos = np.where(vai_esquerda, self.esquerda[nos], self.direita[nos])
+                # Folhas apontam para si mesmas: variação zero depois de chegar nelas
+                contribuicoes += np.bincount((linhas * n_colunas + feature).ravel(),
+                                             weights=(self.valor[filhos] - self.valor[nos]).ravel(),
+                                             minlength=m * n_colunas)
+                nos = filhos
+
+            folhas = self.valor[nos]
+            trecho = slice(inicio, inicio + m)
+            saida["previsao"][trecho] = self._media_arvores(folhas)
+            saida["desvio"][trecho] = folhas.std(axis=1)
+            saida["inferior"][trecho], saida["superior"][trecho] = np.quantile(folhas, quantis, axis=1)
+            saida["contribuicoes"][trecho] = contribuicoes.reshape(m, n_colunas) / self.n_arvores
+        return saida
+
+
+# ==============================================================================
+# VARREDURAS DE SENSIBILIDADE
+# ==============================================================================
+# Ordem dos argumentos de codificar_lote
+ENTRADAS = ['dias_sem_chuva', 'precipitacao', 'mes', 'latitude', 'longitude', 'bioma', 'satelite']
+
+# Valores percorridos por variável nas varreduras "e se" da página de previsão
+VALORES_VARREDURA = {
+    'dias_sem_chuva': np.arange(0, 101),
+    'precipitacao': np.linspace(0.0, 200.0, 101),
+    'mes': np.arange(1, 13),
+    'latitude': np.linspace(-34.0, 5.0, 79),
+    'longitude': np.linspace(-74.0, -34.0, 81),
+    'bioma': np.array(opcoes_categoria('bioma_', BIOMA_BASE), dtype=object),
+    'satelite': np.array(opcoes_categoria('satelite_', SATELITE_BASE), dtype=object),
+}
+
+
+def avaliar_grade(floresta, varridas, fixos):
+    """Risco em todas as combinações das variáveis `varridas`, com as demais em `fixos`.
+
+    A grade inteira é codificada de uma vez e avaliada em uma única chamada
+    de `floresta.prever`. Retorna um DataFrame com uma coluna por variável
+    varrida e a coluna 'risco'.
+    """
+    malha = np.meshgrid(*(VALORES_VARREDURA[v] for v in varridas), indexing='ij')
+    colunas = {v: eixo.ravel() for v, eixo in zip(varridas, malha)}
+    entradas = {**fixos, **colunas}
+    X = codificar_lote(*(entradas[nome] for nome in ENTRADAS))
+    return pd.DataFrame({**colunas, 'risco': floresta.prever(X)})
+
+
+# ==============================================================================
+# CONTRIBUIÇÕES POR ENTRADA
+# ==============================================================================
+# Matriz (17, 7) que soma as colunas one-hot de bioma e satélite na entrada de origem
+_COLUNA_PARA_ENTRADA = np.array(
+    [[coluna == entrada or coluna.startswith(f'{entrada}_') for entrada in ENTRADAS] for coluna in COLUNAS_DO_MODELO],
+    dtype=np.float64,
+)
+
+
+def contribuicoes_por_entrada(contribuicoes):
+    """Soma as contribuições das colunas do modelo por entrada do formulário (n, 7), na ordem de ENTRADAS."""
+    return np.asarray(contribuicoes) @ _COLUNA_PARA_ENTRADA
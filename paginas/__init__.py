@@ -0,0 +1,8 @@
+# ==============================================================================
+# PÁGINAS DO DASHBOARD
+# ==============================================================================
+# Cada página é um módulo com uma função `renderizar()`. O app.py importa o
+# módulo da página escolhida só quando ela é visitada pela primeira vez, de
+# modo que bibliotecas pesadas (pandas, pyarrow, plotly, pydeck, joblib) e os
+# dados/modelo só são carregados pelas páginas que precisam deles.
+# ==============================================================================
@@ -0,0 +1,169 @@
+# ==============================================================================
+# PÁGINA: ANÁLISE HISTÓRICA
+# ==============================================================================
+import plotly.express as px
+import streamlit as st
+
+import agregados
+import previsao_volume
+import telemetria
+from paginas import dados
+
+
+def mostrar_estados(bioma_selecionado, estado_selecionado):
+    st.subheader("Focos de Queimada por Estado")
+    st.markdown("Ranking dos estados e evolução anual de cada um, a partir dos focos do mapa com estado atribuído por geocodificação.")
+
+    rollup = dados.carregar_focos_por_estado()
+    if bioma_selecionado != agregados.TODOS:
+        rollup = rollup[rollup["bioma"] == bioma_selecionado]
+    with telemetria.etapa("agregacao"):
+        por_estado = (rollup.groupby("estado", observed=True)["contagem_focos"].sum()
+                      .sort_values(ascending=False).reset_index())
+        estado_ano = rollup.pivot_table(index="estado", columns="ano", values="contagem_focos",
+                                        aggfunc="sum", fill_value=0, observed=True)
+        estado_ano = estado_ano.loc[por_estado["estado"]]
+
+    with telemetria.etapa("graficos"):
+        cores = ["#d62728" if e == estado_selecionado else "#1f77b4" for e in por_estado["estado"]]
+        fig_estados = px.bar(por_estado, x="contagem_focos", y="estado", orientation="h",
+                             labels={"estado": "Estado", "contagem_focos": "Total de Focos"},
+                             template="plotly_white", height=max(400, 22 * len(por_estado))
+                             ).update_traces(marker_color=cores).update_layout(yaxis={"categoryorder": "total ascending"})
+        st.plotly_chart(fig_estados, use_container_width=True)
+
+        fig_estado_ano = px.imshow(
+            estado_ano, aspect="auto",
+            labels=dict(x="Ano", y="Estado", color="Nº de Focos"),
+            title=f"Focos por Estado e Ano para: {bioma_selecionado}",
+            color_continuous_scale="YlOrRd",
+        )
+        st.plotly_chart(fig_estado_ano, use_container_width=True)
+
+
+def mostrar_previsao(estado_selecionado, bioma_selecionado):
+    st.subheader("Previsão do Volume Mensal de Focos")
+    st.markdown(f"Modelo sazonal (tendência + efeito de cada mês, em escala logarítmica) ajustado para todos os biomas "
+                f"e para o total, com intervalo de {previsao_volume.NIVEL:.0%}.")
+    try:
+        series, previsao = dados.carregar_previsao_focos(estado_selecionado)
+    except ValueError as erro:
+        st.info(f"ℹ️ {erro}")
+        return
+
+    historico = series[bioma_selecionado].rename("contagem_focos").rename_axis("data").reset_index()
+    historico["data"] = historico["data"].dt.to_timestamp()
+    futuro = previsao[previsao["bioma"] == bioma_selecionado]
+    with telemetria.etapa("graficos"):
+        fig = px.line(historico, x="data", y="contagem_focos", markers=True, template="plotly_white",
+                      labels={"data": "Mês", "contagem_focos": "Número de Focos"},
+                      title=f"Focos mensais e previsão para: {bioma_selecionado}")
+        fig.add_scatter(x=list(futuro["data"]) + list(futuro["data"][::-1]),
+                        y=list(futuro["superior"]) + list(futuro["inferior"][::-1]),
+                        fill="toself", fillcolor="rgba(214, 39, 40, 0.15)", line={"width": 0},
+                        hoverinfo="skip", name=f"Intervalo de {previsao_volume.NIVEL:.0%}")
+        fig.add_scatter(x=futuro["data"], y=futuro["previsao"], mode="lines+markers",
+                        line={"dash": "dash", "color": "#d62728"}, name="Previsão")
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("##### Focos previstos por bioma")
+    tabela = previsao.assign(mes=previsao["data"].dt.strftime("%m/%Y")).pivot(index="bioma", columns="mes", values="previsao")
+    st.dataframe(tabela[sorted(tabela.columns, key=lambda m: m[3:] + m[:2])].round(0).astype("int64"),
+                 use_container_width=True)
+
+
+def renderizar():
+    st.title("📊 Análise Histórica dos Focos de Queimada")
+    st.markdown("Explore as tendências temporais, geográficas e sazonais dos focos de queimada no Brasil.")
+
+    cubo_focos = dados.carregar_cubo_focos()
+    if cubo_focos is not None:
+        
+        # Os filtros de estado e bioma ficam no topo e se aplicam a todas as abas
+        estados = dados.listar_estados()
+        col_estado, col_bioma = st.columns(2)
+        estado_selecionado = agregados.TODOS
+        if estados:
+            with col_estado:
+                estado_selecionado = st.selectbox("🗺️ Filtre por Estado:", [agregados.TODOS] + estados)
+        if estado_selecionado != agregados.TODOS:
+            # Cubo do estado, a partir do rollup pré-calculado dos focos geocodificados
+            cubo_focos = dados.carregar_cubo_estado(estado_selecionado)
+
+        with col_bioma:
+            biomas = [agregados.TODOS] + cubo_focos.biomas
+            bioma_selecionado = st.selectbox("🌱 Filtre por Bioma:", biomas)
+        if estado_selecionado != agregados.TODOS:
+            st.caption(f"Números de {estado_selecionado} calculados a partir dos focos do mapa "
+                       "com estado atribuído por geocodificação.")
+
+        # --- CRIAÇÃO DAS ABAS PARA ORGANIZAR OS GRÁFICOS ---
+        nomes_abas = ["Visão Geral Anual", "Sazonalidade (Heatmap)", "Padrão dos Biomas", "Previsão"]
+        tab1, tab2, tab3, tab4, *tab_estados = st.tabs(nomes_abas + (["Estados"] if estados else []))
+
+        # --- Conteúdo da Aba 1: Visão Geral ---
+        with tab1:
+            st.subheader("Evolução dos Focos de Queimada por Ano")
+            focos_por_ano = cubo_focos.por_ano[bioma_selecionado]
+            with telemetria.etapa("graficos"):
+                fig_ano = px.line(focos_por_ano, x='ano', y='contagem_focos',
+                                  labels={'ano': 'Ano', 'contagem_focos': 'Número de Focos'},
+                                  markers=True, template="plotly_white")
+                st.plotly_chart(fig_ano, use_container_width=True)
+
+            if bioma_selecionado == agregados.TODOS:
+                st.subheader("Distribuição Total por Bioma")
+                focos_por_bioma = cubo_focos.total_por_bioma
+                with telemetria.etapa("graficos"):
+                    fig_bioma = px.bar(focos_por_bioma, x="contagem_focos", y="bioma",
+                                       labels={'bioma': 'Bioma', 'contagem_focos': 'Total de Focos'},
+                                       text_auto=True, template="plotly_white", orientation='h'
+                                      ).update_layout(yaxis={'categoryorder':'total ascending'})
+                    st.plotly_chart(fig_bioma, use_container_width=True)
+
+        # --- Conteúdo da Aba 2: Heatmap de Sazonalidade ---
+        with tab2:
+            st.subheader("Mapa de Calor: Intensidade Mensal das Queimadas por Ano")
+            st.markdown("Este gráfico mostra em quais meses de cada ano a atividade de queimadas foi mais intensa. Cores mais quentes indicam um maior número de focos.")
+            
+            # Matriz ano × mês já pronta no cubo
+            heatmap_pivot = cubo_focos.heatmap[bioma_selecionado]
+            
+            with telemetria.etapa("graficos"):
+                fig_heatmap = px.imshow(
+                    heatmap_pivot,
+                    labels=dict(x="Mês", y="Ano", color="Nº de Focos"),
+                    title=f"Intensidade de Queimadas para: {bioma_selecionado}",
+                    color_continuous_scale='YlOrRd'
+                )
+                st.plotly_chart(fig_heatmap, use_container_width=True)
+
+        # --- Conteúdo da Aba 3: Padrão Sazonal dos Biomas ---
+        with tab3:
+            st.subheader("Padrão Sazonal de Queimadas por Bioma")
+            st.markdown("Este gráfico compara o comportamento das queimadas ao longo do ano para cada bioma, revelando seus períodos mais críticos.")
+            
+            # Bioma × mês, mesmo que só um bioma esteja selecionado
+            sazonalidade_bioma = cubo_focos.sazonal[bioma_selecionado]
+            
+            with telemetria.etapa("graficos"):
+                fig_sazonalidade_bioma = px.line(
+                    sazonalidade_bioma,
+                    x='mes',
+                    y='contagem_focos',
+                    color='bioma', # Mesmo com um bioma, 'color' cria a legenda corretamente
+                    title=f"Ciclo Anual de Queimadas para: {bioma_selecionado}",
+                    labels={'mes': 'Mês do Ano', 'contagem_focos': 'Número de Focos'},
+                    markers=True
+                )
+                fig_sazonalidade_bioma.update_xaxes(dtick=1)
+                st.plotly_chart(fig_sazonalidade_bioma, use_container_width=True)
+
+        # --- Conteúdo da Aba 4: Previsão do Volume de Focos ---
+        with tab4:
+            mostrar_previsao(estado_selecionado, bioma_selecionado)
+
+        # --- Conteúdo da Aba 5: Focos por Estado ---
+        if tab_estados:
+            with tab_estados[0]:
+                mostrar_estados(bioma_selecionado, estado_selecionado)
@@ -0,0 +1,160 @@
+# ==============================================================================
+# PÁGINA: COMPARATIVO ANUAL DE MAPAS
+# ==============================================================================
+import numpy as np
+import pydeck as pdk
+import streamlit as st
+
+import agregacao_espacial
+import telemetria
+from paginas import dados
+
+
+def mostrar_mapa_diferenca(ano_a, ano_b, biomas_selecionados, estados_selecionados, zoom):
+    # Os dois anos são binados juntos na mesma grade e enviados ao navegador
+    # como uma única camada agregada, em vez de duas nuvens de pontos
+    df_a = dados.filtrar_dados_mapa(ano_a, biomas_selecionados, estados_selecionados)
+    df_b = dados.filtrar_dados_mapa(ano_b, biomas_selecionados, estados_selecionados)
+    tamanho = agregacao_espacial.tamanho_celula_para_zoom(zoom)
+    with telemetria.etapa("agregacao"):
+        grade = agregacao_espacial.diferenca_em_grade(df_a, df_b, tamanho)
+
+    # --- LEGENDA DA ESCALA DIVERGENTE ---
+    cores = ", ".join('#%02x%02x%02x' % tuple(int(c) for c in cor) for cor in agregacao_espacial.ESCALA_DIVERGENTE)
+    st.markdown(f"""
+    <div style="display:flex; align-items:center; gap:10px; margin-bottom:10px;">
+        <span>Queda</span>
+        <span style="width:240px; height:16px; border-radius:3px; background:linear-gradient(to right, {cores});"></span>
+        <span>Aumento</span>
+    </div>
+    """, unsafe_allow_html=True)
+    st.markdown("---")
+
+    st.subheader(f"Diferença {ano_b} − {ano_a}: {len(df_b) - len(df_a):+,} focos ({len(df_a):,} → {len(df_b):,})")
+    if grade.empty:
+        st.info("Nenhum foco de queimada encontrado com os filtros selecionados.")
+        return
+    with telemetria.etapa("graficos"):
+        camada = agregacao_espacial.construir_camada_diferenca(grade, tamanho)
+        tooltip = {"html": f"<b>{ano_a}:</b> {{contagem_a}} focos<br/><b>{ano_b}:</b> {{contagem_b}} focos"
+                           "<br/><b>Diferença:</b> {diferenca}<br/><b>Bioma dominante:</b> {bioma}"}
+        view_state = pdk.ViewState(latitude=-14, longitude=-55, zoom=zoom, pitch=0)
+        st.pydeck_chart(pdk.Deck(layers=[camada], initial_view_state=view_state, tooltip=tooltip))
+    st.caption("Cada círculo é uma célula da grade; aumente o zoom para células menores.")
+
+    # --- TABELAS DAS MAIORES MUDANÇAS ---
+    col_biomas, col_celulas = st.columns([2, 3])
+    with col_biomas:
+        st.markdown("##### Biomas com maior mudança")
+        por_bioma = agregacao_espacial.diferenca_por_bioma(df_a, df_b)
+        st.dataframe(
+            por_bioma.rename(columns={"bioma": "Bioma", "contagem_a": str(ano_a), "contagem_b": str(ano_b),
+                                      "diferenca": "Diferença", "variacao": "Variação"}),
+            column_config={"Variação": st.column_config.NumberColumn(format="percent")},
+            hide_index=True, use_container_width=True,
+        )
+    with col_celulas:
+        st.markdown("##### Células com maior mudança")
+        maiores = grade.iloc[np.argsort(-np.abs(grade["diferenca"].to_numpy()), kind="stable")[:10]]
+        st.dataframe(
+            maiores[["latitude", "longitude", "bioma", "contagem_a", "contagem_b", "diferenca", "razao"]]
+            .rename(columns={"latitude": "Latitude", "longitude": "Longitude", "bioma": "Bioma dominante",
+                             "contagem_a": str(ano_a), "contagem_b": str(ano_b), "diferenca": "Diferença",
+                             "razao": "Razão"})
+            .round({"Latitude": 2, "Longitude": 2, "Razão": 2}),
+            hide_index=True, use_container_width=True,
+        )
+
+
+def mostrar_mapa_ano(ano, biomas_selecionados, estados_selecionados, zoom, view_state):
+    # Ano encerrado: imagens pré-renderizadas; ano corrente ou filtro por estado: focos agregados na hora
+    mapas = dados.mapas_pre_renderizados(ano, estados_selecionados, zoom)
+    if mapas is not None:
+        total = sum(mapas.focos(ano, biomas_selecionados).values())
+        st.subheader(f"Mapa para {ano} ({total:,} focos)")
+        with telemetria.etapa("graficos"):
+            st.pydeck_chart(pdk.Deck(layers=mapas.camadas(ano, biomas_selecionados, zoom), initial_view_state=view_state))
+        return
+
+    df = dados.filtrar_dados_mapa(ano, biomas_selecionados, estados_selecionados)
+    st.subheader(f"Mapa para {ano} ({len(df):,} focos)")
+    with telemetria.etapa("agregacao"):
+        layer, tooltip, _ = agregacao_espacial.construir_camada_focos(df, zoom, agregacao_espacial.CORES_BIOMA)
+    with telemetria.etapa("graficos"):
+        st.pydeck_chart(pdk.Deck(layers=[layer], initial_view_state=view_state, tooltip=tooltip))
+
+
+def renderizar():
+    st.title("🗺️ Comparativo Anual de Mapas de Focos de Queimada")
+    st.markdown("Selecione dois anos diferentes para comparar a distribuição dos focos lado a lado.")
+
+    anos_biomas_mapa = dados.listar_anos_biomas_mapa()
+    if anos_biomas_mapa is not None:
+        # --- SELETORES DE ANOS E BIOMAS ---
+        anos_disponiveis = sorted(anos_biomas_mapa[0], reverse=True)
+        
+        col_seletores1, col_seletores2 = st.columns([1, 3])
+        with col_seletores1:
+            # Seletor para o primeiro ano (Ano A)
+            ano_a = st.selectbox(
+                "Selecione o Ano A (Esquerda):",
+                options=anos_disponiveis,
+                index=1 # Pega o segundo ano mais recente por padrão (ex: 2024)
+            )
+            # Seletor para o segundo ano (Ano B)
+            ano_b = st.selectbox(
+                "Selecione o Ano B (Direita):",
+                options=anos_disponiveis,
+                index=0 # Pega o ano mais recente por padrão (ex: 2025)
+            )
+            visualizacao = st.radio("Visualização:", ["Lado a lado", "Mapa de diferença"])
+
+        with col_seletores2:
+            # Filtro de Biomas que se aplica a ambos os mapas
+            biomas_disponiveis = anos_biomas_mapa[1]
+            biomas_selecionados = st.multiselect(
+                "Filtre por Biomas (para ambos os mapas):",
+                options=biomas_disponiveis,
+                default=biomas_disponiveis
+            )
+            # Filtro opcional por estado (vazio = todos), se os focos já foram geocodificados
+            estados_disponiveis = dados.listar_estados()
+            estados_selecionados = st.multiselect(
+                "Filtre por Estados (opcional, para ambos os mapas):",
+                options=estados_disponiveis
+            ) if estados_disponiveis else []
+            zoom = st.select_slider("Nível de detalhe (zoom):", options=agregacao_espacial.NIVEIS_ZOOM, value=3.5)
+        
+        cores_bioma = agregacao_espacial.CORES_BIOMA
+        if visualizacao == "Mapa de diferença":
+            if biomas_selecionados:
+                mostrar_mapa_diferenca(ano_a, ano_b, biomas_selecionados, estados_selecionados, zoom)
+            else:
+                st.warning("⚠️ Por favor, selecione pelo menos um bioma.")
+            return
+
+        # --- LEGENDA COMPARTILHADA ---
+        legenda_html = "<div style='display:flex; flex-wrap:wrap; gap:15px; align-items:center; margin-bottom:10px;'>"
+        for bioma, cor in cores_bioma.items():
+            if bioma in biomas_disponiveis:
+                cor_hex = '#%02x%02x%02x' % tuple(cor)
+                legenda_html += f"<div style='display:flex; align-items:center; gap:5px;'><span style='width:20px; height:20px; background-color:{cor_hex}; border-radius:3px;'></span><span>{bioma}</span></div>"
+        legenda_html += "</div>"
+        st.markdown(legenda_html, unsafe_allow_html=True)
+        st.markdown("---")
+
+
+        # --- CRIAÇÃO DOS MAPAS LADO A LADO ---
+        col_mapa1, col_mapa2 = st.columns(2)
+
+        if biomas_selecionados:
+            # Visão de câmera compartilhada para que os mapas fiquem sincronizados
+            view_state = pdk.ViewState(latitude=-14, longitude=-55, zoom=zoom, pitch=0)
+
+            # Renderiza o Mapa A (Esquerda) e o Mapa B (Direita)
+            for coluna, ano in ((col_mapa1, ano_a), (col_mapa2, ano_b)):
+                with coluna:
+                    mostrar_mapa_ano(ano, biomas_selecionados, estados_selecionados, zoom, view_state)
+
+        else:
+            st.warning("⚠️ Por favor, selecione pelo menos um bioma.")
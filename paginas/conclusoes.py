@@ -0,0 +1,53 @@
+# ==============================================================================
+# PÁGINA: CONCLUSÕES
+# ==============================================================================
+import streamlit as st
+
+
+def renderizar():
+    st.title("💡 Conclusões e Insights Principais")
+
+    st.markdown("""
+    A análise dos dados de queimadas do INPE, abrangendo o período de 2003 a 2025, revela padrões marcantes e confirma que os incêndios florestais no Brasil, embora complexos, não são eventos aleatórios. Eles seguem tendências e são influenciados por fatores geográficos e sazonais bem definidos.
+
+    Abaixo estão os principais insights derivados deste projeto:
+    """)
+
+    st.markdown("---")
+
+    st.subheader("Principais Observações da Análise Exploratória")
+    st.markdown("""
+    - ** sazonalidade no 'Arco do Desmatamento'**: Como observado, há uma concentração massiva de focos de queimada nos meses de **Agosto, Setembro e Outubro**. Este período corresponde ao final da estação seca em grande parte do centro do país, especialmente nos biomas Amazônia e Cerrado, onde a vegetação seca se torna altamente inflamável.
+
+    - **Concentração Geográfica nos Biomas Amazônia e Cerrado**: A grande maioria dos focos de incêndio registrados no Brasil ocorre nesses dois biomas. Isso destaca a pressão constante sobre essas áreas, seja por fatores naturais ou, mais significativamente, por atividades humanas como desmatamento e práticas agrícolas.
+
+    - **Variação Anual Significativa**: O número de focos de queimada não é constante e varia muito de um ano para o outro. O **aumento expressivo observado entre 2023 e 2024**, por exemplo, pode estar ligado a fatores complexos como fenômenos climáticos (ex: El Niño, que causa secas mais severas) e mudanças em políticas de fiscalização ambiental.
+
+    - **Padrões Sazonais Distintos por Bioma**: Embora o pico nacional ocorra no final do inverno, a análise detalhada revela que cada ecossistema tem sua própria "personalidade de fogo". Biomas como o Pampa, no sul, ou áreas específicas como o estado de Roraima (que segue um ciclo climático diferente), apresentam picos em outras épocas do ano, evidenciando a necessidade de estratégias de combate regionalizadas.
+    """)
+
+    st.markdown("---")
+
+    st.subheader("A Previsibilidade do Risco de Fogo")
+    st.markdown("""
+    O sucesso do modelo de Machine Learning (`RandomForestRegressor`), que alcançou uma alta performance (R² > 90%), é talvez a conclusão mais poderosa deste projeto. Ele demonstra que o risco de fogo **não é um evento imprevisível**.
+
+    Com um conjunto limitado de variáveis, o modelo conseguiu prever o risco com alta precisão. Isso confirma que os principais impulsionadores do risco de fogo são:
+    1.  **Condições Meteorológicas:** Dias sem chuva e precipitação são preditores extremamente fortes.
+    - **Localização Geográfica:** A latitude e a longitude são cruciais, pois representam o tipo de vegetação e o clima local.
+    3.  **Época do Ano:** O mês é um indicador poderoso da posição na estação seca ou chuvosa.
+    """)
+
+    st.markdown("---")
+
+    st.subheader("Limitações e Próximos Passos")
+    st.markdown("""
+    Como todo projeto de dados, este também tem suas limitações, que abrem portas para trabalhos futuros:
+    - **Qualidade dos Dados:** A análise revelou que dados meteorológicos detalhados e consistentes para todos os biomas ainda são um desafio, o que nos levou a focar o modelo em dados mais recentes.
+    - **Próximos Passos Sugeridos:**
+        - Enriquecer o modelo com outras variáveis, como velocidade do vento, umidade do ar e dados de desmatamento em tempo real.
+        - Desenvolver modelos especialistas para outros biomas, à medida que mais dados de qualidade se tornem disponíveis.
+        - Criar um modelo de séries temporais para tentar prever o *volume* total de queimadas para os próximos meses.
+
+    Em suma, este projeto demonstra o poder da ciência de dados para transformar dados brutos em insights acionáveis, essenciais para o monitoramento e combate às queimadas no Brasil.
+    """)
@@ -0,0 +1,179 @@
+# ==============================================================================
+# CARREGAMENTO DOS DADOS (COMPARTILHADO ENTRE AS PÁGINAS)
+# ==============================================================================
+import os
+
+import streamlit as st
+
+import agregados
+import cache_fatias
+import dados_mapa
+import indice_espacial
+import tabelas_compartilhadas
+import telemetria
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_dados_dashboard():
+    # cache_resource: um único DataFrame compacto, mapeado em memória e
+    # compartilhado (somente leitura) por todas as sessões
+    try:
+        with telemetria.etapa("carregamento"):
+            return tabelas_compartilhadas.carregar_tabela_compartilhada("dados_para_dashboard.csv")
+    except FileNotFoundError:
+        st.error("❌ Arquivo 'dados_para_dashboard.csv' não encontrado.")
+        return None
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_cubo_focos():
+    # Rollup ano × mês × bioma da página "Análise Histórica", construído uma
+    # única vez por processo (ou lido do arquivo gerado por agregados.py)
+    if os.path.exists("cubo_focos.parquet"):
+        with telemetria.etapa("carregamento"):
+            return agregados.carregar_cubo("cubo_focos.parquet")
+    df = carregar_dados_dashboard()
+    if df is None:
+        return None
+    with telemetria.etapa("agregacao"):
+        return agregados.CuboFocos.a_partir_de_dados(df)
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_dados_mapa():
+    try:
+        with telemetria.etapa("carregamento"):
+            return tabelas_compartilhadas.carregar_tabela_compartilhada("dados_para_mapa.csv")
+    except FileNotFoundError:
+        st.error("❌ Arquivo 'dados_para_mapa.csv' não encontrado.")
+        return None
+
+
+@telemetria.cache_medido(st.cache_resource)
+def abrir_dataset_mapa():
+    # Dataset Parquet particionado por ano/bioma (gerado por dados_mapa.py).
+    # Se não existir, as páginas de mapa usam o CSV como fallback.
+    if dados_mapa.existe_parquet_mapa():
+        return dados_mapa.abrir_dataset_mapa()
+    return None
+
+
+@telemetria.cache_medido(st.cache_data)
+def listar_anos_biomas_mapa():
+    dataset = abrir_dataset_mapa()
+    if dataset is not None:
+        with telemetria.etapa("carregamento"):
+            return dados_mapa.listar_particoes(dataset)
+    df = carregar_dados_mapa()
+    if df is None:
+        return None
+    return sorted(int(a) for a in df['ano'].unique()), sorted(df['bioma'].unique())
+
+
+@telemetria.cache_medido(st.cache_resource)
+def obter_cache_fatias():
+    # Cache LRU compartilhado de fatias (ano, biomas) já com as cores; numa
+    # falta lê só as partições pedidas ou usa o índice por ano da tabela
+    dataset = abrir_dataset_mapa()
+    if dataset is not None:
+        cache = cache_fatias.CacheFatiasMapa.para_dataset(dataset)
+    else:
+        cache = cache_fatias.CacheFatiasMapa.para_tabela(carregar_dados_mapa())
+    telemetria.registrar_estatisticas("fatias_mapa", cache.estatisticas)
+    return cache
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_indice_espacial():
+    # (índice espacial dos focos mapeado em memória, se está desatualizado).
+    # O índice é gerado offline por indice_espacial.py: construí-lo aqui
+    # prenderia a primeira requisição por dezenas de segundos. Um índice
+    # anterior aos dados continua servindo, com aviso. (None, False) sem índice.
+    if not os.path.exists(indice_espacial.CAMINHO_INDICE):
+        return None, False
+    with telemetria.etapa("carregamento"):
+        indice = indice_espacial.carregar_indice()
+    fonte = dados_mapa.CAMINHO_PARQUET_MAPA if dados_mapa.existe_parquet_mapa() else dados_mapa.CAMINHO_CSV_MAPA
+    return indice, os.path.exists(fonte) and indice.desatualizado(fonte)
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_mapas_renderizados():
+    # Imagens dos anos passados gravadas por mapas_renderizados.py, conferidas
+    # com a fonte uma vez por processo. None se o passo offline não rodou.
+    import mapas_renderizados
+
+    if not os.path.exists(os.path.join(mapas_renderizados.CAMINHO_MAPAS, mapas_renderizados.ARQUIVO_MANIFESTO)):
+        return None
+    fonte = dados_mapa.CAMINHO_PARQUET_MAPA if dados_mapa.existe_parquet_mapa() else dados_mapa.CAMINHO_CSV_MAPA
+    with telemetria.etapa("carregamento"):
+        return mapas_renderizados.MapasRenderizados(fonte)
+
+
+def mapas_pre_renderizados(ano, estados, zoom):
+    """Imagens do ano, se houver versão pré-renderizada válida (nunca com filtro por estado)."""
+    mapas = carregar_mapas_renderizados()
+    if estados or mapas is None or not mapas.disponivel(ano, zoom):
+        return None
+    return mapas
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_focos_por_estado():
+    # Rollup estado × bioma × ano × mês gravado por geocodificacao.py; sem ele,
+    # é refeito a partir dos dados do mapa se já tiverem a coluna 'estado'.
+    # None quando os focos ainda não foram geocodificados.
+    # Importado só aqui: geocodificacao traz o cKDTree do scipy.
+    import geocodificacao
+
+    with telemetria.etapa("carregamento"):
+        if os.path.exists(geocodificacao.CAMINHO_ROLLUP_ESTADOS):
+            return geocodificacao.carregar_rollup_estados()
+        fonte = dados_mapa.CAMINHO_PARQUET_MAPA if dados_mapa.existe_parquet_mapa() else dados_mapa.CAMINHO_CSV_MAPA
+        if not os.path.exists(fonte):
+            return None
+        return geocodificacao.rollup_da_fonte(fonte)
+
+
+@telemetria.cache_medido(st.cache_data)
+def listar_estados():
+    rollup = carregar_focos_por_estado()
+    if rollup is None:
+        return []
+    return sorted(rollup["estado"].dropna().unique().tolist())
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_cubo_estado(estado):
+    # Cubo ano × mês × bioma de um único estado, a partir do rollup
+    rollup = carregar_focos_por_estado()
+    with telemetria.etapa("agregacao"):
+        return agregados.CuboFocos.a_partir_de_dados(rollup[rollup["estado"] == estado])
+
+
+@telemetria.cache_medido(st.cache_data(show_spinner="Ajustando as previsões..."))
+def carregar_previsao_focos(estado=agregados.TODOS):
+    # (séries mensais, previsão) de todas as séries do cubo em uso. O Brasil
+    # inteiro usa o cache em disco de previsao_volume.py, que só reajusta os
+    # modelos quando as séries mudam; um estado é ajustado na hora.
+    # Importado só aqui, para não pesar na importação das demais páginas
+    import previsao_volume
+
+    cubo = carregar_cubo_focos() if estado == agregados.TODOS else carregar_cubo_estado(estado)
+    if cubo is None:
+        return None
+    series = previsao_volume.montar_series(cubo.tabela, previsao_volume.ultimo_dia_ingerido())
+    with telemetria.etapa("previsao"):
+        if estado == agregados.TODOS:
+            return series, previsao_volume.previsao_em_cache(series)
+        return series, previsao_volume.prever_series(series)
+
+
+def filtrar_dados_mapa(ano, biomas, estados=None):
+    with telemetria.etapa("filtragem"):
+        fatia = obter_cache_fatias().obter(ano, biomas)
+        # O filtro por estado é aplicado sobre a fatia já cacheada (comparação
+        # de códigos categóricos), para não multiplicar as entradas do cache
+        if estados and "estado" in fatia.columns:
+            fatia = fatia[fatia["estado"].isin(estados)]
+        return fatia
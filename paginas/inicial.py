@@ -0,0 +1,45 @@
+# ==============================================================================
+# PÁGINA: PÁGINA INICIAL
+# ==============================================================================
+import streamlit as st
+
+
+def renderizar():
+    st.title("🔥 Análise e Previsão de Queimadas no Brasil")
+    st.markdown("""
+
+        ### Objetivo do Projeto
+
+        Este painel interativo apresenta uma análise detalhada sobre os focos de queimada no Brasil, servindo como uma ferramenta para a compreensão de padrões, sazonalidades e para a prevenção de desastres ambientais. O projeto combina a análise de dados históricos com um modelo preditivo de Machine Learning para estimar o risco de incêndio em tempo real.
+
+        ---
+
+        ### 🌎 Metodologia e Fonte de Dados
+
+        Os dados foram obtidos do **Instituto Nacional de Pesquisas Espaciais (INPE)** e acessados através da plataforma pública [Basedosdados](https://basedosdados.org/dataset/br-inpe-queimadas). A análise abrange o período de 2003 a 2025, permitindo tanto uma visão histórica ampla quanto uma análise aprofundada de dados mais recentes.
+
+        O desenvolvimento seguiu as seguintes etapas:
+        1.  **Coleta e Limpeza:** Os dados foram consultados e pré-filtrados diretamente no Google BigQuery para otimizar o processamento.
+        2.  **Análise Exploratória (EDA):** Foram investigadas tendências temporais e a distribuição dos focos entre os biomas brasileiros.
+        3.  **Modelagem Preditiva:** Foi treinado um modelo `RandomForestRegressor` com dados a partir de 2023 para prever a variável `risco_fogo` com base em características geográficas e meteorológicas.
+        4.  **Desenvolvimento do Dashboard:** A interface foi construída em Streamlit para apresentar os resultados de forma interativa.
+
+        **💻 Tecnologias Utilizadas:** Python, Pandas, Scikit-learn, Geopy, Streamlit, Plotly, Pydeck, Google Colab e BigQuery.
+
+        ---
+
+        ### 🧭 Navegação pelo Dashboard
+
+        Utilize o menu na barra lateral para explorar as diferentes seções do projeto:
+
+        * **📊 Análise Histórica:** Explore gráficos sobre a evolução dos focos de queimada ao longo dos anos e a sua distribuição entre os diferentes biomas brasileiros.
+
+        * **🗺️ Mapa de Exploração Anual:** Visualize geograficamente milhares de focos de queimada em um mapa interativo. Use o slider de ano e os filtros de bioma para investigar padrões espaciais e temporais.
+
+        * **🆚 Comparativo Anual de Mapas:** Compare a distribuição dos focos de incêndio entre dois anos diferentes, lado a lado, para identificar mudanças e tendências de forma clara.
+
+        * **🤖 Previsão de Risco de Fogo:** Interaja com o modelo preditivo. Insira condições como dias sem chuva, precipitação e localização para simular um cenário e receber uma estimativa do risco de fogo em tempo real, visualizada em um mapa.
+        👉 Use o menu lateral para navegar.
+    """)
+    st.image("imagem_queimada.png", caption="Ilustração de osgemeos (@osgemeos) by Instagram", use_container_width=True)
+    st.divider()
@@ -0,0 +1,169 @@
+# ==============================================================================
+# PÁGINA: MAPA DE EXPLORAÇÃO ANUAL
+# ==============================================================================
+import pandas as pd
+import plotly.express as px
+import pydeck as pdk
+import streamlit as st
+
+import agregacao_espacial
+import telemetria
+from paginas import dados
+
+
+def mostrar_resumo_estados(contagem_estado, municipios, ano_selecionado):
+    st.subheader(f"🏛️ Estados com mais focos em {ano_selecionado}")
+    contagem_estado = contagem_estado.loc[lambda c: c > 0].nlargest(10).rename_axis("estado").reset_index(name="contagem")
+    with telemetria.etapa("graficos"):
+        fig_estados = px.bar(
+            contagem_estado, x="contagem", y="estado", orientation="h",
+            labels={"contagem": "Número de Focos", "estado": "Estado"}, text="contagem"
+        ).update_layout(yaxis={"categoryorder": "total ascending"}, showlegend=False)
+        st.plotly_chart(fig_estados, use_container_width=True)
+
+    if municipios is not None:
+        st.markdown("##### Municípios com mais focos")
+        st.dataframe(municipios, hide_index=True, use_container_width=True)
+
+
+def resumo_estados_da_fatia(df_filtrado):
+    # Contagens por estado e municípios mais atingidos, das colunas pré-calculadas na fatia
+    with telemetria.etapa("agregacao"):
+        contagem_estado = df_filtrado["estado"].value_counts()
+        municipios = None
+        if "municipio" in df_filtrado.columns:
+            municipios = (df_filtrado.groupby(["municipio", "estado"], observed=True).size()
+                          .nlargest(10).rename("Focos").reset_index()
+                          .rename(columns={"municipio": "Município", "estado": "Estado"}))
+    return contagem_estado, municipios
+
+
+def resumo_estados_do_rollup(ano_selecionado, biomas_selecionados):
+    # Anos pré-renderizados não leem os focos: as contagens vêm do rollup por estado
+    rollup = dados.carregar_focos_por_estado()
+    if rollup is None:
+        return None
+    with telemetria.etapa("agregacao"):
+        rollup = rollup[(rollup["ano"] == ano_selecionado) & rollup["bioma"].isin(biomas_selecionados)]
+        return rollup.groupby("estado", observed=True)["contagem_focos"].sum(), None
+
+
+def renderizar():
+    st.title("🗺️ Análise Anual e Comparativa dos Focos de Queimada")
+    st.markdown("Use o controle deslizante para selecionar um ano e veja a distribuição dos focos no mapa e no gráfico de resumo.")
+
+    anos_biomas_mapa = dados.listar_anos_biomas_mapa()
+    if anos_biomas_mapa is not None:
+        # --- FILTROS ---
+        
+        # 1. Slider para selecionar um único ano
+        anos_disponiveis, biomas_disponiveis = anos_biomas_mapa
+        ano_selecionado = st.slider(
+            "Selecione o Ano para Análise:",
+            min_value=min(anos_disponiveis),
+            max_value=max(anos_disponiveis),
+            value=max(anos_disponiveis), # Começa com o ano mais recente
+            step=1
+        )
+        
+        # Filtro para Biomas continua útil para focar a análise
+        biomas_selecionados = st.multiselect(
+            "Selecione os biomas para exibir:",
+            options=biomas_disponiveis,
+            default=biomas_disponiveis
+        )
+
+        # Filtro opcional por estado (vazio = todos), disponível depois da geocodificação
+        estados_disponiveis = dados.listar_estados()
+        estados_selecionados = st.multiselect(
+            "Filtre por estados (opcional):",
+            options=estados_disponiveis
+        ) if estados_disponiveis else []
+
+        # Nível de detalhe: define o zoom inicial e o tamanho das células quando
+        # o número de focos passa do limite de pontos brutos
+        zoom = st.select_slider("Nível de detalhe (zoom):", options=agregacao_espacial.NIVEIS_ZOOM, value=3.5)
+
+        # --- LÓGICA DE FILTRAGEM ---
+        if biomas_selecionados:
+            # Anos encerrados usam as imagens pré-renderizadas (custo constante);
+            # o ano corrente e os filtros por estado leem e agregam os focos
+            mapas = dados.mapas_pre_renderizados(ano_selecionado, estados_selecionados, zoom)
+            if mapas is not None:
+                df_filtrado = None
+                focos_por_bioma = mapas.focos(ano_selecionado, biomas_selecionados)
+                total_focos = sum(focos_por_bioma.values())
+            else:
+                df_filtrado = dados.filtrar_dados_mapa(ano_selecionado, biomas_selecionados, estados_selecionados)
+                focos_por_bioma = df_filtrado['bioma'].value_counts().loc[lambda c: c > 0].to_dict()
+                total_focos = len(df_filtrado)
+
+            # --- CORES E LEGENDA PARA OS BIOMAS ---
+            cores_bioma = agregacao_espacial.CORES_BIOMA
+
+            # Legenda dinâmica
+            legenda_html = "<div style='display:flex; flex-wrap:wrap; gap:15px; align-items:center; margin-bottom:10px;'>"
+            legenda_html += "<h4>Legendas por Bioma:</h4>"
+            for bioma, cor in cores_bioma.items():
+                if bioma in biomas_disponiveis:
+                    cor_hex = '#%02x%02x%02x' % tuple(cor)
+                    legenda_html += f"<div style='display:flex; align-items:center; gap:5px;'><span style='width:20px; height:20px; background-color:{cor_hex}; border-radius:3px;'></span><span>{bioma}</span></div>"
+            legenda_html += "</div>"
+            st.markdown(legenda_html, unsafe_allow_html=True)
+
+            # --- LAYOUT COM DUAS COLUNAS: MAPA E GRÁFICO ---
+            col_mapa, col_grafico = st.columns([3, 2]) # Mapa ocupa 60%, gráfico 40%
+
+            with col_mapa:
+                st.subheader(f"📍 Distribuição de {total_focos:,} focos em {ano_selecionado}")
+                if total_focos:
+                    view_state = pdk.ViewState(latitude=-14, longitude=-55, zoom=zoom, pitch=0)
+                    if mapas is not None:
+                        with telemetria.etapa("graficos"):
+                            st.pydeck_chart(pdk.Deck(layers=mapas.camadas(ano_selecionado, biomas_selecionados, zoom),
+                                                     initial_view_state=view_state))
+                        st.caption("Mapa pré-renderizado do ano encerrado (cor do bioma, opacidade pela contagem de focos na célula).")
+                    else:
+                        with telemetria.etapa("agregacao"):
+                            layer, tooltip, agregado = agregacao_espacial.construir_camada_focos(df_filtrado, zoom, cores_bioma)
+                        with telemetria.etapa("graficos"):
+                            r = pdk.Deck(layers=[layer], initial_view_state=view_state, tooltip=tooltip)
+                            st.pydeck_chart(r)
+                        if agregado:
+                            st.caption("Focos agrupados em células (cor do bioma dominante). Aumente o zoom para células menores.")
+                else:
+                    st.info("Nenhum foco de queimada encontrado com os filtros selecionados.")
+
+            with col_grafico:
+                st.subheader(f"📊 Resumo por Bioma em {ano_selecionado}")
+                if total_focos:
+                    # Focos por bioma no ano selecionado
+                    contagem_bioma = pd.DataFrame(list(focos_por_bioma.items()), columns=['bioma', 'contagem'])
+                    
+                    # Cria o gráfico de barras com as cores correspondentes
+                    with telemetria.etapa("graficos"):
+                        fig_resumo = px.bar(
+                            contagem_bioma,
+                            x='contagem',
+                            y='bioma',
+                            orientation='h',
+                            color='bioma',
+                            color_discrete_map={bioma: f'rgb({r},{g},{b})' for bioma, (r,g,b) in cores_bioma.items()},
+                            labels={'contagem': 'Número de Focos', 'bioma': 'Bioma'},
+                            text='contagem'
+                        ).update_layout(yaxis={'categoryorder':'total ascending'}, showlegend=False)
+                        st.plotly_chart(fig_resumo, use_container_width=True)
+
+                    # Resumo por estado e municípios
+                    if df_filtrado is None:
+                        resumo_estados = resumo_estados_do_rollup(ano_selecionado, biomas_selecionados)
+                    elif "estado" in df_filtrado.columns:
+                        resumo_estados = resumo_estados_da_fatia(df_filtrado)
+                    else:
+                        resumo_estados = None
+                    if resumo_estados is not None:
+                        mostrar_resumo_estados(*resumo_estados, ano_selecionado)
+                else:
+                    st.info("Sem dados para exibir.")
+        else:
+            st.warning("⚠️ Por favor, selecione pelo menos um bioma.")
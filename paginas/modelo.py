@@ -0,0 +1,89 @@
+# ==============================================================================
+# CARREGAMENTO DO MODELO (SOB DEMANDA, COM AQUECIMENTO OPCIONAL)
+# ==============================================================================
+# O modelo só é lido quando a página de previsão é aberta. Com a variável de
+# ambiente QUEIMADAS_AQUECER_MODELO=1, o app inicia a leitura em uma thread
+# de fundo logo depois de desenhar a primeira página, e a página de previsão
+# apenas aguarda o resultado.
+#
+# O arquivo lido é a versão compatível mais nova em 'modelos/' (gerada por
+# treinamento.py) ou, sem nenhuma, o 'modelo_risco_fogo.joblib' legado.
+# ==============================================================================
+import functools
+import threading
+
+import joblib
+import streamlit as st
+
+import modelo_risco
+import telemetria
+import versoes_modelo
+
+_trava = threading.Lock()
+_aquecimento = {"thread": None, "modelo": None, "erro": None}
+
+
+@functools.lru_cache(maxsize=1)
+def escolher_versao():
+    """(caminho, metadados) do modelo usado por este processo, escolhido uma única vez."""
+    return versoes_modelo.escolher_modelo()
+
+
+def _ler_modelo():
+    caminho, _ = escolher_versao()
+    return joblib.load(caminho)
+
+
+def _aquecer():
+    try:
+        _aquecimento["modelo"] = _ler_modelo()
+    except Exception as erro:
+        _aquecimento["erro"] = erro
+
+
+def aquecer_em_segundo_plano():
+    """Inicia (uma vez por processo) a leitura do modelo em uma thread de fundo."""
+    with _trava:
+        if _aquecimento["thread"] is None:
+            _aquecimento["thread"] = threading.Thread(target=_aquecer, name="aquecer-modelo", daemon=True)
+            _aquecimento["thread"].start()
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_modelo():
+    try:
+        with _trava:
+            thread = _aquecimento["thread"]
+        with telemetria.etapa("carregamento"):
+            if thread is None:
+                return _ler_modelo()
+            thread.join()
+        if _aquecimento["erro"] is not None:
+            raise _aquecimento["erro"]
+        return _aquecimento["modelo"]
+    except FileNotFoundError as erro:
+        st.error(f"❌ {erro} Gere um com `python treinamento.py`.")
+        return None
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_floresta_compilada():
+    # Versão achatada em arrays da floresta, usada no caminho rápido da previsão
+    modelo = carregar_modelo()
+    if modelo is None:
+        return None
+    with telemetria.etapa("compilacao"):
+        return modelo_risco.FlorestaCompilada.a_partir_de_modelo(modelo)
+
+
+def descrever_versao():
+    """Resumo em uma linha do modelo em uso (para legendas)."""
+    try:
+        caminho, metadados = escolher_versao()
+    except FileNotFoundError:
+        return None
+    if metadados is None:
+        return f"Modelo legado '{caminho}' (sem metadados de treino)."
+    janela, metricas, floresta = metadados["janela"], metadados["metricas"], metadados["floresta"]
+    return (f"Modelo versão {metadados['versao']}: {floresta['arvores']} árvores, "
+            f"treinado com focos de {janela['desde']} a {janela['ate']}, R² de validação {metricas['r2_validacao']:.3f}.")
@@ -0,0 +1,313 @@
+# ==============================================================================
+# PÁGINA: PREVISÃO DE RISCO DE FOGO
+# ==============================================================================
+import os
+
+import pandas as pd
+import plotly.express as px
+import pydeck as pdk
+import streamlit as st
+
+import modelo_risco
+import superficie_risco
+import telemetria
+from paginas import dados, modelo
+
+
+@telemetria.cache_medido(st.cache_resource)
+def carregar_mascara_biomas():
+    # Máscara estática de biomas da superfície de risco (gerada por superficie_risco.py)
+    if os.path.exists(superficie_risco.CAMINHO_MASCARA):
+        with telemetria.etapa("carregamento"):
+            return superficie_risco.carregar_mascara()
+    return None
+
+
+@telemetria.cache_medido(st.cache_data(show_spinner="Calculando a superfície de risco..."))
+def calcular_imagem_superficie(mes, dias_sem_chuva, precipitacao, satelite, resolucao):
+    # Cacheado por conjunto de parâmetros: só a primeira consulta avalia a grade
+    floresta, mascara_biomas = modelo.carregar_floresta_compilada(), carregar_mascara_biomas()
+    with telemetria.etapa("previsao"):
+        risco = superficie_risco.calcular_superficie(
+            floresta, mascara_biomas, mes, dias_sem_chuva, precipitacao, satelite, resolucao
+        )
+    with telemetria.etapa("graficos"):
+        imagem = superficie_risco.imagem_png_base64(superficie_risco.colorir(risco))
+    return imagem, int((~pd.isna(risco)).sum()), float(pd.Series(risco.ravel()).max())
+
+
+# Rótulos das variáveis que podem ser varridas na análise de sensibilidade
+ROTULOS_VARREDURA = {
+    "dias_sem_chuva": "Dias sem chuva",
+    "precipitacao": "Precipitação (mm)",
+    "mes": "Mês",
+    "latitude": "Latitude",
+    "longitude": "Longitude",
+    "bioma": "Bioma",
+    "satelite": "Satélite",
+}
+
+# Quantis das previsões das árvores mostrados como faixa de incerteza
+QUANTIS_INTERVALO = (0.1, 0.9)
+
+
+@telemetria.cache_medido(st.cache_data(show_spinner="Avaliando a grade de cenários..."))
+def calcular_varredura(varridas, fixos):
+    # Cacheado pelas variáveis varridas (em ordem canônica) e pelos valores
+    # fixos: trocar o eixo ou o tipo de gráfico reaproveita a mesma grade
+    floresta = modelo.carregar_floresta_compilada()
+    with telemetria.etapa("previsao"):
+        return modelo_risco.avaliar_grade(floresta, list(varridas), dict(fixos))
+
+
+def mostrar_contribuicoes(explicacao, entradas):
+    st.markdown("---")
+    st.subheader("🧭 O que mais pesou nesta previsão")
+    contribuicoes = modelo_risco.contribuicoes_por_entrada(explicacao["contribuicoes"])
+    tabela = pd.DataFrame({
+        "entrada": [f"{ROTULOS_VARREDURA[nome]} = {entradas[nome]}" for nome in modelo_risco.ENTRADAS],
+        "contribuicao": contribuicoes,
+    })
+    tabela = tabela.reindex(tabela["contribuicao"].abs().sort_values(ascending=False).index)
+    with telemetria.etapa("graficos"):
+        fig = px.bar(tabela, x="contribuicao", y="entrada", orientation="h",
+                     color=tabela["contribuicao"] > 0, color_discrete_map={True: "#dc3545", False: "#28a745"},
+                     labels={"contribuicao": "Contribuição para o risco", "entrada": ""})
+        fig.update_layout(showlegend=False, yaxis={"categoryorder": "array", "categoryarray": tabela["entrada"][::-1]})
+        fig.update_xaxes(tickformat="+.1%")
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Partindo do risco médio do modelo ({explicacao['base']:.1%}), cada entrada soma ou subtrai "
+               "o quanto as divisões das árvores nela mudaram a estimativa; a soma dá o valor previsto.")
+
+
+def mostrar_historico_proximo(indice, latitude, longitude, raio_km):
+    st.markdown("---")
+    st.subheader(f"🕑 Focos históricos a até {raio_km} km")
+    with telemetria.etapa("filtragem"):
+        por_ano_mes = indice.contar_por_ano_mes(latitude, longitude, raio_km)
+        proximos = indice.mais_proximos(latitude, longitude, k=10)
+    total = int(por_ano_mes.to_numpy().sum())
+
+    col_metricas, col_grafico = st.columns([1, 2])
+    with col_metricas:
+        st.metric("Focos no raio (todos os anos)", f"{total:,}")
+        if total:
+            por_ano = por_ano_mes.sum(axis=1)
+            st.metric("Ano com mais focos", f"{por_ano.idxmax()}", f"{int(por_ano.max()):,} focos", delta_color="off")
+        if not proximos.empty:
+            st.metric("Foco registrado mais próximo", f"{proximos['distancia_km'].iloc[0]:.1f} km")
+    with col_grafico:
+        if total and len(por_ano_mes.columns) == 12:
+            with telemetria.etapa("graficos"):
+                fig = px.imshow(por_ano_mes, labels=dict(x="Mês", y="Ano", color="Nº de Focos"),
+                                color_continuous_scale="YlOrRd", aspect="auto")
+                st.plotly_chart(fig, use_container_width=True)
+        elif total:
+            st.bar_chart(por_ano_mes.sum(axis=1))
+        else:
+            st.info("Nenhum foco histórico registrado neste raio.")
+
+    if not proximos.empty:
+        st.markdown("##### Focos registrados mais próximos")
+        st.dataframe(
+            proximos[["distancia_km", "ano", "mes", "bioma", "latitude", "longitude"]].rename(columns={
+                "distancia_km": "Distância (km)", "ano": "Ano", "mes": "Mês", "bioma": "Bioma",
+                "latitude": "Latitude", "longitude": "Longitude",
+            }).round({"Distância (km)": 1}),
+            hide_index=True, use_container_width=True,
+        )
+
+
+def _valores_para_curvas(valores, maximo=8):
+    # Variáveis com muitos valores viram no máximo `maximo` curvas, espaçadas
+    unicos = pd.unique(valores)
+    if len(unicos) <= maximo:
+        return unicos
+    return unicos[[round(i * (len(unicos) - 1) / (maximo - 1)) for i in range(maximo)]]
+
+
+def mostrar_varredura():
+    st.markdown("Varre uma ou duas variáveis em toda a sua faixa, com as demais fixas, e avalia todos os cenários de uma vez.")
+    nomes = list(ROTULOS_VARREDURA)
+    col1, col2 = st.columns(2)
+    with col1:
+        variavel_1 = st.selectbox("Variar:", nomes, 0, format_func=ROTULOS_VARREDURA.get)
+    with col2:
+        variavel_2 = st.selectbox("E também (opcional):", [None] + [n for n in nomes if n != variavel_1], 1,
+                                  format_func=lambda n: "Nenhuma" if n is None else ROTULOS_VARREDURA[n])
+    varridas = [v for v in (variavel_1, variavel_2) if v is not None]
+
+    st.markdown("##### Valores fixos das demais variáveis:")
+    col1, col2 = st.columns(2)
+    with col1:
+        dias_sem_chuva = st.slider("Dias sem chuva", 0, 100, 15, disabled="dias_sem_chuva" in varridas)
+        precipitacao = st.number_input("Precipitação (mm)", 0.0, 200.0, 0.0, step=0.1, disabled="precipitacao" in varridas)
+        mes = st.selectbox("Mês", list(range(1, 13)), 8, disabled="mes" in varridas)
+        satelite = st.selectbox("Satélite", modelo_risco.opcoes_categoria("satelite_", modelo_risco.SATELITE_BASE),
+                                disabled="satelite" in varridas)
+    with col2:
+        latitude = st.number_input("Latitude", -34.0, 5.0, -10.0, format="%.4f", disabled="latitude" in varridas)
+        longitude = st.number_input("Longitude", -74.0, -34.0, -55.0, format="%.4f", disabled="longitude" in varridas)
+        bioma = st.selectbox("Bioma", modelo_risco.opcoes_categoria("bioma_", modelo_risco.BIOMA_BASE),
+                             disabled="bioma" in varridas)
+
+    entradas = dict(dias_sem_chuva=dias_sem_chuva, precipitacao=precipitacao, mes=mes, latitude=latitude,
+                    longitude=longitude, bioma=bioma, satelite=satelite)
+    # Ordem canônica: (bioma, mês) e (mês, bioma) compartilham a mesma entrada do cache
+    chave_varridas = tuple(sorted(varridas, key=nomes.index))
+    fixos = tuple((nome, valor) for nome, valor in entradas.items() if nome not in varridas)
+    grade = calcular_varredura(chave_varridas, fixos)
+    grade = grade.rename(columns=ROTULOS_VARREDURA)
+    rotulos = [ROTULOS_VARREDURA[v] for v in varridas]
+
+    st.subheader(f"📈 Risco previsto em {len(grade):,} cenários")
+    st.caption(f"Mínimo {grade['risco'].min():.2%} · máximo {grade['risco'].max():.2%}")
+
+    with telemetria.etapa("graficos"):
+        if len(rotulos) == 1:
+            eixo_x = rotulos[0]
+            if grade[eixo_x].dtype == object:
+                fig = px.bar(grade, x=eixo_x, y="risco", labels={"risco": "Risco previsto"})
+            else:
+                fig = px.line(grade, x=eixo_x, y="risco", markers=len(grade) <= 12, labels={"risco": "Risco previsto"})
+            fig.update_yaxes(tickformat=".0%")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                tipo = st.radio("Gráfico:", ["Mapa de calor", "Curvas de resposta"], horizontal=True)
+            with col2:
+                eixo_x = st.radio("Eixo horizontal:", rotulos, horizontal=True)
+            eixo_y = rotulos[1] if eixo_x == rotulos[0] else rotulos[0]
+            if tipo == "Mapa de calor":
+                tabela = grade.pivot(index=eixo_y, columns=eixo_x, values="risco")
+                fig = px.imshow(tabela, labels=dict(x=eixo_x, y=eixo_y, color="Risco previsto"),
+                                color_continuous_scale="YlOrRd", aspect="auto", origin="lower")
+            else:
+                curvas = grade[grade[eixo_y].isin(_valores_para_curvas(grade[eixo_y]))]
+                fig = px.line(curvas, x=eixo_x, y="risco", color=curvas[eixo_y].astype(str),
+                              labels={"risco": "Risco previsto", "color": eixo_y})
+                fig.update_yaxes(tickformat=".0%")
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def renderizar():
+    st.title("🤖 Previsão de Risco de Fogo")
+
+    floresta = modelo.carregar_floresta_compilada()
+    if floresta is not None:
+        st.caption(modelo.descrever_versao())
+    modo_previsao = st.radio("Modo:", ["Ponto único", "Superfície nacional", "Análise de sensibilidade"], horizontal=True)
+
+    if floresta is not None and modo_previsao == "Superfície nacional":
+        st.markdown("Avalia o modelo em uma grade cobrindo todo o Brasil. O bioma de cada célula vem de uma máscara estática dos focos históricos.")
+        mascara_biomas = carregar_mascara_biomas()
+        if mascara_biomas is None:
+            st.warning(f"⚠️ Arquivo '{superficie_risco.CAMINHO_MASCARA}' não encontrado. Gere a máscara com `python superficie_risco.py`.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                mes = st.selectbox("Mês", list(range(1, 13)), 8)
+                dias_sem_chuva = st.slider("Dias sem chuva", 0, 100, 15)
+                precipitacao = st.number_input("Precipitação (mm)", 0.0, 200.0, 0.0, step=0.1)
+            with col2:
+                satelite = st.selectbox("Satélite", modelo_risco.opcoes_categoria("satelite_", modelo_risco.SATELITE_BASE))
+                resolucao = st.select_slider("Resolução da grade (graus):", options=[0.5, 0.25, 0.1], value=0.25)
+
+            imagem, n_celulas, risco_maximo = calcular_imagem_superficie(mes, dias_sem_chuva, precipitacao, satelite, resolucao)
+            st.subheader(f"🔥 Risco previsto em {n_celulas:,} células (máximo {risco_maximo:.2%})")
+            with telemetria.etapa("graficos"):
+                view_state = pdk.ViewState(latitude=-14, longitude=-55, zoom=3.5, pitch=0)
+                st.pydeck_chart(pdk.Deck(layers=[superficie_risco.construir_camada_superficie(imagem)], initial_view_state=view_state))
+
+    elif floresta is not None and modo_previsao == "Análise de sensibilidade":
+        mostrar_varredura()
+
+    elif floresta is not None:
+        with st.form("formulario_previsao"):
+            st.markdown("##### Preencha os dados para a simulação:")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                dias_sem_chuva = st.slider("Dias sem chuva", 0, 100, 15)
+                precipitacao = st.number_input("Precipitação (mm)", 0.0, 200.0, 0.0, step=0.1)
+                mes = st.selectbox("Mês", list(range(1, 13)), 8)
+                
+                # Opções de satélite geradas a partir das colunas do modelo
+                opcoes_satelite = modelo_risco.opcoes_categoria("satelite_", modelo_risco.SATELITE_BASE)
+                satelite = st.selectbox("Satélite", opcoes_satelite)
+
+            with col2:
+                latitude = st.number_input("Latitude", -34.0, 5.0, -10.0, format="%.4f")
+                longitude = st.number_input("Longitude", -74.0, -34.0, -55.0, format="%.4f")
+                
+                # Opções de bioma geradas a partir das colunas do modelo
+                opcoes_bioma = modelo_risco.opcoes_categoria("bioma_", modelo_risco.BIOMA_BASE)
+                bioma = st.selectbox("Bioma", opcoes_bioma)
+
+            raio_km = st.slider("Raio do histórico de focos próximos (km)", 5, 200, 50)
+            detalhar = st.checkbox("Mostrar incerteza entre as árvores e o peso de cada entrada", value=True)
+            submit = st.form_submit_button("🔮 Realizar Previsão")
+
+        if submit:
+            # Floresta compilada: mesmo resultado de modelo.predict, sem montar
+            # DataFrame. A dispersão entre as árvores e as contribuições só são
+            # calculadas (explicar_um, a mesma passada com os deltas) se exibidas
+            entradas = dict(dias_sem_chuva=dias_sem_chuva, precipitacao=precipitacao, mes=mes, latitude=latitude,
+                            longitude=longitude, bioma=bioma, satelite=satelite)
+            with telemetria.etapa("previsao"):
+                if detalhar:
+                    explicacao = floresta.explicar_um(**entradas, quantis=QUANTIS_INTERVALO)
+                    previsao = explicacao["previsao"]
+                else:
+                    explicacao, previsao = None, floresta.prever_um(**entradas)
+
+            # --- EXIBIÇÃO DOS RESULTADOS ---
+            st.markdown("---")
+            st.subheader("Resultado da Previsão:")
+            
+            col_resultado, col_mapa = st.columns([1, 2])
+
+            with col_resultado:
+                def get_cor_risco(risco):
+                    if risco >= 0.75: return '#dc3545'
+                    elif risco >= 0.5: return '#ffc107'
+                    else: return '#28a745'
+                cor_valor = get_cor_risco(previsao)
+                st.markdown(f"""
+                <div style="border: 1px solid #2e2e2e; border-radius: 5px; padding: 10px; text-align: center;">
+                    <p style="font-size: 16px; color: #aaa; margin-bottom: -5px;">Valor Previsto</p>
+                    <p style="font-size: 32px; font-weight: bold; color: {cor_valor};">{previsao:.2%}</p>
+                </div>
+                """, unsafe_allow_html=True)
+                st.progress(previsao)
+                if explicacao is not None:
+                    p_inf, p_sup = (round(q * 100) for q in QUANTIS_INTERVALO)
+                    st.caption(f"Entre as árvores do modelo: P{p_inf} {explicacao['inferior']:.1%} – "
+                               f"P{p_sup} {explicacao['superior']:.1%} (desvio-padrão {explicacao['desvio']:.1%}).")
+
+            with col_mapa:
+                # --- NOVO MAPA SIMPLIFICADO ---
+                st.subheader("📍 Localização da Previsão")
+                
+                # 1. Cria um DataFrame simples com as colunas 'latitude' e 'longitude'
+                map_data = pd.DataFrame({
+                    'latitude': [latitude],
+                    'longitude': [longitude]
+                })
+                
+                # 2. Chama st.map com os dados
+                st.map(map_data, zoom=6)
+
+            if explicacao is not None:
+                mostrar_contribuicoes(explicacao, entradas)
+
+            # --- HISTÓRICO DE FOCOS PRÓXIMOS (ÍNDICE ESPACIAL) ---
+            indice, desatualizado = dados.carregar_indice_espacial()
+            if indice is not None:
+                mostrar_historico_proximo(indice, latitude, longitude, raio_km)
+                if desatualizado:
+                    st.caption("⚠️ O índice espacial é anterior aos dados do mapa; rode "
+                               "`python indice_espacial.py` para incluir os focos mais recentes.")
+            else:
+                st.info("Para ver o histórico de focos próximos, gere o índice espacial com "
+                        "`python indice_espacial.py`.")
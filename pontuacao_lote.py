@@ -0,0 +1,271 @@
+# ==============================================================================
+# PONTUAÇÃO EM LOTE DO RISCO DE FOGO (LINHA DE COMANDO)
+# ==============================================================================
+# Avalia o modelo de risco em arquivos grandes de leituras de estações (CSV,
+# opcionalmente .gz, ou Parquet — arquivo único ou diretório), sem passar pelo
+# formulário do app. O arquivo precisa das colunas de entrada do modelo:
+#     dias_sem_chuva, precipitacao, mes, latitude, longitude, bioma, satelite
+# As demais colunas (identificador da estação, data...) são copiadas para a
+# saída, que ganha a coluna 'risco_previsto'.
+#
+# A entrada é lida em streaming (Arrow), em blocos de `--tamanho-bloco`
+# linhas. Cada bloco é codificado com modelo_risco.codificar_lote (o mesmo
+# one-hot do app, com Amazônia e AQUA_M como categorias base) e avaliado pela
+# floresta compilada em um processo de trabalho, que grava o resultado como
+# uma parte própria da saída ('parte-000000.parquet' ou '.csv'). No máximo
+# 2 × processos blocos ficam em memória ao mesmo tempo. Com --intervalos, a
+# mesma passada pela floresta (FlorestaCompilada.explicar) acrescenta os
+# quantis 10% e 90% e o desvio-padrão das previsões das árvores.
+#
+# Cada parte é gravada de forma atômica. Se a execução for interrompida, a
+# mesma linha de comando retoma do ponto em que parou: os blocos que já têm
+# parte são pulados. O arquivo '_progresso.json' guarda a entrada, o modelo e
+# o tamanho do bloco usados (e se houve --intervalos); se algum deles mudar,
+# é preciso --recomecar.
+#
+# Uso:
+#     python pontuacao_lote.py leituras.csv saida_risco/ [--processos 4]
+#                              [--tamanho-bloco 200000] [--formato parquet|csv] [--intervalos]
+#                              [--modelo modelos/modelo_risco_fogo-<versao>.joblib]
+# ==============================================================================
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import joblib
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import modelo_risco
+import versoes_modelo
+
+TAMANHO_BLOCO = 200_000
+COLUNA_SAIDA = "risco_previsto"
+# Colunas extras de --intervalos → chave do resultado de FlorestaCompilada.explicar
+COLUNAS_INTERVALO = {"risco_inferior": "inferior", "risco_superior": "superior", "risco_desvio": "desvio"}
+ARQUIVO_PROGRESSO = "_progresso.json"
+FORMATOS = ("parquet", "csv")
+# Tipos fixos das colunas de entrada no CSV: sem isso o Arrow deduz o tipo
+# pelo primeiro bloco e falha se um "inteiro" virar 1.5 mais adiante
+TIPOS_CSV = {**{c: pa.float64() for c in modelo_risco.COLUNAS_NUMERICAS}, "bioma": pa.string(), "satelite": pa.string()}
+
+# Floresta compilada de cada processo de trabalho (definida por _iniciar_processo)
+_floresta = None
+
+
+# ==============================================================================
+# LEITURA EM BLOCOS
+# ==============================================================================
+def _assinatura(caminho):
+    # Tamanho e data de modificação da entrada (somados/máximos em diretórios)
+    arquivos = [caminho]
+    if os.path.isdir(caminho):
+        arquivos = [os.path.join(raiz, nome) for raiz, _, nomes in os.walk(caminho) for nome in nomes]
+    estados = [os.stat(a) for a in arquivos]
+    return {"tamanho": sum(e.st_size for e in estados),
+            "modificado": int(max((e.st_mtime for e in estados), default=0))}
+
+
+def _abrir_entrada(entrada):
+    """(esquema, iterador de RecordBatch, total de linhas ou None) da entrada."""
+    if os.path.isdir(entrada) or entrada.lower().endswith(".parquet"):
+        dataset = ds.dataset(entrada, format="parquet", partitioning="hive")
+        return dataset.schema, dataset.to_batches(), dataset.count_rows()
+    leitor = pa_csv.open_csv(entrada, convert_options=pa_csv.ConvertOptions(column_types=TIPOS_CSV))
+    return leitor.schema, leitor, None
+
+
+def _verificar_colunas(entrada, colunas):
+    faltantes = [c for c in modelo_risco.ENTRADAS if c not in colunas]
+    if faltantes:
+        raise ValueError(f"'{entrada}' não tem as colunas de entrada do modelo: {', '.join(faltantes)}.")
+
+
+def ler_blocos(lotes, tamanho_bloco=TAMANHO_BLOCO):
+    """Reagrupa os lotes Arrow em tabelas de exatamente `tamanho_bloco` linhas (a última, menor)."""
+    pendentes, linhas = [], 0
+    for lote in lotes:
+        while lote.num_rows:
+            parte = lote.slice(0, tamanho_bloco - linhas)
+            pendentes.append(parte)
+            linhas += parte.num_rows
+            lote = lote.slice(parte.num_rows)
+            if linhas == tamanho_bloco:
+                yield pa.Table.from_batches(pendentes)
+                pendentes, linhas = [], 0
+    if linhas:
+        yield pa.Table.from_batches(pendentes)
+
+
+# ==============================================================================
+# PONTUAÇÃO (PROCESSOS DE TRABALHO)
+# ==============================================================================
+def pontuar_tabela(floresta, tabela, intervalos=False):
+    """Colunas de saída ({nome: array}) para uma tabela Arrow com as colunas de entrada."""
+    colunas = [tabela.column(c).to_numpy(zero_copy_only=False) for c in modelo_risco.ENTRADAS]
+    X = modelo_risco.codificar_lote(*colunas)
+    if not intervalos:
+        return {COLUNA_SAIDA: floresta.prever(X)}
+    explicacao = floresta.explicar(X)
+    return {COLUNA_SAIDA: explicacao["previsao"], **{nome: explicacao[chave] for nome, chave in COLUNAS_INTERVALO.items()}}
+
+
+def _nome_parte(indice, formato):
+    return f"parte-{indice:06d}.{formato}"
+
+
+def _iniciar_processo(floresta):
+    global _floresta
+    _floresta = floresta
+
+
+def _pontuar_bloco(indice, tabela, destino, formato, intervalos):
+    inicio = time.perf_counter()
+    saida = tabela
+    for nome, valores in pontuar_tabela(_floresta, tabela, intervalos).items():
+        saida = saida.append_column(nome, pa.array(valores, pa.float64()))
+    caminho = os.path.join(destino, _nome_parte(indice, formato))
+    temporario = caminho + ".tmp"
+    if formato == "parquet":
+        pq.write_table(saida, temporario)
+    else:
+        pa_csv.write_csv(saida, temporario)
+    os.replace(temporario, caminho)
+    return indice, tabela.num_rows, time.perf_counter() - inicio
+
+
+# ==============================================================================
+# PROGRESSO E EXECUÇÃO
+# ==============================================================================
+def _preparar_destino(destino, progresso, recomecar):
+    """Cria o destino e devolve os índices dos blocos já pontuados."""
+    caminho = os.path.join(destino, ARQUIVO_PROGRESSO)
+    if recomecar and os.path.isdir(destino):
+        shutil.rmtree(destino)
+    os.makedirs(destino, exist_ok=True)
+    if os.path.exists(caminho):
+        with open(caminho, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        diferentes = [c for c in progresso if anterior.get(c) != progresso[c]]
+        if diferentes:
+            raise ValueError(f"'{destino}' tem uma pontuação com outro(a) {', '.join(diferentes)}; "
+                             "use --recomecar para descartá-la.")
+    _gravar_progresso(caminho, progresso)
+
+    feitos = set()
+    for nome in os.listdir(destino):
+        if nome.endswith(".tmp"):
+            os.remove(os.path.join(destino, nome))
+        elif nome.startswith("parte-") and nome.endswith("." + progresso["formato"]):
+            feitos.add(int(nome[len("parte-"):].split(".")[0]))
+    return feitos
+
+
+def _gravar_progresso(caminho, progresso):
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(progresso, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def pontuar_arquivo(entrada, destino, caminho_modelo=None, processos=None, tamanho_bloco=TAMANHO_BLOCO,
+                    formato="parquet", recomecar=False, intervalos=False):
+    """Pontua `entrada` em blocos paralelos e grava as partes em `destino`.
+
+    Retorna um resumo com as linhas pontuadas nesta execução, os blocos
+    pulados (já pontuados antes) e a vazão em linhas por segundo.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato '{formato}' inválido (use {' ou '.join(FORMATOS)}).")
+    metadados = None
+    if caminho_modelo is None:
+        caminho_modelo, metadados = versoes_modelo.escolher_modelo()
+    esquema, lotes, total = _abrir_entrada(entrada)
+    _verificar_colunas(entrada, esquema.names)
+
+    progresso = {
+        "entrada": os.path.abspath(entrada),
+        "assinatura": _assinatura(entrada),
+        "modelo": os.path.abspath(caminho_modelo),
+        "versao": metadados["versao"] if metadados else None,
+        "tamanho_bloco": tamanho_bloco,
+        "formato": formato,
+        "intervalos": intervalos,
+        # Partes antigas (float32) não se misturam com as novas ao retomar
+        "tipo_saida": "float64",
+    }
+    feitos = _preparar_destino(destino, progresso, recomecar)
+    floresta = modelo_risco.FlorestaCompilada.a_partir_de_modelo(joblib.load(caminho_modelo))
+    processos = processos or os.cpu_count() or 1
+    if feitos:
+        print(f"↪️  Retomando: {len(feitos)} bloco(s) já pontuado(s) em '{destino}'.", flush=True)
+
+    inicio = time.perf_counter()
+    resumo = {"linhas": 0, "blocos": 0, "blocos_pulados": 0}
+
+    def registrar(indice, linhas, segundos):
+        resumo["linhas"] += linhas
+        resumo["blocos"] += 1
+        decorrido = time.perf_counter() - inicio
+        andamento = f"{resumo['linhas']:,}" + (f"/{total:,}" if total is not None else "")
+        print(f"  bloco {indice}: {linhas:,} linhas em {segundos:.2f} s · {andamento} linhas nesta execução · "
+              f"{resumo['linhas'] / decorrido:,.0f} linhas/s", flush=True)
+
+    blocos = ((i, tabela) for i, tabela in enumerate(ler_blocos(lotes, tamanho_bloco)))
+    if processos == 1:
+        _iniciar_processo(floresta)
+        for indice, tabela in blocos:
+            if indice in feitos:
+                resumo["blocos_pulados"] += 1
+                continue
+            registrar(*_pontuar_bloco(indice, tabela, destino, formato, intervalos))
+    else:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo,
+                                 initargs=(floresta,)) as executor:
+            pendentes = set()
+            for indice, tabela in blocos:
+                if indice in feitos:
+                    resumo["blocos_pulados"] += 1
+                    continue
+                pendentes.add(executor.submit(_pontuar_bloco, indice, tabela, destino, formato, intervalos))
+                # Memória limitada: no máximo 2 blocos por processo em andamento
+                while len(pendentes) >= 2 * processos:
+                    prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                    for futuro in prontos:
+                        registrar(*futuro.result())
+            for futuro in wait(pendentes).done:
+                registrar(*futuro.result())
+
+    resumo["segundos"] = round(time.perf_counter() - inicio, 2)
+    resumo["linhas_por_segundo"] = round(resumo["linhas"] / max(resumo["segundos"], 1e-9))
+    _gravar_progresso(os.path.join(destino, ARQUIVO_PROGRESSO), {**progresso, "concluido": resumo})
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pontua um arquivo de leituras com o modelo de risco de fogo.")
+    parser.add_argument("entrada", help="CSV (opcionalmente .gz) ou Parquet (arquivo ou diretório)")
+    parser.add_argument("destino", help="diretório das partes pontuadas")
+    parser.add_argument("--modelo", help="arquivo .joblib (padrão: a versão compatível mais nova)")
+    parser.add_argument("--processos", type=int, help="processos de trabalho (padrão: número de CPUs)")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    parser.add_argument("--formato", choices=FORMATOS, default="parquet")
+    parser.add_argument("--recomecar", action="store_true", help="descarta uma pontuação anterior no destino")
+    parser.add_argument("--intervalos", action="store_true",
+                        help="acrescenta quantis 10%%/90%% e desvio-padrão das previsões das árvores")
+    args = parser.parse_args()
+
+    resumo = pontuar_arquivo(args.entrada, args.destino, args.modelo, args.processos,
+                             args.tamanho_bloco, args.formato, args.recomecar, args.intervalos)
+    print(f"✅ {resumo['linhas']:,} linhas pontuadas em {resumo['blocos']} bloco(s) "
+          f"({resumo['blocos_pulados']} já pontuado(s) antes), {resumo['segundos']:.1f} s, "
+          f"{resumo['linhas_por_segundo']:,} linhas/s. Saída em '{args.destino}'.")
+
+
+if __name__ == "__main__":
+    main()
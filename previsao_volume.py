@@ -0,0 +1,157 @@
+# ==============================================================================
+# PREVISÃO DO VOLUME MENSAL DE FOCOS POR BIOMA
+# ==============================================================================
+# Ajusta, de uma só vez, um modelo sazonal para cada série mensal de focos do
+# cubo ano × mês × bioma (agregados.py): uma série por bioma e a do total
+# ("Todos"). Modelo de cada série, em escala logarítmica:
+#     log(1 + focos) = nível + tendência · t + efeito do mês do ano + erro
+# Todas as séries cobrem os mesmos meses e compartilham a matriz de desenho,
+# então um único np.linalg.lstsq resolve todas as colunas ao mesmo tempo
+# (sem laço por série). Os intervalos vêm da variância de previsão dos
+# mínimos quadrados, com quantis t de Student, e voltam para a escala de
+# focos com expm1 (a previsão pontual é a mediana).
+#
+# O resultado do Brasil inteiro é guardado em 'previsao_focos.parquet' com
+# uma assinatura das séries: só há novo ajuste quando elas mudam (um mês
+# novo ingerido, ou uma correção de meses anteriores). Um último mês ainda
+# incompleto segundo a marca d'água de ingestao_inpe.py (lida via
+# marca_ingestao.py, sem importar a ingestão) fica de fora do ajuste.
+#
+# Geração offline (opcional; o app faz o mesmo na primeira consulta):
+#     python previsao_volume.py [dados_para_dashboard.csv] [--horizonte 6]
+# ==============================================================================
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import agregados
+import marca_ingestao
+
+CAMINHO_PREVISAO = "previsao_focos.parquet"
+HORIZONTE = 6
+NIVEL = 0.8
+# Com menos meses que isso, o efeito do mês fica sem graus de liberdade
+MESES_MINIMOS_SAZONAL = 24
+FORMATO = 1
+
+
+def montar_series(tabela, ultimo_dia=None):
+    """Séries mensais (linhas = meses contínuos, colunas = biomas e "Todos")
+    a partir da tabela do cubo; meses sem focos valem zero.
+
+    Com `ultimo_dia` (a marca d'água da ingestão), um último mês ainda
+    incompleto é descartado, para não puxar a previsão para baixo.
+    """
+    largas = tabela.unstack("bioma", fill_value=0)
+    meses = pd.PeriodIndex.from_fields(year=largas.index.get_level_values("ano").to_numpy(),
+                                       month=largas.index.get_level_values("mes").to_numpy(), freq="M")
+    series = largas.set_axis(meses).reindex(pd.period_range(meses.min(), meses.max(), freq="M"), fill_value=0)
+    series[agregados.TODOS] = series.sum(axis=1)
+    series.columns.name = "bioma"
+    if ultimo_dia is not None:
+        ultimo_dia = pd.Timestamp(ultimo_dia)
+        if not ultimo_dia.is_month_end:
+            series = series[series.index < ultimo_dia.to_period("M")]
+    return series.astype("int64")
+
+
+def ultimo_dia_ingerido(caminho_marca=marca_ingestao.CAMINHO_MARCA):
+    """Último dia ingerido por ingestao_inpe.py, ou None se não houver ingestão."""
+    return marca_ingestao.ler_marca(caminho_marca)["ultimo_dia"]
+
+
+def _matriz_desenho(periodos, origem, sazonal):
+    # Colunas: nível, tendência (em anos) e, se sazonal, 11 indicadoras de mês (janeiro é a base)
+    t = np.asarray((periodos - origem).map(lambda d: d.n), dtype=np.float64)
+    colunas = [np.ones_like(t), t / 12]
+    if sazonal:
+        mes = np.asarray(periodos.month)
+        colunas += [(mes == m).astype(np.float64) for m in range(2, 13)]
+    return np.column_stack(colunas)
+
+
+def prever_series(series, horizonte=HORIZONTE, nivel=NIVEL):
+    """Previsão dos próximos `horizonte` meses de todas as séries.
+
+    Retorna um DataFrame longo com bioma, data (início do mês), previsao,
+    inferior e superior (intervalo de `nivel`).
+    """
+    # Importado aqui: o app só ajusta quando o cache em disco está desatualizado
+    from scipy import stats
+
+    n_meses = len(series)
+    sazonal = n_meses >= MESES_MINIMOS_SAZONAL
+    X = _matriz_desenho(series.index, series.index[0], sazonal)
+    if n_meses <= X.shape[1]:
+        raise ValueError(f"São necessários mais de {X.shape[1]} meses para a previsão ({n_meses} disponíveis).")
+
+    Y = np.log1p(series.to_numpy(dtype=np.float64))
+    coeficientes, *_ = np.linalg.lstsq(X, Y, rcond=None)
+    graus = n_meses - X.shape[1]
+    variancia = ((Y - X @ coeficientes) ** 2).sum(axis=0) / graus
+
+    futuros = pd.period_range(series.index[-1] + 1, periods=horizonte, freq="M")
+    X_futuro = _matriz_desenho(futuros, series.index[0], sazonal)
+    alavanca = np.einsum("ij,jk,ik->i", X_futuro, np.linalg.pinv(X.T @ X), X_futuro)
+    centro = X_futuro @ coeficientes
+    margem = stats.t.ppf((1 + nivel) / 2, graus) * np.sqrt(np.outer(1 + alavanca, variancia))
+
+    forma = (horizonte, series.shape[1])
+    return pd.DataFrame({
+        "bioma": np.broadcast_to(series.columns.to_numpy(dtype=object), forma).ravel(),
+        "data": np.repeat(futuros.to_timestamp(), series.shape[1]),
+        "previsao": np.expm1(centro).clip(0).ravel(),
+        "inferior": np.expm1(centro - margem).clip(0).ravel(),
+        "superior": np.expm1(centro + margem).clip(0).ravel(),
+    })
+
+
+# ==============================================================================
+# CACHE EM DISCO
+# ==============================================================================
+def assinatura(series, horizonte=HORIZONTE, nivel=NIVEL):
+    """Hash do conteúdo das séries e dos parâmetros da previsão."""
+    resumo = hashlib.sha256()
+    resumo.update(f"{FORMATO}|{horizonte}|{nivel}|{series.index[0]}|{'|'.join(series.columns)}".encode())
+    resumo.update(np.ascontiguousarray(series.to_numpy(dtype=np.int64)).tobytes())
+    return resumo.hexdigest()
+
+
+def previsao_em_cache(series, caminho=CAMINHO_PREVISAO, horizonte=HORIZONTE, nivel=NIVEL):
+    """Previsão lida de `caminho` se as séries não mudaram; senão, reajustada e gravada."""
+    chave = assinatura(series, horizonte, nivel)
+    if os.path.exists(caminho):
+        tabela = pq.read_table(caminho)
+        if (tabela.schema.metadata or {}).get(b"assinatura") == chave.encode():
+            return tabela.to_pandas()
+
+    previsao = prever_series(series, horizonte, nivel)
+    tabela = pa.Table.from_pandas(previsao, preserve_index=False)
+    tabela = tabela.replace_schema_metadata({**(tabela.schema.metadata or {}), b"assinatura": chave.encode()})
+    temporario = caminho + ".tmp"
+    pq.write_table(tabela, temporario)
+    os.replace(temporario, caminho)
+    return previsao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Previsão do volume mensal de focos por bioma.")
+    parser.add_argument("origem", nargs="?", default="dados_para_dashboard.csv")
+    parser.add_argument("--destino", default=CAMINHO_PREVISAO)
+    parser.add_argument("--horizonte", type=int, default=HORIZONTE)
+    args = parser.parse_args()
+
+    cubo = agregados.CuboFocos.a_partir_de_dados(pd.read_csv(args.origem))
+    series = montar_series(cubo.tabela, ultimo_dia_ingerido())
+    previsao = previsao_em_cache(series, args.destino, args.horizonte)
+    print(f"✅ Previsão de {args.horizonte} meses para {series.shape[1]} séries "
+          f"(até {previsao['data'].max():%m/%Y}) em '{args.destino}'.")
+
+
+if __name__ == "__main__":
+    main()
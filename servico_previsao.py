@@ -0,0 +1,267 @@
+# ==============================================================================
+# SERVIÇO HTTP/JSON DE PREVISÃO DE RISCO DE FOGO
+# ==============================================================================
+# Serviço sem interface, para outros sistemas consultarem o modelo sem passar
+# pelo Streamlit. O modelo é carregado uma única vez por processo e as
+# requisições concorrentes são agrupadas em lotes (janela de poucos ms)
+# avaliados de uma vez pela floresta compilada de modelo_risco.py, com a
+# mesma codificação de COLUNAS_DO_MODELO usada no app.
+#
+# Endpoints:
+#     POST /prever    {"dias_sem_chuva": 15, "precipitacao": 0, "mes": 9,
+#                      "latitude": -10, "longitude": -55, "bioma": "Cerrado",
+#                      "satelite": "AQUA_M"}  (ou uma lista de até 4096 desses
+#                     objetos; corpo de até 1 MiB)
+#     GET  /saude     estado do serviço
+#     GET  /metricas  histograma de latência (formato texto do Prometheus)
+#
+# Uso:
+#     python servico_previsao.py [--porta 8000] [--modelo modelos/modelo_risco_fogo-<versao>.joblib]
+#     (sem --modelo: a versão compatível mais nova de versoes_modelo.py)
+# ==============================================================================
+import argparse
+import json
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import numpy as np
+
+import modelo_risco
+import versoes_modelo
+
+# Janela de agrupamento e tamanho máximo de cada lote
+JANELA_LOTE_S = 0.002
+MAX_REGISTROS_LOTE = 4096
+# Limites de cada requisição (um registro em JSON ocupa ~150 bytes)
+MAX_REGISTROS_REQUISICAO = MAX_REGISTROS_LOTE
+MAX_BYTES_CORPO = 1024 * 1024
+
+# Limites (em segundos) dos baldes do histograma de latência
+BALDES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+CAMPOS_OBRIGATORIOS = ("dias_sem_chuva", "precipitacao", "mes", "latitude", "longitude")
+
+
+class RequisicaoInvalida(ValueError):
+    pass
+
+
+def codificar_registros(registros):
+    """Valida uma lista de dicionários e devolve a matriz codificada."""
+    if not registros:
+        raise RequisicaoInvalida("Nenhum registro enviado.")
+    if len(registros) > MAX_REGISTROS_REQUISICAO:
+        raise RequisicaoInvalida(f"No máximo {MAX_REGISTROS_REQUISICAO} registros por requisição.")
+    try:
+        colunas = {campo: np.array([float(r[campo]) for r in registros]) for campo in CAMPOS_OBRIGATORIOS}
+    except KeyError as erro:
+        raise RequisicaoInvalida(f"Campo obrigatório ausente: {erro.args[0]}") from None
+    except (TypeError, ValueError):
+        raise RequisicaoInvalida("Os campos numéricos devem ser números.") from None
+    # float() aceita "NaN" e "Infinity", que a floresta encaminharia sem aviso
+    # (e valores além do float32 do modelo virariam infinito na codificação)
+    if not all((np.abs(valores) <= np.finfo(np.float32).max).all() for valores in colunas.values()):
+        raise RequisicaoInvalida("Os campos numéricos devem ser números finitos.")
+    categorias = []
+    for campo, base in (("bioma", modelo_risco.BIOMA_BASE), ("satelite", modelo_risco.SATELITE_BASE)):
+        valores = [r.get(campo, base) for r in registros]
+        # Listas/objetos quebrariam a codificação; nulo vale a categoria base
+        if not all(v is None or isinstance(v, str) for v in valores):
+            raise RequisicaoInvalida(f"O campo '{campo}' deve ser um texto.")
+        categorias.append(valores)
+    return modelo_risco.codificar_lote(*(colunas[c] for c in CAMPOS_OBRIGATORIOS), *categorias)
+
+
+class HistogramaLatencia:
+    def __init__(self, baldes=BALDES_LATENCIA):
+        self.baldes = baldes
+        self.contagens = [0] * (len(baldes) + 1)
+        self.soma = 0.0
+        self.total = 0
+        self._trava = threading.Lock()
+
+    def registrar(self, segundos):
+        indice = int(np.searchsorted(self.baldes, segundos))
+        with self._trava:
+            self.contagens[indice] += 1
+            self.soma += segundos
+            self.total += 1
+
+    def texto_prometheus(self, nome):
+        with self._trava:
+            contagens, soma, total = list(self.contagens), self.soma, self.total
+        linhas = [f"# TYPE {nome} histogram"]
+        acumulado = 0
+        for limite, contagem in zip(self.baldes, contagens):
+            acumulado += contagem
+            linhas.append(f'{nome}_bucket{{le="{limite}"}} {acumulado}')
+        linhas.append(f'{nome}_bucket{{le="+Inf"}} {total}')
+        linhas.append(f"{nome}_sum {soma:.6f}")
+        linhas.append(f"{nome}_count {total}")
+        return "\n".join(linhas)
+
+
+class AgrupadorLotes:
+    """Junta as requisições que chegam dentro de `janela` segundos em um único predict."""
+
+    def __init__(self, floresta, janela=JANELA_LOTE_S, max_registros=MAX_REGISTROS_LOTE):
+        self.floresta = floresta
+        self.janela = janela
+        self.max_registros = max_registros
+        self.fila = queue.Queue()
+        self.lotes = 0
+        self.registros = 0
+        self.tamanho_lote = HistogramaLatencia(baldes=(1, 2, 4, 8, 16, 32, 64, 128, 256, 1024))
+        threading.Thread(target=self._laco, daemon=True).start()
+
+    def prever(self, X):
+        futuro = Future()
+        self.fila.put((X, futuro))
+        return futuro.result()
+
+    def _laco(self):
+        while True:
+            pendentes = [self.fila.get()]
+            n = len(pendentes[0][0])
+            limite = time.perf_counter() + self.janela
+            while n < self.max_registros:
+                restante = limite - time.perf_counter()
+                if restante <= 0:
+                    break
+                try:
+                    item = self.fila.get(timeout=restante)
+                except queue.Empty:
+                    break
+                pendentes.append(item)
+                n += len(item[0])
+            self._avaliar(pendentes, n)
+
+    def _avaliar(self, pendentes, n):
+        try:
+            previsoes = self.floresta.prever(np.concatenate([X for X, _ in pendentes]))
+        except Exception as erro:
+            for _, futuro in pendentes:
+                futuro.set_exception(erro)
+            return
+        inicio = 0
+        for X, futuro in pendentes:
+            futuro.set_result(previsoes[inicio:inicio + len(X)])
+            inicio += len(X)
+        self.lotes += 1
+        self.registros += n
+        self.tamanho_lote.registrar(n)
+
+
+def criar_manipulador(agrupador, latencia, info_modelo):
+    class Manipulador(BaseHTTPRequestHandler):
+        def _responder(self, status, corpo, tipo="application/json"):
+            dados = (json.dumps(corpo, ensure_ascii=False) if tipo == "application/json" else corpo).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+            self.send_header("Content-Length", str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def do_GET(self):
+            if self.path == "/saude":
+                self._responder(200, {
+                    "status": "ok", **info_modelo,
+                    "lotes": agrupador.lotes, "registros": agrupador.registros,
+                })
+            elif self.path == "/metricas":
+                texto = "\n".join([
+                    latencia.texto_prometheus("queimadas_latencia_previsao_segundos"),
+                    agrupador.tamanho_lote.texto_prometheus("queimadas_tamanho_lote_registros"),
+                ]) + "\n"
+                self._responder(200, texto, tipo="text/plain; version=0.0.4")
+            else:
+                self._responder(404, {"erro": "Rota não encontrada."})
+
+        def do_POST(self):
+            if self.path != "/prever":
+                self._responder(404, {"erro": "Rota não encontrada."})
+                return
+            inicio = time.perf_counter()
+            try:
+                status, resposta = self._prever()
+            except Exception:
+                # Falha do modelo (repassada pelo agrupador) ou do próprio
+                # serviço: o cliente recebe 500 em vez de uma conexão derrubada
+                traceback.print_exc()
+                status, resposta = 500, {"erro": "Erro interno ao calcular a previsão."}
+            self._responder(status, resposta)
+            latencia.registrar(time.perf_counter() - inicio)
+
+        def _prever(self):
+            # (status, resposta) de um POST /prever; erros da entrada viram 400
+            try:
+                tamanho = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                return 400, {"erro": "Content-Length inválido."}
+            # Negativo, o read esperaria o fim da conexão; grande demais, iria todo para a memória
+            if tamanho < 0:
+                return 400, {"erro": "Content-Length inválido."}
+            if tamanho > MAX_BYTES_CORPO:
+                return 400, {"erro": f"Corpo maior que o limite de {MAX_BYTES_CORPO} bytes."}
+            try:
+                # UnicodeDecodeError (corpo fora de UTF-8) também é um ValueError
+                corpo = json.loads(self.rfile.read(tamanho) or b"null")
+            except ValueError:
+                return 400, {"erro": "JSON inválido."}
+            registros = corpo if isinstance(corpo, list) else [corpo]
+            try:
+                if not all(isinstance(r, dict) for r in registros):
+                    raise RequisicaoInvalida("O corpo deve ser um objeto JSON ou uma lista de objetos.")
+                X = codificar_registros(registros)
+            except RequisicaoInvalida as erro:
+                return 400, {"erro": str(erro)}
+            previsoes = agrupador.prever(X)
+            risco = previsoes.tolist() if isinstance(corpo, list) else float(previsoes[0])
+            return 200, {"risco_fogo": risco}
+
+        def log_message(self, formato, *args):
+            # Sem log por requisição: em alta vazão ele domina o custo
+            pass
+
+    return Manipulador
+
+
+class ServidorPrevisao(ThreadingHTTPServer):
+    # Fila de conexões maior que o padrão (5) para não recusar rajadas concorrentes
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def criar_servidor(caminho_modelo=None, host="127.0.0.1", porta=8000, janela=JANELA_LOTE_S):
+    metadados = None
+    if caminho_modelo is None:
+        caminho_modelo, metadados = versoes_modelo.escolher_modelo()
+    inicio = time.perf_counter()
+    floresta = modelo_risco.FlorestaCompilada.a_partir_de_modelo(joblib.load(caminho_modelo))
+    info_modelo = {
+        "modelo": caminho_modelo,
+        "versao": metadados["versao"] if metadados else None,
+        "arvores": floresta.n_arvores,
+        "tempo_carga_s": round(time.perf_counter() - inicio, 3),
+    }
+    agrupador = AgrupadorLotes(floresta, janela=janela)
+    manipulador = criar_manipulador(agrupador, HistogramaLatencia(), info_modelo)
+    return ServidorPrevisao((host, porta), manipulador)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON de previsão de risco de fogo.")
+    parser.add_argument("--modelo", help="arquivo .joblib (padrão: a versão compatível mais nova)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--janela-ms", type=float, default=JANELA_LOTE_S * 1000)
+    args = parser.parse_args()
+
+    servidor = criar_servidor(args.modelo, args.host, args.porta, args.janela_ms / 1000)
+    print(f"🔥 Serviço de previsão em http://{args.host}:{args.porta}")
+    servidor.serve_forever()
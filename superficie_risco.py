@@ -0,0 +1,158 @@
+# ==============================================================================
+# SUPERFÍCIE NACIONAL DE RISCO DE FOGO
+# ==============================================================================
+# Avalia o modelo sobre uma grade regular de latitude/longitude cobrindo o
+# Brasil, para um mês e condições meteorológicas fixas. O bioma de cada
+# célula vem de uma máscara estática (bioma dominante dos focos históricos
+# em cada célula), gerada offline a partir dos dados do mapa:
+#     python superficie_risco.py dados_mapa_parquet   (ou dados_para_mapa.csv)
+#
+# As células válidas são codificadas de uma vez e avaliadas em blocos pela
+# floresta compilada, distribuídos entre os núcleos com joblib. Em uma grade
+# de 0,1° isso dá centenas de milhares de células; o resultado deve ser
+# cacheado por conjunto de parâmetros (ver app.py).
+# ==============================================================================
+import base64
+import io
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+from PIL import Image
+
+import agregacao_espacial
+import dados_mapa
+import modelo_risco
+
+# Caixa envolvente do Brasil (mesmos limites do formulário de previsão)
+LON_MIN, LON_MAX = -74.0, -34.0
+LAT_MIN, LAT_MAX = -34.0, 5.5
+LIMITES = [LON_MIN, LAT_MIN, LON_MAX, LAT_MAX]
+
+CAMINHO_MASCARA = "mascara_biomas.npz"
+RESOLUCAO_MASCARA = 0.1
+
+# Número de células avaliadas por tarefa paralela
+CELULAS_POR_BLOCO = 50_000
+
+# Escala de cores YlOrRd (risco 0 → 1)
+_ESCALA = np.array([
+    [255, 255, 204], [255, 237, 160], [254, 217, 118], [254, 178, 76],
+    [253, 141, 60], [252, 78, 42], [227, 26, 28], [177, 0, 38],
+], dtype=np.float64)
+
+
+def construir_mascara_biomas(df, resolucao=RESOLUCAO_MASCARA):
+    """Rasteriza o bioma dominante dos focos (longitude, latitude, bioma) na grade."""
+    nx = int(np.ceil((LON_MAX - LON_MIN) / resolucao))
+    ny = int(np.ceil((LAT_MAX - LAT_MIN) / resolucao))
+    dentro = df["longitude"].between(LON_MIN, LON_MAX) & df["latitude"].between(LAT_MIN, LAT_MAX)
+    # Focos sem bioma ficam de fora: a máscara serve justamente para
+    # classificá-los, e células de bioma nulo quebrariam as categorias
+    celulas = agregacao_espacial.agregar_em_grade(df[dentro & df["bioma"].notna()], resolucao)
+
+    biomas = sorted(celulas["bioma"].unique())
+    codigos = np.full((ny, nx), -1, dtype=np.int8)
+    ix = np.floor((celulas["longitude"].to_numpy() - LON_MIN) / resolucao).astype(np.int64)
+    iy = np.floor((celulas["latitude"].to_numpy() - LAT_MIN) / resolucao).astype(np.int64)
+    validos = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    codigos[iy[validos], ix[validos]] = pd.Categorical(celulas["bioma"], categories=biomas).codes[validos]
+    return {"codigos": codigos, "biomas": np.array(biomas), "resolucao": resolucao}
+
+
+def salvar_mascara(mascara, caminho=CAMINHO_MASCARA):
+    np.savez_compressed(caminho, **mascara)
+
+
+def carregar_mascara(caminho=CAMINHO_MASCARA):
+    with np.load(caminho, allow_pickle=False) as arquivo:
+        return {
+            "codigos": arquivo["codigos"],
+            "biomas": arquivo["biomas"],
+            "resolucao": float(arquivo["resolucao"]),
+        }
+
+
+def biomas_nos_pontos(mascara, longitude, latitude):
+    """Bioma da máscara em cada ponto (None fora da máscara ou em células sem focos)."""
+    codigos = mascara["codigos"]
+    passo = mascara["resolucao"]
+    ix = np.floor((np.asarray(longitude, dtype=np.float64) - LON_MIN) / passo).astype(np.int64)
+    iy = np.floor((np.asarray(latitude, dtype=np.float64) - LAT_MIN) / passo).astype(np.int64)
+    dentro = (ix >= 0) & (ix < codigos.shape[1]) & (iy >= 0) & (iy < codigos.shape[0])
+    codigo = np.full(len(ix), -1, dtype=np.int64)
+    codigo[dentro] = codigos[iy[dentro], ix[dentro]]
+    return np.where(codigo >= 0, mascara["biomas"].astype(object)[np.maximum(codigo, 0)], None)
+
+
+def grade_de_celulas(mascara, resolucao):
+    """Centros das células da grade de saída e o código do bioma de cada uma (-1 fora da máscara)."""
+    lons = LON_MIN + (np.arange(int(np.ceil((LON_MAX - LON_MIN) / resolucao))) + 0.5) * resolucao
+    lats = LAT_MIN + (np.arange(int(np.ceil((LAT_MAX - LAT_MIN) / resolucao))) + 0.5) * resolucao
+    lon, lat = np.meshgrid(lons, lats)
+
+    codigos = mascara["codigos"]
+    passo = mascara["resolucao"]
+    ix = np.clip(((lon - LON_MIN) / passo).astype(np.int64), 0, codigos.shape[1] - 1)
+    iy = np.clip(((lat - LAT_MIN) / passo).astype(np.int64), 0, codigos.shape[0] - 1)
+    return lon, lat, codigos[iy, ix]
+
+
+def calcular_superficie(floresta, mascara, mes, dias_sem_chuva, precipitacao, satelite,
+                        resolucao=0.25, n_jobs=-1):
+    """Risco previsto em cada célula da grade; NaN nas células fora da máscara.
+
+    Retorna uma matriz (n_lat, n_lon) com a linha 0 no sul.
+    """
+    lon, lat, codigos = grade_de_celulas(mascara, resolucao)
+    validas = codigos >= 0
+    X = modelo_risco.codificar_lote(
+        dias_sem_chuva, precipitacao, mes, lat[validas], lon[validas],
+        mascara["biomas"][codigos[validas]], satelite,
+    )
+
+    blocos = [X[i:i + CELULAS_POR_BLOCO] for i in range(0, len(X), CELULAS_POR_BLOCO)]
+    if len(blocos) > 1 and n_jobs != 1:
+        # Arrays grandes da floresta são compartilhados com os workers via memmap
+        resultados = joblib.Parallel(n_jobs=n_jobs)(joblib.delayed(floresta.prever)(b) for b in blocos)
+    else:
+        resultados = [floresta.prever(b) for b in blocos]
+
+    risco = np.full(codigos.shape, np.nan)
+    if resultados:
+        risco[validas] = np.concatenate(resultados)
+    return risco
+
+
+def colorir(risco):
+    """Converte a matriz de risco em uma imagem RGBA (norte para cima)."""
+    valores = np.clip(np.nan_to_num(risco[::-1], nan=0.0), 0, 1) * (len(_ESCALA) - 1)
+    base = np.minimum(valores.astype(np.int64), len(_ESCALA) - 2)
+    peso = (valores - base)[..., None]
+    rgb = _ESCALA[base] * (1 - peso) + _ESCALA[base + 1] * peso
+    alfa = np.where(np.isnan(risco[::-1]), 0, 200)[..., None]
+    return np.concatenate([rgb, alfa], axis=-1).astype(np.uint8)
+
+
+def imagem_png_base64(rgba):
+    buffer = io.BytesIO()
+    Image.fromarray(rgba).save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def construir_camada_superficie(imagem):
+    return pdk.Layer("BitmapLayer", image=imagem, bounds=LIMITES, opacity=0.8)
+
+
+if __name__ == "__main__":
+    origem = sys.argv[1] if len(sys.argv) > 1 else dados_mapa.CAMINHO_PARQUET_MAPA
+    if os.path.isdir(origem):
+        df = dados_mapa.abrir_dataset_mapa(origem).to_table(columns=dados_mapa.COLUNAS_MAPA).to_pandas()
+    else:
+        df = pd.read_csv(origem, usecols=dados_mapa.COLUNAS_MAPA)
+    mascara = construir_mascara_biomas(df)
+    salvar_mascara(mascara)
+    print(f"✅ Máscara de biomas {mascara['codigos'].shape} salva em '{CAMINHO_MASCARA}'.")
@@ -0,0 +1,117 @@
+# ==============================================================================
+# TABELAS COMPACTAS E COMPARTILHADAS ENTRE SESSÕES
+# ==============================================================================
+# `st.cache_data` devolve uma cópia (pickle) do DataFrame para cada chamada,
+# e com os tipos padrão do pandas (strings object, int64/float64). Aqui os
+# CSVs são convertidos uma vez para tipos compactos (bioma categórico, ano e
+# mês em inteiros pequenos, coordenadas em float32) e gravados como Arrow IPC
+# sem compressão. A leitura é feita por memory-map: as páginas do arquivo
+# ficam no cache do sistema operacional e são compartilhadas, somente
+# leitura, por todas as sessões e processos de trabalho.
+#
+# O app converte na primeira leitura se o .arrow faltar ou estiver mais velho
+# que o CSV; para não pagar esse custo em uma requisição (o CSV do mapa tem
+# vários GB), converta offline depois de cada atualização dos dados:
+#     python tabelas_compartilhadas.py dados_para_mapa.csv dados_para_dashboard.csv
+# ==============================================================================
+import os
+import sys
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+# Tipos compactos por coluna (colunas ausentes são ignoradas)
+TIPOS_COMPACTOS = {
+    "ano": "int16",
+    "mes": "int8",
+    "latitude": "float32",
+    "longitude": "float32",
+    "contagem_focos": "int32",
+}
+COLUNAS_CATEGORICAS = ["bioma", "estado", "municipio", "satelite"]
+
+TAMANHO_BLOCO_CSV = 1_000_000
+
+
+def otimizar_tipos(df):
+    """Converte as colunas conhecidas de `df` para os tipos compactos."""
+    tipos = {c: t for c, t in TIPOS_COMPACTOS.items() if c in df.columns}
+    tipos.update({c: "category" for c in COLUNAS_CATEGORICAS if c in df.columns})
+    return df.astype(tipos)
+
+
+def caminho_arrow(caminho_csv):
+    return os.path.splitext(caminho_csv)[0] + ".arrow"
+
+
+def _tabela_compacta(bloco):
+    # Tabela Arrow de um bloco do CSV. As categorias viram dicionários de
+    # texto com índices int32 em todos os blocos (mesmo num bloco só de
+    # nulos), para que os blocos possam ser concatenados
+    categoricas = [c for c in COLUNAS_CATEGORICAS if c in bloco.columns]
+    tabela = pa.Table.from_pandas(otimizar_tipos(bloco.drop(columns=categoricas)), preserve_index=False)
+    for coluna in categoricas:
+        valores = pa.array(bloco[coluna].astype(object), type=pa.string()).dictionary_encode()
+        tabela = tabela.add_column(list(bloco.columns).index(coluna), coluna, valores)
+    return tabela
+
+
+def converter_csv_para_arrow(caminho_csv, destino=None, tamanho_bloco=TAMANHO_BLOCO_CSV):
+    """Grava o CSV como Arrow IPC (sem compressão) com tipos compactos.
+
+    O CSV é lido em blocos, cada um já convertido para os tipos compactos: o
+    pico de memória fica em torno de duas vezes a tabela compacta, e não no
+    CSV inteiro como strings do pandas.
+    """
+    destino = destino or caminho_arrow(caminho_csv)
+    blocos = [_tabela_compacta(bloco) for bloco in pd.read_csv(caminho_csv, chunksize=tamanho_bloco)]
+    # Um único lote por coluna: com vários lotes o to_pandas precisaria
+    # concatená-los e a leitura deixaria de ser sem cópia. Tipos que mudam
+    # entre blocos (inteiro → float) são promovidos
+    tabela = pa.concat_tables(blocos, promote_options="permissive").unify_dictionaries().combine_chunks()
+    del blocos
+
+    # Temporário próprio desta conversão: duas sessões (ou processos)
+    # convertendo ao mesmo tempo não escrevem no mesmo arquivo
+    nome = os.path.splitext(os.path.basename(destino))[0]
+    descritor, temporario = tempfile.mkstemp(prefix=f"{nome}.", suffix=".arrow.tmp",
+                                             dir=os.path.dirname(os.path.abspath(destino)))
+    try:
+        with os.fdopen(descritor, "wb") as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela, max_chunksize=max(tabela.num_rows, 1))
+        os.replace(temporario, destino)  # troca atômica: leitores nunca veem um arquivo parcial
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    return destino
+
+
+def carregar_tabela_compartilhada(caminho_csv):
+    """DataFrame compacto mapeado em memória a partir do CSV.
+
+    O arquivo .arrow é (re)gerado quando não existe ou é mais antigo que o
+    CSV. Levanta FileNotFoundError se o CSV e o .arrow não existirem.
+    """
+    destino = caminho_arrow(caminho_csv)
+    if not os.path.exists(destino) or (
+        os.path.exists(caminho_csv) and os.path.getmtime(caminho_csv) > os.path.getmtime(destino)
+    ):
+        converter_csv_para_arrow(caminho_csv, destino)
+
+    with pa.memory_map(destino, "r") as arquivo:
+        tabela = pa.ipc.open_file(arquivo).read_all()
+    # split_blocks evita consolidar as colunas numéricas em um bloco novo:
+    # cada coluna sem nulos vira uma visão somente leitura do mapeamento
+    return tabela.to_pandas(split_blocks=True)
+
+
+def memoria_dataframe(df):
+    """Memória ocupada pelo DataFrame, em bytes (incluindo strings)."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+if __name__ == "__main__":
+    for caminho in sys.argv[1:] or ["dados_para_mapa.csv", "dados_para_dashboard.csv"]:
+        print(f"✅ '{caminho}' convertido para '{converter_csv_para_arrow(caminho)}'.")
@@ -0,0 +1,300 @@
+# ==============================================================================
+# TELEMETRIA DAS PÁGINAS (TEMPOS, MEMÓRIA E ACERTOS DE CACHE)
+# ==============================================================================
+# Instrumentação opcional do dashboard, ligada com QUEIMADAS_TELEMETRIA=1:
+#   - etapa("nome"): mede o tempo de cada etapa de uma execução da página
+#     (carregamento, filtragem, agregacao, graficos, previsao...) e quanto o
+#     pico de memória do processo subiu durante ela;
+#   - cache_medido(st.cache_data / st.cache_resource): conta chamadas e
+#     execuções reais de cada carregador cacheado (acertos = chamadas - execuções);
+#   - registrar_estatisticas(nome, funcao): inclui estatísticas de outros
+#     caches (ex.: o LRU de fatias do mapa).
+#
+# Ao fim de cada execução, os números vão para:
+#   - o painel "Telemetria" na barra lateral;
+#   - um log estruturado (uma linha JSON por execução) no logger
+#     'queimadas.telemetria' e, se QUEIMADAS_TELEMETRIA_LOG apontar para um
+#     arquivo, também nele;
+#   - um arquivo de texto no formato do Prometheus, se
+#     QUEIMADAS_TELEMETRIA_PROMETHEUS apontar para um caminho (para o
+#     textfile collector do node_exporter).
+#
+# Desligada, etapa() devolve sempre o mesmo contexto vazio e cache_medido()
+# devolve o próprio decorador do Streamlit: o custo é uma chamada de função.
+# ==============================================================================
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ATIVA = os.environ.get("QUEIMADAS_TELEMETRIA") == "1"
+CAMINHO_LOG = os.environ.get("QUEIMADAS_TELEMETRIA_LOG")
+CAMINHO_PROMETHEUS = os.environ.get("QUEIMADAS_TELEMETRIA_PROMETHEUS")
+
+_log = logging.getLogger("queimadas.telemetria")
+_NULO = contextlib.nullcontext()
+_trava = threading.Lock()
+_local = threading.local()
+
+# Agregados do processo (todas as sessões)
+_etapas = {}        # (pagina, etapa) -> [contagem, soma_s, maximo_s]
+_execucoes = {}     # pagina -> [contagem, soma_s, maximo_s]
+_caches = {}        # funcao -> [chamadas, execucoes]
+_estatisticas = {}  # nome -> funcao que devolve um dicionário
+_ultimas = {}       # pagina -> resumo da última execução
+
+
+def pico_memoria_bytes():
+    """Pico de memória residente do processo (ru_maxrss), ou None."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def _somar(agregado, chave, valor):
+    atual = agregado.setdefault(chave, [0, 0.0, 0.0])
+    atual[0] += 1
+    atual[1] += valor
+    atual[2] = max(atual[2], valor)
+
+
+# ==============================================================================
+# EXECUÇÕES E ETAPAS
+# ==============================================================================
+def iniciar_execucao(pagina):
+    """Marca o início de uma execução do script para a página informada."""
+    if not ATIVA:
+        return
+    _local.execucao = {
+        "pagina": pagina,
+        "inicio": time.perf_counter(),
+        "pico_inicial": pico_memoria_bytes(),
+        "etapas": {},
+    }
+
+
+@contextlib.contextmanager
+def _medir_etapa(nome, execucao):
+    pico_antes = pico_memoria_bytes()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        pico_depois = pico_memoria_bytes()
+        # Etapas repetidas na mesma execução (ex.: dois mapas) são somadas
+        etapa = execucao["etapas"].setdefault(nome, {"segundos": 0.0, "aumento_pico_bytes": 0})
+        etapa["segundos"] += duracao
+        if pico_antes is not None:
+            etapa["aumento_pico_bytes"] += pico_depois - pico_antes
+
+
+def etapa(nome):
+    """Contexto que mede uma etapa nomeada da execução atual."""
+    if not ATIVA:
+        return _NULO
+    execucao = getattr(_local, "execucao", None)
+    if execucao is None:
+        return _NULO
+    return _medir_etapa(nome, execucao)
+
+
+def finalizar_execucao():
+    """Fecha a execução atual, atualiza os agregados e grava log/Prometheus."""
+    if not ATIVA:
+        return None
+    execucao = getattr(_local, "execucao", None)
+    if execucao is None:
+        return None
+    _local.execucao = None
+
+    pagina = execucao["pagina"]
+    pico = pico_memoria_bytes()
+    resumo = {
+        "momento": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "pagina": pagina,
+        "segundos": time.perf_counter() - execucao["inicio"],
+        "etapas": execucao["etapas"],
+        "pico_memoria_bytes": pico,
+        "aumento_pico_bytes": None if pico is None else pico - execucao["pico_inicial"],
+        "caches": estatisticas_caches(),
+    }
+    with _trava:
+        _somar(_execucoes, pagina, resumo["segundos"])
+        for nome, valores in execucao["etapas"].items():
+            _somar(_etapas, (pagina, nome), valores["segundos"])
+        _ultimas[pagina] = resumo
+
+    linha = json.dumps(resumo, ensure_ascii=False)
+    _log.info(linha)
+    try:
+        if CAMINHO_LOG:
+            with open(CAMINHO_LOG, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linha + "\n")
+        if CAMINHO_PROMETHEUS:
+            escrever_prometheus(CAMINHO_PROMETHEUS)
+    except OSError as erro:
+        _log.warning("Falha ao gravar a telemetria: %s", erro)
+    return resumo
+
+
+# ==============================================================================
+# CACHES
+# ==============================================================================
+def cache_medido(decorador):
+    """Envolve st.cache_data/st.cache_resource contando chamadas e execuções.
+
+    Uso: @telemetria.cache_medido(st.cache_resource) no lugar de @st.cache_resource.
+    """
+    if not ATIVA:
+        return decorador
+
+    def envolver(funcao):
+        nome = funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def executar(*args, **kwargs):
+            # Só roda numa falta do cache do Streamlit
+            with _trava:
+                _caches.setdefault(nome, [0, 0])[1] += 1
+            return funcao(*args, **kwargs)
+
+        cacheada = decorador(executar)
+
+        @functools.wraps(funcao)
+        def chamar(*args, **kwargs):
+            with _trava:
+                _caches.setdefault(nome, [0, 0])[0] += 1
+            return cacheada(*args, **kwargs)
+
+        chamar.clear = cacheada.clear
+        return chamar
+
+    return envolver
+
+
+def registrar_estatisticas(nome, funcao):
+    """Inclui no relatório as estatísticas de outro cache (funcao() -> dict)."""
+    if ATIVA:
+        with _trava:
+            _estatisticas[nome] = funcao
+
+
+def estatisticas_caches():
+    with _trava:
+        caches = {nome: list(valores) for nome, valores in _caches.items()}
+        extras = dict(_estatisticas)
+    resultado = {}
+    for nome, (chamadas, execucoes) in caches.items():
+        acertos = chamadas - execucoes
+        resultado[nome] = {
+            "chamadas": chamadas,
+            "execucoes": execucoes,
+            "taxa_acerto": acertos / chamadas if chamadas else 0.0,
+        }
+    for nome, funcao in extras.items():
+        resultado[nome] = funcao()
+    return resultado
+
+
+# ==============================================================================
+# SAÍDAS: PROMETHEUS E PAINEL LATERAL
+# ==============================================================================
+def texto_prometheus():
+    with _trava:
+        etapas = {chave: list(v) for chave, v in _etapas.items()}
+        execucoes = {chave: list(v) for chave, v in _execucoes.items()}
+    caches = estatisticas_caches()
+
+    linhas = ["# TYPE queimadas_execucao_segundos summary"]
+    for pagina, (contagem, soma, _) in sorted(execucoes.items()):
+        linhas.append(f'queimadas_execucao_segundos_sum{{pagina="{pagina}"}} {soma:.6f}')
+        linhas.append(f'queimadas_execucao_segundos_count{{pagina="{pagina}"}} {contagem}')
+    linhas.append("# TYPE queimadas_etapa_segundos summary")
+    for (pagina, nome), (contagem, soma, _) in sorted(etapas.items()):
+        rotulos = f'pagina="{pagina}",etapa="{nome}"'
+        linhas.append(f"queimadas_etapa_segundos_sum{{{rotulos}}} {soma:.6f}")
+        linhas.append(f"queimadas_etapa_segundos_count{{{rotulos}}} {contagem}")
+    linhas.append("# TYPE queimadas_etapa_segundos_max gauge")
+    for (pagina, nome), (_, _, maximo) in sorted(etapas.items()):
+        linhas.append(f'queimadas_etapa_segundos_max{{pagina="{pagina}",etapa="{nome}"}} {maximo:.6f}')
+
+    pico = pico_memoria_bytes()
+    if pico is not None:
+        linhas.append("# TYPE queimadas_pico_memoria_bytes gauge")
+        linhas.append(f"queimadas_pico_memoria_bytes {pico}")
+
+    linhas.append("# TYPE queimadas_cache_consultas_total counter")
+    linhas.append("# TYPE queimadas_cache_taxa_acerto gauge")
+    for nome, valores in sorted(caches.items()):
+        if "chamadas" in valores:
+            linhas.append(f'queimadas_cache_consultas_total{{cache="{nome}",resultado="acerto"}} '
+                          f'{valores["chamadas"] - valores["execucoes"]}')
+            linhas.append(f'queimadas_cache_consultas_total{{cache="{nome}",resultado="falta"}} {valores["execucoes"]}')
+        else:
+            linhas.append(f'queimadas_cache_consultas_total{{cache="{nome}",resultado="acerto"}} {valores["acertos"]}')
+            linhas.append(f'queimadas_cache_consultas_total{{cache="{nome}",resultado="falta"}} {valores["faltas"]}')
+        linhas.append(f'queimadas_cache_taxa_acerto{{cache="{nome}"}} {valores["taxa_acerto"]:.4f}')
+    return "\n".join(linhas) + "\n"
+
+
+def escrever_prometheus(caminho):
+    # Grava em um temporário e troca de uma vez, para o coletor nunca ler meio
+    # arquivo. O temporário é próprio de cada chamada: sessões terminando ao
+    # mesmo tempo não escrevem no mesmo arquivo nem publicam o de outra
+    descritor, temporario = tempfile.mkstemp(prefix=os.path.basename(caminho) + ".", suffix=".tmp",
+                                             dir=os.path.dirname(os.path.abspath(caminho)))
+    try:
+        with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto_prometheus())
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def painel_lateral(st, pagina):
+    """Desenha, na barra lateral, os números da última execução da página."""
+    if not ATIVA:
+        return
+    with _trava:
+        resumo = _ultimas.get(pagina)
+        etapas = {nome: list(v) for (p, nome), v in _etapas.items() if p == pagina}
+    if resumo is None:
+        return
+
+    with st.sidebar.expander("🛠️ Telemetria", expanded=False):
+        pico = resumo["pico_memoria_bytes"]
+        st.caption(f"Última execução: {resumo['segundos'] * 1000:.0f} ms"
+                   + (f" · pico de memória {pico / 1024 ** 2:.0f} MB" if pico is not None else ""))
+        st.dataframe([
+            {
+                "etapa": nome,
+                "última (ms)": round(resumo["etapas"].get(nome, {}).get("segundos", 0.0) * 1000, 1),
+                "média (ms)": round(soma / contagem * 1000, 1),
+                "máx (ms)": round(maximo * 1000, 1),
+                "execuções": contagem,
+            }
+            for nome, (contagem, soma, maximo) in sorted(etapas.items())
+        ], hide_index=True)
+        st.dataframe([
+            {
+                "cache": nome,
+                "taxa de acerto": f"{valores['taxa_acerto']:.0%}",
+                "consultas": valores.get("chamadas", valores.get("acertos", 0) + valores.get("faltas", 0)),
+            }
+            for nome, valores in resumo["caches"].items()
+        ], hide_index=True)
@@ -0,0 +1,62 @@
+# ==============================================================================
+# TESTES AUTOMATIZADOS - CONFIGURAÇÃO COMPARTILHADA
+# ==============================================================================
+# Os módulos do projeto ficam na raiz do repositório (como nos benchmarks).
+# Os testes não dependem dos dados reais nem do modelo gravado: uma floresta
+# pequena é treinada uma vez por sessão com dados sintéticos.
+#
+# Uso (na raiz do repositório):
+#     pip install -r requirements-dev.txt
+#     python -m pytest -q
+# ==============================================================================
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import modelo_risco  # noqa: E402
+
+BIOMAS = modelo_risco.opcoes_categoria("bioma_", modelo_risco.BIOMA_BASE)
+SATELITES = modelo_risco.opcoes_categoria("satelite_", modelo_risco.SATELITE_BASE)
+
+
+def entradas_aleatorias(n, semente=0):
+    """Colunas de entrada do modelo (na ordem de modelo_risco.ENTRADAS) sorteadas."""
+    rng = np.random.default_rng(semente)
+    return {
+        "dias_sem_chuva": rng.integers(0, 100, n),
+        "precipitacao": rng.uniform(0, 50, n).round(1),
+        "mes": rng.integers(1, 13, n),
+        "latitude": rng.uniform(-33, 4, n).round(4),
+        "longitude": rng.uniform(-73, -35, n).round(4),
+        "bioma": rng.choice(BIOMAS, n),
+        "satelite": rng.choice(SATELITES, n),
+    }
+
+
+@pytest.fixture(scope="session")
+def modelo():
+    from sklearn.ensemble import RandomForestRegressor
+
+    entradas = entradas_aleatorias(3000)
+    X = pd.DataFrame(modelo_risco.codificar_lote(*(entradas[c] for c in modelo_risco.ENTRADAS)),
+                     columns=modelo_risco.COLUNAS_DO_MODELO)
+    y = (X["dias_sem_chuva"] / 100 - X["precipitacao"] / 100 + 0.2 * X["bioma_Cerrado"]
+         + np.random.default_rng(1).normal(0, 0.05, len(X))).clip(0, 1)
+    return RandomForestRegressor(n_estimators=8, max_depth=8, random_state=0).fit(X, y)
+
+
+@pytest.fixture(scope="session")
+def floresta(modelo):
+    return modelo_risco.FlorestaCompilada.a_partir_de_modelo(modelo)
+
+
+@pytest.fixture(scope="session")
+def caminho_modelo(modelo, tmp_path_factory):
+    caminho = tmp_path_factory.mktemp("modelo") / "modelo_risco_fogo.joblib"
+    joblib.dump(modelo, caminho)
+    return str(caminho)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+import agregacao_espacial
+
+
+def focos(n, semente=0):
+    """Focos em todo o Brasil, inclusive a oeste e ao sul da origem da grade."""
+    rng = np.random.default_rng(semente)
+    return pd.DataFrame({
+        "longitude": rng.uniform(agregacao_espacial.ORIGEM_LON - 5, -34, n),
+        "latitude": rng.uniform(agregacao_espacial.ORIGEM_LAT - 5, 6, n),
+        "bioma": rng.choice(["Amazônia", "Cerrado", "Caatinga"], n),
+    })
+
+
+def contagens_de_referencia(df, tamanho):
+    # Mesma grade, com groupby do pandas sobre os índices absolutos das células
+    ix = np.floor((df["longitude"] - agregacao_espacial.ORIGEM_LON) / tamanho)
+    iy = np.floor((df["latitude"] - agregacao_espacial.ORIGEM_LAT) / tamanho)
+    contagem = df.groupby([ix, iy]).size()
+    return pd.DataFrame({
+        "longitude": agregacao_espacial.ORIGEM_LON + (contagem.index.get_level_values(0) + 0.5) * tamanho,
+        "latitude": agregacao_espacial.ORIGEM_LAT + (contagem.index.get_level_values(1) + 0.5) * tamanho,
+        "contagem": contagem.to_numpy(),
+    })
+
+
+def _ordenar(df):
+    return df.sort_values(["longitude", "latitude"]).reset_index(drop=True)
+
+
+def test_grade_igual_a_referencia_fora_da_origem():
+    df = focos(20_000)
+    grade = agregacao_espacial.agregar_em_grade(df, 1.0)
+    esperado = contagens_de_referencia(df, 1.0)
+    pd.testing.assert_frame_equal(_ordenar(grade[["longitude", "latitude", "contagem"]]), _ordenar(esperado),
+                                  check_dtype=False)
+    assert grade["contagem"].sum() == len(df)
+    assert (grade["fracao_dominante"] > 0).all() and (grade["fracao_dominante"] <= 1).all()
+
+
+def test_coordenadas_invalidas_e_bioma_nulo():
+    df = pd.DataFrame({
+        "longitude": [-80.2, -80.4, -80.3, np.nan, -50.0],
+        "latitude": [-10.0, -10.0, -10.0, -10.0, np.inf],
+        "bioma": [None, None, "Cerrado", "Cerrado", "Cerrado"],
+    })
+    grade = agregacao_espacial.agregar_em_grade(df, 1.0)
+    assert len(grade) == 1
+    assert grade.loc[0, "contagem"] == 3
+    assert grade.loc[0, "bioma"] is None
+    assert grade.loc[0, "longitude"] == -80.5
+
+    diferenca = agregacao_espacial.diferenca_em_grade(df, df.iloc[:1], 1.0)
+    assert diferenca[["contagem_a", "contagem_b", "bioma"]].values.tolist() == [[3, 1, None]]
+
+
+def test_todos_os_biomas_nulos():
+    df = pd.DataFrame({"longitude": [-50.2, -50.4, -60.0], "latitude": [-10.0, -10.0, -5.0], "bioma": None})
+    assert agregacao_espacial.agregar_em_grade(df, 1.0)["bioma"].isna().all()
+    diferenca = agregacao_espacial.diferenca_em_grade(df, df.iloc[:1], 1.0)
+    assert diferenca["contagem_a"].tolist() == [2, 1]
+    assert diferenca["bioma"].isna().all()
+
+
+def test_diferenca_igual_as_grades_de_cada_lado():
+    df_a, df_b = focos(5000, semente=1), focos(8000, semente=2)
+    # Alguns focos sem bioma, que formam a maioria de algumas células
+    df_b.loc[df_b["longitude"] < -70, "bioma"] = None
+    diferenca = _ordenar(agregacao_espacial.diferenca_em_grade(df_a, df_b, 2.0))
+    for lado, df in (("contagem_a", df_a), ("contagem_b", df_b)):
+        grade = _ordenar(agregacao_espacial.agregar_em_grade(df, 2.0))
+        junto = diferenca.merge(grade, on=["longitude", "latitude"], how="left")
+        np.testing.assert_array_equal(junto[lado], junto["contagem"].fillna(0))
+
+    # Bioma dominante somando os dois lados, igual ao da grade dos dois juntos
+    # (células empatadas ficam de fora: cada função desempata de um jeito)
+    juntos = pd.concat([df_a, df_b], ignore_index=True)
+    grade = _ordenar(agregacao_espacial.agregar_em_grade(juntos, 2.0))
+    pd.testing.assert_frame_equal(diferenca[["longitude", "latitude"]], grade[["longitude", "latitude"]])
+    ix = np.floor((juntos["longitude"] - agregacao_espacial.ORIGEM_LON) / 2.0)
+    iy = np.floor((juntos["latitude"] - agregacao_espacial.ORIGEM_LAT) / 2.0)
+    por_bioma = juntos.groupby([ix, iy])["bioma"].value_counts(dropna=False).unstack(fill_value=0)
+    empatadas = (por_bioma.to_numpy() == por_bioma.max(axis=1).to_numpy()[:, None]).sum(axis=1) > 1
+    centros = {(agregacao_espacial.ORIGEM_LON + (i + 0.5) * 2.0, agregacao_espacial.ORIGEM_LAT + (j + 0.5) * 2.0)
+               for i, j in por_bioma.index[~empatadas]}
+    sem_empate = [(lon, lat) in centros for lon, lat in zip(grade["longitude"], grade["latitude"])]
+    assert sum(sem_empate) > len(grade) // 2
+    assert diferenca.loc[sem_empate, "bioma"].tolist() == grade.loc[sem_empate, "bioma"].tolist()
+    assert diferenca["bioma"].isna().any()
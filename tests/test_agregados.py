@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import agregados
+
+
+def dashboard(anos, biomas, n, semente=0):
+    """Linhas no formato de dados_para_dashboard.csv (várias por chave)."""
+    rng = np.random.default_rng(semente)
+    return pd.DataFrame({
+        "bioma": rng.choice(biomas, n),
+        "ano": rng.choice(anos, n),
+        "mes": rng.integers(1, 13, n),
+        "contagem_focos": rng.integers(1, 500, n),
+    })
+
+
+def assert_cubos_iguais(cubo, esperado):
+    pd.testing.assert_series_equal(cubo.tabela, esperado.tabela)
+    assert cubo.biomas == esperado.biomas
+    pd.testing.assert_frame_equal(cubo.total_por_bioma, esperado.total_por_bioma)
+    for visoes, visoes_esperadas in [(cubo.por_ano, esperado.por_ano), (cubo.heatmap, esperado.heatmap),
+                                     (cubo.sazonal, esperado.sazonal)]:
+        assert sorted(visoes) == sorted(visoes_esperadas) == esperado.biomas + [agregados.TODOS]
+        for bioma in visoes_esperadas:
+            pd.testing.assert_frame_equal(visoes[bioma], visoes_esperadas[bioma])
+
+
+@pytest.mark.parametrize("incremento", [
+    # Meses novos de um ano novo, só para parte dos biomas
+    lambda: dashboard([2025], ["Cerrado", "Amazônia"], 200, semente=1),
+    # Somas em células que já existem
+    lambda: dashboard([2020, 2021], ["Cerrado", "Amazônia", "Pantanal"], 500, semente=2),
+    # Um bioma que o cubo ainda não tinha
+    lambda: pd.concat([dashboard([2024, 2025], ["Pampa"], 50, semente=3),
+                       dashboard([2024], ["Cerrado"], 50, semente=4)]),
+    # Bioma categórico, como nas tabelas compactas
+    lambda: dashboard([2025], ["Mata Atlântica", "Cerrado"], 100, semente=5).astype({"bioma": "category"}),
+])
+def test_atualizar_igual_a_reconstruir(incremento):
+    historico = dashboard(range(2015, 2025), ["Cerrado", "Amazônia", "Pantanal"], 5000)
+    novos = incremento()
+    cubo = agregados.CuboFocos.a_partir_de_dados(historico).atualizar(novos)
+    juntos = pd.concat([historico, novos.astype({"bioma": str})], ignore_index=True)
+    assert_cubos_iguais(cubo, agregados.CuboFocos.a_partir_de_dados(juntos))
+    assert cubo.tabela.sum() == juntos["contagem_focos"].sum()
+
+
+def test_atualizacoes_sucessivas_e_incremento_vazio():
+    historico = dashboard(range(2015, 2020), ["Cerrado", "Amazônia"], 2000)
+    meses = [dashboard([2020], ["Cerrado", "Caatinga"], 100, semente=s).assign(mes=s) for s in range(1, 4)]
+    cubo = agregados.CuboFocos.a_partir_de_dados(historico)
+    for mes in meses:
+        cubo.atualizar(mes)
+    cubo.atualizar(historico.iloc[:0])
+    assert_cubos_iguais(cubo, agregados.CuboFocos.a_partir_de_dados(pd.concat([historico] + meses)))
+    assert cubo.tabela.dtype == "int64"
+
+
+def test_cubo_salvo_e_atualizado(tmp_path):
+    historico = dashboard(range(2015, 2020), ["Cerrado", "Amazônia"], 2000)
+    novos = dashboard([2020], ["Pampa"], 100, semente=1)
+    caminho = str(tmp_path / "cubo.parquet")
+    agregados.salvar_cubo(agregados.CuboFocos.a_partir_de_dados(historico), caminho)
+    cubo = agregados.carregar_cubo(caminho).atualizar(novos)
+    assert_cubos_iguais(cubo, agregados.CuboFocos.a_partir_de_dados(pd.concat([historico, novos])))
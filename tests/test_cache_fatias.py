@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache_fatias
+import dados_mapa
+
+BIOMAS = ["Amazônia", "Cerrado", "Pantanal", "Caatinga"]
+
+
+def mapa(n, semente=0):
+    rng = np.random.default_rng(semente)
+    df = pd.DataFrame({
+        "ano": rng.integers(2003, 2026, n).astype(np.int16),
+        "bioma": pd.Categorical(rng.choice(BIOMAS, n)),
+        "latitude": rng.uniform(-33, 5, n).astype(np.float32),
+        "longitude": rng.uniform(-73, -35, n).astype(np.float32),
+    })
+    df.loc[rng.random(n) < 0.05, "bioma"] = None
+    # Fora de ordem: o índice não pode depender da ordem das linhas
+    return df.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("ano, biomas", [
+    (2010, ["Cerrado"]),
+    (2025, ["Amazônia", "Pantanal"]),
+    (2003, BIOMAS),
+    (2015, []),
+    (2015, ["Mata Atlântica"]),
+    (1999, ["Cerrado"]),
+])
+def test_fatia_igual_ao_filtro_por_mascara(ano, biomas):
+    df = mapa(20_000)
+    fatia = cache_fatias.IndiceAnualMapa(df).fatia(ano, biomas)
+    esperado = df.loc[(df["ano"] == ano) & df["bioma"].isin(biomas), dados_mapa.colunas_mapa(df.columns)]
+    pd.testing.assert_frame_equal(fatia.sort_index(), esperado)
+
+
+def test_fatia_com_colunas_pedidas():
+    df = mapa(1000)
+    fatia = cache_fatias.IndiceAnualMapa(df).fatia(2010, ["Cerrado"], colunas=["latitude", "bioma"])
+    assert list(fatia.columns) == ["latitude", "bioma"]
+
+
+class Carregador:
+    """Fatias de tamanho fixo, contando quantas vezes cada uma foi lida."""
+
+    def __init__(self, linhas=1000):
+        self.linhas = linhas
+        self.leituras = []
+
+    def __call__(self, ano, biomas):
+        self.leituras.append((ano, tuple(biomas)))
+        return pd.DataFrame({"longitude": np.zeros(self.linhas), "latitude": np.zeros(self.linhas),
+                             "bioma": pd.Categorical([biomas[0]] * self.linhas)})
+
+
+def _tamanho_fatia(carregador):
+    cache = cache_fatias.CacheFatiasMapa(carregador)
+    cache.obter(2000, ["Cerrado"])
+    carregador.leituras.clear()
+    return cache.bytes
+
+
+def test_descarte_do_menos_usado_por_bytes():
+    carregador = Carregador()
+    tamanho = _tamanho_fatia(carregador)
+    cache = cache_fatias.CacheFatiasMapa(carregador, max_bytes=2 * tamanho)
+
+    cache.obter(2010, ["Cerrado"])
+    cache.obter(2011, ["Cerrado"])
+    cache.obter(2010, ["Cerrado"])  # 2010 passa a ser o mais recente
+    cache.obter(2012, ["Cerrado"])  # descarta 2011
+    assert list(cache.itens) == [(2010, frozenset({"Cerrado"})), (2012, frozenset({"Cerrado"}))]
+    assert cache.bytes == 2 * tamanho
+
+    cache.obter(2011, ["Cerrado"])  # lida de novo; descarta 2010
+    assert carregador.leituras == [(2010, ("Cerrado",)), (2011, ("Cerrado",)), (2012, ("Cerrado",)),
+                                   (2011, ("Cerrado",))]
+    assert cache.estatisticas() == {"itens": 2, "bytes": 2 * tamanho, "acertos": 1, "faltas": 4,
+                                    "descartes": 2, "taxa_acerto": 0.2}
+
+
+def test_chave_ignora_ordem_dos_biomas():
+    carregador = Carregador()
+    cache = cache_fatias.CacheFatiasMapa(carregador)
+    primeira = cache.obter(2010, ["Pantanal", "Cerrado"])
+    assert cache.obter("2010", ["Cerrado", "Pantanal"]) is primeira
+    # O carregador recebe os biomas sempre na mesma ordem
+    assert carregador.leituras == [(2010, ("Cerrado", "Pantanal"))]
+    assert (cache.acertos, cache.faltas) == (1, 1)
+    assert {"cor_r", "cor_g", "cor_b"} <= set(primeira.columns)
+
+
+def test_fatia_maior_que_o_limite_fica_sozinha():
+    carregador = Carregador()
+    tamanho = _tamanho_fatia(carregador)
+    cache = cache_fatias.CacheFatiasMapa(carregador, max_bytes=tamanho // 2)
+    cache.obter(2010, ["Cerrado"])
+    cache.obter(2011, ["Cerrado"])
+    assert list(cache.itens) == [(2011, frozenset({"Cerrado"}))]
+    assert (cache.bytes, cache.descartes) == (tamanho, 1)
+
+
+def test_cache_da_tabela_igual_ao_do_dataset(tmp_path):
+    df = mapa(5000)
+    df.astype({"ano": np.int64}).to_csv(tmp_path / "mapa.csv", index=False)
+    dados_mapa.converter_csv_para_parquet(str(tmp_path / "mapa.csv"), str(tmp_path / "mapa_parquet"))
+    da_tabela = cache_fatias.CacheFatiasMapa.para_tabela(df)
+    dataset = dados_mapa.abrir_dataset_mapa(str(tmp_path / "mapa_parquet"))
+    do_dataset = cache_fatias.CacheFatiasMapa.para_dataset(dataset)
+
+    colunas = ["longitude", "latitude", "bioma", "cor_r", "cor_g", "cor_b"]
+    for ano, biomas in [(2010, ["Cerrado", "Pantanal"]), (2024, BIOMAS)]:
+        a, b = (cache.obter(ano, biomas)[colunas].astype({"bioma": str})
+                .sort_values(["longitude", "latitude"]).reset_index(drop=True)
+                for cache in (da_tabela, do_dataset))
+        pd.testing.assert_frame_equal(a, b)
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import indice_espacial
+
+# Pontos de consulta: interior, sobre bordas de células e junto às bordas da grade
+PONTOS = [(-10.0, -50.0), (-10.05, -55.3), (-3.2, -60.0), (-34.95, -74.95), (5.95, -33.05), (-20.0, -74.99)]
+
+
+def focos(n, semente=0):
+    rng = np.random.default_rng(semente)
+    lat = rng.uniform(indice_espacial.ORIGEM_LAT - 1, indice_espacial.FIM_LAT + 1, n)
+    lon = rng.uniform(indice_espacial.ORIGEM_LON - 1, indice_espacial.FIM_LON + 1, n)
+    # Um terço dos focos exatamente sobre as bordas das células da grade
+    borda = rng.random(n) < 1 / 3
+    lat[borda] = np.round(lat[borda], 1)
+    lon[borda] = np.round(lon[borda], 1)
+    df = pd.DataFrame({
+        "latitude": lat.round(4),
+        "longitude": lon.round(4),
+        "ano": rng.integers(2003, 2026, n),
+        "mes": rng.integers(1, 13, n),
+        "bioma": rng.choice(["Amazônia", "Cerrado", "Pantanal"], n).astype(object),
+    })
+    df.loc[rng.random(n) < 0.1, "bioma"] = None
+    return df
+
+
+@pytest.fixture(scope="module")
+def cenario(tmp_path_factory):
+    diretorio = tmp_path_factory.mktemp("indice")
+    df = focos(60_000)
+    df.to_csv(diretorio / "mapa.csv", index=False)
+    total = indice_espacial.construir_indice(str(diretorio / "mapa.csv"), str(diretorio / "indice"),
+                                             tamanho_bloco=7000)
+    # Referência: os mesmos focos que o índice guarda (dentro da grade, em float32)
+    dentro = ((df["longitude"] >= indice_espacial.ORIGEM_LON) & (df["longitude"] < indice_espacial.FIM_LON)
+              & (df["latitude"] >= indice_espacial.ORIGEM_LAT) & (df["latitude"] < indice_espacial.FIM_LAT))
+    referencia = df[dentro].astype({"latitude": np.float32, "longitude": np.float32}).reset_index(drop=True)
+    assert total == len(referencia) < len(df)
+    return indice_espacial.carregar_indice(str(diretorio / "indice")), referencia
+
+
+def forca_bruta(referencia, lat, lon, raio_km):
+    distancia = indice_espacial.haversine_km(lat, lon, referencia["latitude"], referencia["longitude"])
+    return referencia.assign(distancia_km=distancia)[distancia <= raio_km]
+
+
+def _ordenar(df):
+    return (df.assign(bioma=df["bioma"].fillna("-").astype(str))[["latitude", "longitude", "ano", "mes", "bioma"]]
+            .astype({"ano": np.int64, "mes": np.int64})
+            .sort_values(["latitude", "longitude", "ano", "mes", "bioma"]).reset_index(drop=True))
+
+
+@pytest.mark.parametrize("raio_km", [5, 40, 250])
+@pytest.mark.parametrize("lat, lon", PONTOS)
+def test_raio_igual_a_forca_bruta(cenario, lat, lon, raio_km):
+    indice, referencia = cenario
+    resultado = indice.consultar_raio(lat, lon, raio_km)
+    esperado = forca_bruta(referencia, lat, lon, raio_km)
+    pd.testing.assert_frame_equal(_ordenar(resultado), _ordenar(esperado))
+    assert (resultado["distancia_km"] <= raio_km).all()
+
+
+def test_bioma_nulo_na_consulta(cenario):
+    indice, referencia = cenario
+    resultado = indice.consultar_raio(-10.0, -50.0, 250)
+    assert resultado["bioma"].isna().sum() == forca_bruta(referencia, -10.0, -50.0, 250)["bioma"].isna().sum() > 0
+    assert set(resultado["bioma"].dropna()) <= {"Amazônia", "Cerrado", "Pantanal"}
+
+
+@pytest.mark.parametrize("lat, lon", PONTOS)
+def test_contagem_por_ano_mes(cenario, lat, lon):
+    indice, referencia = cenario
+    tabela = indice.contar_por_ano_mes(lat, lon, 120)
+    esperado = forca_bruta(referencia, lat, lon, 120)
+    contagem = pd.crosstab(esperado["ano"], esperado["mes"]).reindex(
+        index=tabela.index, columns=tabela.columns, fill_value=0)
+    np.testing.assert_array_equal(tabela.to_numpy(), contagem.to_numpy())
+    assert tabela.to_numpy().sum() == len(esperado)
+
+
+def test_contagem_sem_focos(cenario):
+    indice, _ = cenario
+    # Fora da grade: nenhuma célula candidata
+    tabela = indice.contar_por_ano_mes(20.0, -10.0, 10)
+    assert tabela.empty and list(tabela.columns) == list(range(1, 13))
+
+
+@pytest.mark.parametrize("lat, lon", PONTOS)
+def test_mais_proximos(cenario, lat, lon):
+    indice, referencia = cenario
+    vizinhos = indice.mais_proximos(lat, lon, k=15, raio_inicial_km=1.0)
+    distancia = indice_espacial.haversine_km(lat, lon, referencia["latitude"], referencia["longitude"])
+    assert len(vizinhos) == 15
+    assert vizinhos["distancia_km"].is_monotonic_increasing
+    np.testing.assert_allclose(vizinhos["distancia_km"], np.sort(distancia)[:15])
+
+
+def test_mais_proximos_limitado_ao_raio_maximo(cenario):
+    indice, referencia = cenario
+    vizinhos = indice.mais_proximos(-10.0, -50.0, k=1000, raio_inicial_km=2.0, raio_max_km=30.0)
+    assert len(vizinhos) == len(forca_bruta(referencia, -10.0, -50.0, 30.0)) < 1000
+    assert (vizinhos["distancia_km"] <= 30.0).all()
@@ -0,0 +1,195 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import agregados
+import dados_mapa
+import geocodificacao
+import ingestao_inpe
+import marca_ingestao
+import treinamento
+
+
+def focos_brutos(dias, n, semente):
+    """Exportação bruta do INPE (nomes de colunas do BDQueimadas) com `n` focos nos `dias`."""
+    rng = np.random.default_rng(semente)
+    dia = rng.choice(dias, n)
+    return pd.DataFrame({
+        "data_hora_gmt": [f"{d} {h:02d}:{m:02d}:00" for d, h, m in zip(dia, rng.integers(0, 24, n),
+                                                                        rng.integers(0, 60, n))],
+        "lat": rng.uniform(-15, -5, n).round(4),
+        "lon": rng.uniform(-60, -45, n).round(4),
+        "satelite": rng.choice(["AQUA_M-T", "NPP-375"], n),
+        "bioma": rng.choice(["Cerrado", "Amazônia"], n),
+        "pais": "Brasil",
+        "estado": "MATO GROSSO",
+        "municipio": "SINOP",
+        "numero_dias_sem_chuva": rng.integers(0, 30, n),
+        "precipitacao": rng.uniform(0, 5, n).round(1),
+        "risco_fogo": rng.uniform(0, 1, n).round(2),
+    })
+
+
+class Cenario:
+    """Ingestão em um diretório temporário, com todos os agregados presentes."""
+
+    def __init__(self, destino):
+        self.destino = destino
+
+    def ingerir(self, *arquivos):
+        return ingestao_inpe.ingerir(list(arquivos), self.destino, "dashboard.csv", "cubo.parquet",
+                                     "marca.json", "rollup.parquet", "sem_mascara.npz")
+
+    def estado(self):
+        """(focos no mapa, no dashboard, no cubo, no rollup, último dia da marca)."""
+        if self.destino.endswith(".csv"):
+            mapa = len(pd.read_csv(self.destino))
+        else:
+            mapa = sum(len(pd.read_parquet(p)) for p in glob.glob(f"{self.destino}/**/*.parquet", recursive=True))
+        return (mapa,
+                int(pd.read_csv("dashboard.csv")["contagem_focos"].sum()),
+                int(pd.read_parquet("cubo.parquet")["contagem_focos"].sum()),
+                int(pd.read_parquet("rollup.parquet")["contagem_focos"].sum()),
+                marca_ingestao.ler_marca("marca.json")["ultimo_dia"])
+
+
+@pytest.fixture(params=["mapa_parquet", "mapa.csv"])
+def cenario(request, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cenario = Cenario(request.param)
+    focos_brutos(["2025-08-01", "2025-08-02", "2025-08-03"], 3000, 1).to_csv("agosto.csv", index=False)
+    assert cenario.ingerir("agosto.csv")["focos_novos"] == 3000
+    agregados.salvar_cubo(agregados.CuboFocos.a_partir_de_dados(pd.read_csv("dashboard.csv")), "cubo.parquet")
+    rollup = geocodificacao.rollup_da_fonte(cenario.destino)
+    geocodificacao.salvar_rollup_estados(rollup.set_index(geocodificacao.CHAVES_ROLLUP)["contagem_focos"],
+                                         "rollup.parquet")
+    assert cenario.estado() == (3000, 3000, 3000, 3000, "2025-08-03")
+    return cenario
+
+
+@pytest.fixture
+def com_atrasados(cenario):
+    """Nova exportação: o dia da marca de novo, 50 focos atrasados desse dia e 400 de um dia novo."""
+    agosto = pd.read_csv("agosto.csv")
+    pd.concat([agosto[agosto["data_hora_gmt"].str.startswith("2025-08-03")],
+               focos_brutos(["2025-08-03"], 50, 2),
+               focos_brutos(["2025-08-04"], 400, 3)]).to_csv("novos.csv", index=False)
+    return cenario
+
+
+def test_falha_antes_da_publicacao_nao_deixa_rastro(com_atrasados, monkeypatch):
+    antes = com_atrasados.estado()
+    arquivos_antes = sorted(os.listdir("."))
+    with monkeypatch.context() as m:
+        m.setattr(geocodificacao, "atualizar_rollup_estados",
+                  lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("falha simulada")))
+        with pytest.raises(RuntimeError, match="falha simulada"):
+            com_atrasados.ingerir("novos.csv")
+
+    assert com_atrasados.estado() == antes
+    assert sorted(os.listdir(".")) == arquivos_antes
+
+    # A execução seguinte refaz o mesmo trabalho, sem contar focos duas vezes
+    resumo = com_atrasados.ingerir("novos.csv")
+    assert resumo["focos_novos"] == 450
+    assert com_atrasados.estado() == (3450, 3450, 3450, 3450, "2025-08-04")
+
+
+def test_dia_da_marca_relido_sem_duplicar(com_atrasados):
+    ja_vistos = int(pd.read_csv("agosto.csv")["data_hora_gmt"].str.startswith("2025-08-03").sum())
+    resumo = com_atrasados.ingerir("novos.csv")
+    assert (resumo["focos_novos"], resumo["ja_ingeridos"], resumo["dias"]) == (450, ja_vistos, 2)
+    assert com_atrasados.estado() == (3450, 3450, 3450, 3450, "2025-08-04")
+
+    # Mesmo arquivo de novo (outra data de modificação): nada a acrescentar
+    os.utime("novos.csv", (1, 1))
+    resumo = com_atrasados.ingerir("novos.csv")
+    assert (resumo["arquivos"], resumo["focos_novos"]) == (1, 0)
+    assert com_atrasados.estado() == (3450, 3450, 3450, 3450, "2025-08-04")
+
+    # Arquivo inalterado: nem é lido
+    assert com_atrasados.ingerir("novos.csv")["arquivos"] == 0
+
+
+@pytest.mark.parametrize("colunas_csv", [
+    ["ano", "mes", "bioma", "latitude", "longitude"],
+    ["ano", "mes", "bioma", "latitude", "longitude", "satelite", "dias_sem_chuva", "precipitacao", "risco_fogo"],
+])
+def test_ingestao_em_dataset_convertido_do_csv(tmp_path, monkeypatch, colunas_csv):
+    # O dataset da conversão não tem estado/município (nem, no CSV estreito,
+    # as colunas do treino); as partes da ingestão têm todas
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    n = 2000
+    pd.DataFrame({
+        "ano": 2024, "mes": rng.integers(1, 13, n), "bioma": rng.choice(["Cerrado", "Amazônia"], n),
+        "latitude": rng.uniform(-15, -5, n).round(4), "longitude": rng.uniform(-60, -45, n).round(4),
+        "satelite": "AQUA_M-T", "dias_sem_chuva": rng.integers(0, 30, n), "precipitacao": 0.5, "risco_fogo": 0.7,
+    })[colunas_csv].to_csv("mapa.csv", index=False)
+    dados_mapa.converter_csv_para_parquet("mapa.csv", "mapa_parquet", tamanho_bloco=500)
+    focos_brutos(["2025-08-01", "2025-08-02"], 300, 1).to_csv("agosto.csv", index=False)
+    Cenario("mapa_parquet").ingerir("agosto.csv")
+
+    dataset = dados_mapa.abrir_dataset_mapa("mapa_parquet")
+    assert set(ingestao_inpe.COLUNAS_SAIDA) <= set(dataset.schema.names)
+    assert dataset.count_rows() == n + 300
+
+    rollup = geocodificacao.rollup_da_fonte("mapa_parquet")
+    assert rollup["contagem_focos"].sum() == 300
+    particao = dados_mapa.ler_particoes(dataset, 2025, ["Cerrado", "Amazônia"])
+    assert particao["estado"].notna().all() and len(particao) == 300
+    treino = treinamento.ler_dados_treino("mapa_parquet", amostra=10_000)
+    assert len(treino) == (n + 300 if "risco_fogo" in colunas_csv else 300)
+
+
+@pytest.fixture
+def cenario_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cenario = Cenario("mapa.csv")
+    focos_brutos(["2025-08-01", "2025-08-02"], 1000, 1).to_csv("agosto.csv", index=False)
+    cenario.ingerir("agosto.csv")
+    focos_brutos(["2025-08-03"], 200, 2).to_csv("novos.csv", index=False)
+    return cenario
+
+
+def test_csv_do_mapa_acrescentado_sem_copia(cenario_csv, monkeypatch):
+    inode = os.stat("mapa.csv").st_ino
+    monkeypatch.setattr(ingestao_inpe.shutil, "copyfile", None)
+    assert cenario_csv.ingerir("novos.csv")["focos_novos"] == 200
+    assert os.stat("mapa.csv").st_ino == inode
+    assert len(pd.read_csv("mapa.csv")) == 1200
+    assert not os.path.exists(ingestao_inpe.caminho_acrescimo_pendente("mapa.csv"))
+
+
+def test_csv_do_mapa_truncado_depois_de_execucao_interrompida(cenario_csv, monkeypatch):
+    with open("mapa.csv", "rb") as arquivo:
+        original = arquivo.read()
+
+    # Processo morto depois de acrescentar ao CSV, antes da marca d'água e
+    # sem chance de desfazer o acréscimo
+    with monkeypatch.context() as m:
+        m.setattr(ingestao_inpe, "_desfazer_acrescimo_csv", lambda *args: None)
+        m.setattr(ingestao_inpe, "atualizar_dashboard", lambda *args: (_ for _ in ()).throw(KeyboardInterrupt()))
+        with pytest.raises(KeyboardInterrupt):
+            cenario_csv.ingerir("novos.csv")
+    assert os.path.getsize("mapa.csv") > len(original)
+
+    # A próxima execução desfaz o acréscimo pendente antes de ingerir de novo
+    assert cenario_csv.ingerir("novos.csv")["focos_novos"] == 200
+    mapa = pd.read_csv("mapa.csv")
+    assert len(mapa) == 1200
+    with open("mapa.csv", "rb") as arquivo:
+        assert arquivo.read(len(original)) == original
+
+    # Acréscimo pendente de uma execução que terminou (a marca d'água a
+    # registra) não é desfeito
+    pendente = ingestao_inpe.caminho_acrescimo_pendente("mapa.csv")
+    marca_ingestao.gravar_marca({"execucao": marca_ingestao.ler_marca("marca.json")["execucao"], "tamanho": 0},
+                                pendente)
+    focos_brutos(["2025-08-04"], 10, 3).to_csv("outros.csv", index=False)
+    assert cenario_csv.ingerir("outros.csv")["focos_novos"] == 10
+    assert len(pd.read_csv("mapa.csv")) == 1210
+    assert not os.path.exists(pendente)
@@ -0,0 +1,127 @@
+import glob
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import agregacao_espacial
+import dados_mapa
+import mapas_renderizados
+
+ANOS = [2010, 2011, 2012]
+
+
+def focos(anos, n, semente=0):
+    rng = np.random.default_rng(semente)
+    return pd.DataFrame({
+        "ano": rng.choice(anos, n),
+        "mes": rng.integers(1, 13, n),
+        "bioma": rng.choice(["Cerrado", "Amazônia"], n),
+        "latitude": rng.uniform(-15, -5, n).round(4),
+        "longitude": rng.uniform(-60, -45, n).round(4),
+    })
+
+
+def imagens_em_disco(destino, ano):
+    return sorted(os.path.relpath(p, destino) for p in glob.glob(os.path.join(destino, str(ano), "*")))
+
+
+def imagens_do_manifesto(destino, ano):
+    entrada = mapas_renderizados.carregar_manifesto(destino)["anos"][str(ano)]
+    return sorted(relativo for por_zoom in entrada["imagens"].values() for relativo in por_zoom.values())
+
+
+def fragmentos(fonte, ano):
+    return glob.glob(os.path.join(fonte, f"ano={ano}", "*", "*.parquet"))
+
+
+@pytest.fixture
+def parquet(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # 2013 é o "ano corrente": fica de fora
+    focos(ANOS + [2013], 4000).to_csv("mapa.csv", index=False)
+    dados_mapa.converter_csv_para_parquet("mapa.csv", "mapa_parquet")
+    assert mapas_renderizados.pre_renderizar("mapa_parquet", "mapas", ate_ano=2013) == dict.fromkeys(
+        ANOS, "renderizado")
+    return "mapa_parquet"
+
+
+def test_imagens_da_primeira_execucao(parquet):
+    manifesto = mapas_renderizados.carregar_manifesto("mapas")
+    df = pd.read_csv("mapa.csv")
+    for ano in ANOS:
+        entrada = manifesto["anos"][str(ano)]
+        assert entrada["focos"] == df[df["ano"] == ano]["bioma"].value_counts().to_dict()
+        assert all(sorted(por_zoom) == sorted(map(str, agregacao_espacial.NIVEIS_ZOOM))
+                   for por_zoom in entrada["imagens"].values())
+        assert imagens_em_disco("mapas", ano) == imagens_do_manifesto("mapas", ano)
+    assert "2013" not in manifesto["anos"]
+
+
+def test_estados_das_execucoes_seguintes(parquet):
+    assert mapas_renderizados.pre_renderizar(parquet, "mapas", ate_ano=2013) == dict.fromkeys(ANOS, "inalterado")
+
+    # 2011: mesmos focos, arquivo regravado (outra data) → só a assinatura muda
+    antes_2011 = imagens_em_disco("mapas", 2011)
+    for caminho in fragmentos(parquet, 2011):
+        os.utime(caminho, (1, 1))
+    # 2012: focos novos → redesenhado, e as imagens antigas apagadas
+    antes_2012 = imagens_em_disco("mapas", 2012)
+    dados_mapa.escrever_bloco_parquet(focos([2012], 300, semente=1), parquet, 0, prefixo="extra")
+    # 2010: a partição ficou vazia → sem imagens
+    for caminho in fragmentos(parquet, 2010):
+        pq.write_table(pq.read_table(caminho).schema.empty_table(), caminho)
+
+    situacao = mapas_renderizados.pre_renderizar(parquet, "mapas", ate_ano=2013)
+    assert situacao == {2010: "vazio", 2011: "revalidado", 2012: "renderizado"}
+    assert imagens_em_disco("mapas", 2011) == antes_2011
+    assert imagens_em_disco("mapas", 2012) == imagens_do_manifesto("mapas", 2012)
+    assert not set(antes_2012) & set(imagens_em_disco("mapas", 2012))
+    assert imagens_em_disco("mapas", 2010) == []
+    assert "2010" not in mapas_renderizados.carregar_manifesto("mapas")["anos"]
+
+    assert mapas_renderizados.pre_renderizar(parquet, "mapas", ate_ano=2013) == {
+        2010: "vazio", 2011: "inalterado", 2012: "inalterado"}
+
+
+def test_ano_removido_da_fonte(parquet):
+    shutil.rmtree(os.path.join(parquet, "ano=2010"))
+    assert mapas_renderizados.pre_renderizar(parquet, "mapas", ate_ano=2013) == {
+        2010: "vazio", 2011: "inalterado", 2012: "inalterado"}
+    assert imagens_em_disco("mapas", 2010) == []
+    assert "2010" not in mapas_renderizados.carregar_manifesto("mapas")["anos"]
+
+
+def test_app_rejeita_ano_com_assinatura_alterada(parquet):
+    mapas = mapas_renderizados.MapasRenderizados(parquet, "mapas")
+    assert sorted(mapas.anos) == ANOS
+    zoom = agregacao_espacial.NIVEIS_ZOOM[0]
+    assert mapas.disponivel(2011, zoom) and not mapas.disponivel(2013, zoom)
+    assert len(mapas.camadas(2011, ["Cerrado", "Amazônia", "Pantanal"], zoom)) == 2
+
+    for caminho in fragmentos(parquet, 2011):
+        os.utime(caminho, (1, 1))
+    mapas = mapas_renderizados.MapasRenderizados(parquet, "mapas")
+    assert sorted(mapas.anos) == [2010, 2012]
+    assert not mapas.disponivel(2011, zoom)
+
+
+def test_app_confere_csv_sem_ler_o_arquivo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    focos(ANOS, 2000).to_csv("mapa.csv", index=False)
+    assert mapas_renderizados.pre_renderizar("mapa.csv", "mapas", ate_ano=2013) == dict.fromkeys(
+        ANOS, "renderizado")
+
+    def ler_csv(*args, **kwargs):
+        raise AssertionError("CSV lido no caminho da requisição")
+
+    monkeypatch.setattr(pd, "read_csv", ler_csv)
+    assert sorted(mapas_renderizados.MapasRenderizados("mapa.csv", "mapas").anos) == ANOS
+
+    # Qualquer mudança no arquivo invalida todos os anos
+    with open("mapa.csv", "a", encoding="utf-8") as arquivo:
+        arquivo.write("2011,8,Cerrado,-10.0,-50.0\n")
+    assert mapas_renderizados.MapasRenderizados("mapa.csv", "mapas").anos == {}
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import modelo_risco
+from conftest import entradas_aleatorias
+
+
+@pytest.fixture(scope="module")
+def lote():
+    entradas = entradas_aleatorias(2000, semente=7)
+    return entradas, modelo_risco.codificar_lote(*(entradas[c] for c in modelo_risco.ENTRADAS))
+
+
+def test_prever_identico_ao_predict(modelo, floresta, lote):
+    _, X = lote
+    esperado = modelo.predict(pd.DataFrame(X, columns=modelo_risco.COLUNAS_DO_MODELO))
+    assert np.array_equal(floresta.prever(X), esperado)
+
+
+def test_prever_um_identico_ao_predict(modelo, floresta, lote):
+    entradas, X = lote
+    esperado = modelo.predict(pd.DataFrame(X[:50], columns=modelo_risco.COLUNAS_DO_MODELO))
+    obtido = [floresta.prever_um(*(entradas[c][i] for c in modelo_risco.ENTRADAS)) for i in range(50)]
+    assert np.array_equal(obtido, esperado)
+
+
+def test_prever_em_varios_blocos(floresta, lote, monkeypatch):
+    _, X = lote
+    esperado = floresta.prever(X)
+    monkeypatch.setattr(modelo_risco, "ELEMENTOS_POR_BLOCO", 3 * floresta.n_arvores)
+    assert np.array_equal(floresta.prever(X), esperado)
+
+
+def test_explicar_previsao_e_dispersao(modelo, floresta, lote):
+    _, X = lote
+    explicacao = floresta.explicar(X, quantis=(0.1, 0.9))
+    assert np.array_equal(explicacao["previsao"], floresta.prever(X))
+
+    por_arvore = np.column_stack([arvore.predict(X) for arvore in modelo.estimators_])
+    inferior, superior = np.quantile(por_arvore, (0.1, 0.9), axis=1)
+    np.testing.assert_allclose(explicacao["inferior"], inferior)
+    np.testing.assert_allclose(explicacao["superior"], superior)
+    np.testing.assert_allclose(explicacao["desvio"], por_arvore.std(axis=1))
+
+
+def test_contribuicoes_somam_a_previsao(floresta, lote):
+    _, X = lote
+    explicacao = floresta.explicar(X)
+    assert explicacao["contribuicoes"].shape == (len(X), len(modelo_risco.COLUNAS_DO_MODELO))
+    np.testing.assert_allclose(explicacao["base"] + explicacao["contribuicoes"].sum(axis=1),
+                               explicacao["previsao"], atol=1e-12)
+
+    por_entrada = modelo_risco.contribuicoes_por_entrada(explicacao["contribuicoes"])
+    assert por_entrada.shape == (len(X), len(modelo_risco.ENTRADAS))
+    np.testing.assert_allclose(por_entrada.sum(axis=1), explicacao["contribuicoes"].sum(axis=1), atol=1e-12)
+
+
+def test_contribuicoes_so_nas_features_usadas(modelo, floresta, lote):
+    _, X = lote
+    usadas = {modelo_risco.COLUNAS_DO_MODELO.index(modelo.feature_names_in_[f])
+              for arvore in modelo.estimators_ for f in arvore.tree_.feature if f >= 0}
+    nunca_usadas = sorted(set(range(X.shape[1])) - usadas)
+    assert not floresta.explicar(X)["contribuicoes"][:, nunca_usadas].any()
+
+
+def test_explicar_um_igual_ao_lote(floresta, lote):
+    entradas, X = lote
+    explicacao = floresta.explicar(X[:20])
+    for i in range(20):
+        um = floresta.explicar_um(*(entradas[c][i] for c in modelo_risco.ENTRADAS))
+        assert um["previsao"] == explicacao["previsao"][i]
+        assert um["inferior"] == explicacao["inferior"][i]
+        assert um["superior"] == explicacao["superior"][i]
+        np.testing.assert_allclose(um["contribuicoes"], explicacao["contribuicoes"][i], atol=1e-12)
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+import modelo_risco
+import pontuacao_lote
+from conftest import entradas_aleatorias
+
+LINHAS = 60_000
+
+
+@pytest.fixture(scope="module")
+def leituras(tmp_path_factory):
+    """CSV (~2 MB) cuja precipitação só deixa de parecer inteira na última linha.
+
+    O Arrow lê CSV em blocos de 1 MB e deduziria int64 pelo primeiro bloco.
+    """
+    tabela = pd.DataFrame(entradas_aleatorias(LINHAS, semente=3))
+    tabela.insert(0, "estacao", np.arange(LINHAS))
+    tabela["precipitacao"] = tabela["precipitacao"].round().astype(int).astype(object)
+    tabela.loc[LINHAS - 1, "precipitacao"] = 1.5
+    caminho = tmp_path_factory.mktemp("entrada") / "leituras.csv"
+    tabela.to_csv(caminho, index=False)
+    return str(caminho), tabela
+
+
+def _esperado(modelo, tabela):
+    X = modelo_risco.codificar_lote(*(tabela[c].to_numpy(dtype=float if c in modelo_risco.COLUNAS_NUMERICAS
+                                                         else object) for c in modelo_risco.ENTRADAS))
+    return modelo.predict(pd.DataFrame(X, columns=modelo_risco.COLUNAS_DO_MODELO))
+
+
+def _saida(destino):
+    return ds.dataset(destino, format="parquet").to_table().sort_by("estacao")
+
+
+def test_csv_com_tipo_que_muda_depois_do_primeiro_bloco(modelo, caminho_modelo, leituras, tmp_path):
+    entrada, tabela = leituras
+    resumo = pontuacao_lote.pontuar_arquivo(entrada, str(tmp_path), caminho_modelo, processos=1,
+                                            tamanho_bloco=25_000)
+    assert resumo["linhas"] == LINHAS
+    assert resumo["blocos"] == 3
+
+    saida = _saida(tmp_path)
+    assert saida.schema.field("precipitacao").type == pa.float64()
+    assert saida.schema.field(pontuacao_lote.COLUNA_SAIDA).type == pa.float64()
+    assert saida.column("precipitacao")[-1].as_py() == 1.5
+    assert np.array_equal(saida.column(pontuacao_lote.COLUNA_SAIDA).to_numpy(), _esperado(modelo, tabela))
+
+
+def test_intervalos_e_processos_paralelos(floresta, caminho_modelo, leituras, tmp_path):
+    entrada, tabela = leituras
+    pontuacao_lote.pontuar_arquivo(entrada, str(tmp_path), caminho_modelo, processos=2,
+                                   tamanho_bloco=25_000, intervalos=True)
+    saida = _saida(tmp_path)
+    X = modelo_risco.codificar_lote(*(saida.column(c).to_numpy(zero_copy_only=False)
+                                      for c in modelo_risco.ENTRADAS))
+    explicacao = floresta.explicar(X)
+    for nome, chave in {pontuacao_lote.COLUNA_SAIDA: "previsao", **pontuacao_lote.COLUNAS_INTERVALO}.items():
+        assert saida.schema.field(nome).type == pa.float64()
+        assert np.array_equal(saida.column(nome).to_numpy(), explicacao[chave])
+
+
+def test_retoma_pulando_blocos_ja_pontuados(caminho_modelo, leituras, tmp_path):
+    entrada, _ = leituras
+    pontuacao_lote.pontuar_arquivo(entrada, str(tmp_path), caminho_modelo, processos=1, tamanho_bloco=25_000)
+    os.remove(tmp_path / pontuacao_lote._nome_parte(1, "parquet"))
+
+    resumo = pontuacao_lote.pontuar_arquivo(entrada, str(tmp_path), caminho_modelo, processos=1,
+                                            tamanho_bloco=25_000)
+    assert (resumo["blocos"], resumo["blocos_pulados"], resumo["linhas"]) == (1, 2, 25_000)
+    assert _saida(tmp_path).num_rows == LINHAS
+
+    with pytest.raises(ValueError, match="tamanho_bloco"):
+        pontuacao_lote.pontuar_arquivo(entrada, str(tmp_path), caminho_modelo, processos=1, tamanho_bloco=10_000)
+
+
+def test_entrada_sem_colunas_do_modelo(caminho_modelo, tmp_path):
+    entrada = tmp_path / "incompleto.csv"
+    entrada.write_text("dias_sem_chuva,precipitacao\n1,2\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="mes"):
+        pontuacao_lote.pontuar_arquivo(str(entrada), str(tmp_path / "saida"), caminho_modelo, processos=1)
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import agregados
+import previsao_volume
+
+EFEITO_MES = np.array([0.0, 0.1, 0.3, 0.2, 0.5, 1.0, 1.8, 2.5, 2.9, 2.0, 1.0, 0.4])
+
+
+def series_sazonais(n_meses=48, ruido=0.1, inicio="2021-01", semente=0):
+    """Séries com nível, tendência e efeito do mês em log(1 + focos), como no modelo."""
+    rng = np.random.default_rng(semente)
+    meses = pd.period_range(inicio, periods=n_meses, freq="M")
+    t = np.arange(n_meses) / 12
+    colunas = {}
+    for bioma, nivel, tendencia in (("Amazônia", 6.0, 0.2), ("Cerrado", 5.0, -0.1), ("Pantanal", 2.0, 0.0)):
+        log = nivel + tendencia * t + EFEITO_MES[meses.month - 1] + rng.normal(0, ruido, n_meses)
+        colunas[bioma] = np.expm1(log)
+    return pd.DataFrame(colunas, index=meses).rename_axis(columns="bioma")
+
+
+def test_forma_datas_e_intervalos():
+    series = series_sazonais()
+    previsao = previsao_volume.prever_series(series, horizonte=6)
+
+    assert list(previsao.columns) == ["bioma", "data", "previsao", "inferior", "superior"]
+    assert len(previsao) == 6 * series.shape[1]
+    for bioma, grupo in previsao.groupby("bioma"):
+        assert list(grupo["data"]) == list(pd.date_range("2025-01-01", periods=6, freq="MS"))
+    assert (previsao["inferior"] <= previsao["previsao"]).all()
+    assert (previsao["previsao"] <= previsao["superior"]).all()
+    assert (previsao["inferior"] >= 0).all()
+
+
+def test_intervalo_cresce_com_o_nivel():
+    series = series_sazonais()
+    estreito = previsao_volume.prever_series(series, nivel=0.5)
+    largo = previsao_volume.prever_series(series, nivel=0.95)
+    np.testing.assert_allclose(estreito["previsao"], largo["previsao"])
+    assert (largo["superior"] - largo["inferior"] > estreito["superior"] - estreito["inferior"]).all()
+
+
+def test_series_sem_ruido_sao_extrapoladas_exatamente():
+    completas = series_sazonais(n_meses=54, ruido=0)
+    previsao = previsao_volume.prever_series(completas.iloc[:48], horizonte=6)
+    esperado = completas.iloc[48:].to_numpy().ravel()
+    np.testing.assert_allclose(previsao["previsao"], esperado, rtol=1e-8)
+    np.testing.assert_allclose(previsao["inferior"], esperado, rtol=1e-6)
+    np.testing.assert_allclose(previsao["superior"], esperado, rtol=1e-6)
+
+
+def test_ajuste_conjunto_igual_ao_de_cada_serie():
+    series = series_sazonais()
+    conjunto = previsao_volume.prever_series(series).set_index(["bioma", "data"])
+    for bioma in series.columns:
+        sozinha = previsao_volume.prever_series(series[[bioma]]).set_index(["bioma", "data"])
+        pd.testing.assert_frame_equal(conjunto.loc[[bioma]], sozinha, rtol=1e-9)
+
+
+def test_poucos_meses():
+    # Abaixo de MESES_MINIMOS_SAZONAL, só nível e tendência
+    previsao = previsao_volume.prever_series(series_sazonais(n_meses=12), horizonte=3)
+    assert len(previsao) == 3 * 3
+    assert (previsao["inferior"] <= previsao["superior"]).all()
+
+    with pytest.raises(ValueError, match="meses"):
+        previsao_volume.prever_series(series_sazonais(n_meses=2))
+
+
+def test_montar_series_do_cubo():
+    dados = pd.DataFrame({
+        "bioma": ["Cerrado", "Cerrado", "Amazônia", "Amazônia"],
+        "ano": [2024, 2024, 2024, 2025],
+        "mes": [11, 12, 12, 2],
+        agregados.VALOR: [5, 7, 3, 4],
+    })
+    tabela = agregados.CuboFocos.a_partir_de_dados(dados).tabela
+
+    series = previsao_volume.montar_series(tabela)
+    assert list(series.index.astype(str)) == ["2024-11", "2024-12", "2025-01", "2025-02"]
+    assert series.loc[pd.Period("2025-01", "M")].tolist() == [0, 0, 0]
+    assert series[agregados.TODOS].tolist() == [5, 10, 0, 4]
+
+    # Mês da marca d'água ainda em andamento fica de fora; mês fechado, não
+    assert series.index[-1] not in previsao_volume.montar_series(tabela, "2025-02-10").index
+    assert series.index[-1] in previsao_volume.montar_series(tabela, "2025-02-28").index
+
+
+def test_previsao_em_cache(tmp_path, monkeypatch):
+    caminho = str(tmp_path / "previsao.parquet")
+    series = series_sazonais()
+    primeira = previsao_volume.previsao_em_cache(series, caminho)
+
+    def nao_reajustar(*args, **kwargs):
+        raise AssertionError("a previsão deveria vir do cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(previsao_volume, "prever_series", nao_reajustar)
+        pd.testing.assert_frame_equal(previsao_volume.previsao_em_cache(series, caminho), primeira,
+                                      check_dtype=False)
+
+    # Uma correção em um mês antigo muda a assinatura e força novo ajuste
+    corrigida = series.copy()
+    corrigida.iloc[0, 0] += 100
+    segunda = previsao_volume.previsao_em_cache(corrigida, caminho)
+    assert not np.allclose(segunda["previsao"], primeira["previsao"])
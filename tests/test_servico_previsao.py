@@ -0,0 +1,116 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+import modelo_risco
+import servico_previsao
+
+REGISTRO = {"dias_sem_chuva": 15, "precipitacao": 0, "mes": 9, "latitude": -10, "longitude": -55,
+            "bioma": "Cerrado", "satelite": "AQUA_M"}
+
+
+@pytest.fixture
+def servidor(caminho_modelo):
+    servidor = servico_previsao.criar_servidor(caminho_modelo, porta=0)
+    threading.Thread(target=servidor.serve_forever, args=(0.05,), daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def requisitar(servidor, metodo, rota, corpo=None, cabecalhos=None):
+    conexao = http.client.HTTPConnection(*servidor.server_address, timeout=10)
+    try:
+        if isinstance(corpo, (dict, list)):
+            corpo = json.dumps(corpo).encode("utf-8")
+        conexao.request(metodo, rota, body=corpo, headers=cabecalhos or {})
+        resposta = conexao.getresponse()
+        dados = resposta.read().decode("utf-8")
+        if resposta.getheader("Content-Type", "").startswith("application/json"):
+            dados = json.loads(dados)
+        return resposta.status, dados
+    finally:
+        conexao.close()
+
+
+def test_previsao_de_um_registro_e_de_uma_lista(servidor, floresta):
+    esperado = floresta.prever_um(*(REGISTRO[c] for c in modelo_risco.ENTRADAS))
+    assert requisitar(servidor, "POST", "/prever", REGISTRO) == (200, {"risco_fogo": esperado})
+
+    status, resposta = requisitar(servidor, "POST", "/prever", [REGISTRO, {**REGISTRO, "bioma": None}])
+    assert status == 200
+    assert resposta["risco_fogo"][0] == esperado
+    assert len(resposta["risco_fogo"]) == 2
+
+
+@pytest.mark.parametrize("corpo, erro", [
+    (b"\xff\xfe{", "JSON inválido."),
+    (b"{\"dias_sem_chuva\": ", "JSON inválido."),
+    ({**REGISTRO, "bioma": ["Cerrado"]}, "O campo 'bioma' deve ser um texto."),
+    ({**REGISTRO, "satelite": {"nome": "AQUA_M"}}, "O campo 'satelite' deve ser um texto."),
+    ({**REGISTRO, "mes": "setembro"}, "Os campos numéricos devem ser números."),
+    ({k: v for k, v in REGISTRO.items() if k != "latitude"}, "Campo obrigatório ausente: latitude"),
+    ([REGISTRO, 3], "O corpo deve ser um objeto JSON ou uma lista de objetos."),
+    ([], "Nenhum registro enviado."),
+    ({**REGISTRO, "precipitacao": "NaN"}, "Os campos numéricos devem ser números finitos."),
+    ({**REGISTRO, "latitude": "-Infinity"}, "Os campos numéricos devem ser números finitos."),
+    (b'{"dias_sem_chuva": NaN, "precipitacao": 0, "mes": 9, "latitude": -10, "longitude": -55}',
+     "Os campos numéricos devem ser números finitos."),
+    ({**REGISTRO, "mes": 1e300}, "Os campos numéricos devem ser números finitos."),
+    ([REGISTRO] * (servico_previsao.MAX_REGISTROS_REQUISICAO + 1),
+     f"No máximo {servico_previsao.MAX_REGISTROS_REQUISICAO} registros por requisição."),
+])
+def test_entrada_invalida_responde_400(servidor, corpo, erro):
+    assert requisitar(servidor, "POST", "/prever", corpo) == (400, {"erro": erro})
+
+
+def test_content_length_invalido_responde_400(servidor):
+    assert requisitar(servidor, "POST", "/prever", b"{}", {"Content-Length": "abc"}) == (
+        400, {"erro": "Content-Length inválido."})
+
+
+def test_content_length_negativo_ou_grande_demais_responde_400(servidor):
+    # O corpo não é lido: com -1 a leitura esperaria o fim da conexão
+    assert requisitar(servidor, "POST", "/prever", b"{}", {"Content-Length": "-1"}) == (
+        400, {"erro": "Content-Length inválido."})
+    limite = servico_previsao.MAX_BYTES_CORPO
+    assert requisitar(servidor, "POST", "/prever", b"{}", {"Content-Length": str(limite + 1)}) == (
+        400, {"erro": f"Corpo maior que o limite de {limite} bytes."})
+
+
+def test_limite_de_registros_cabe_no_corpo(servidor):
+    registros = [REGISTRO] * servico_previsao.MAX_REGISTROS_REQUISICAO
+    status, resposta = requisitar(servidor, "POST", "/prever", registros)
+    assert status == 200
+    assert len(resposta["risco_fogo"]) == len(registros)
+
+
+def test_falha_do_modelo_responde_500_e_o_servico_continua(servidor, monkeypatch, capsys):
+    def falhar(self, X):
+        raise RuntimeError("falha simulada")
+
+    with monkeypatch.context() as m:
+        m.setattr(modelo_risco.FlorestaCompilada, "prever", falhar)
+        assert requisitar(servidor, "POST", "/prever", REGISTRO) == (
+            500, {"erro": "Erro interno ao calcular a previsão."})
+    assert "falha simulada" in capsys.readouterr().err
+
+    status, _ = requisitar(servidor, "POST", "/prever", REGISTRO)
+    assert status == 200
+
+
+def test_latencia_conta_tambem_as_respostas_de_erro(servidor):
+    requisitar(servidor, "POST", "/prever", REGISTRO)
+    requisitar(servidor, "POST", "/prever", b"nao e json")
+    requisitar(servidor, "POST", "/prever", {"bioma": "Cerrado"})
+
+    status, texto = requisitar(servidor, "GET", "/metricas")
+    assert status == 200
+    assert "queimadas_latencia_previsao_segundos_count 3" in texto.splitlines()
+
+
+def test_rota_desconhecida_responde_404(servidor):
+    assert requisitar(servidor, "POST", "/outra", REGISTRO)[0] == 404
+    assert requisitar(servidor, "GET", "/outra")[0] == 404
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+import superficie_risco
+
+
+def test_mascara_ignora_focos_sem_bioma():
+    df = pd.DataFrame({
+        "longitude": [-50.05, -50.04, -50.03, -50.02, -60.05, -45.0, -80.0],
+        "latitude": [-10.05, -10.04, -10.03, -10.02, -5.05, -20.0, -10.0],
+        "bioma": [None, None, "Cerrado", None, None, "Mata Atlântica", "Amazônia"],
+    })
+    mascara = superficie_risco.construir_mascara_biomas(df)
+    assert mascara["biomas"].tolist() == ["Cerrado", "Mata Atlântica"]
+
+    # Célula com maioria de focos sem bioma fica com o bioma dos demais;
+    # célula só com focos sem bioma e pontos fora do Brasil ficam sem bioma
+    biomas = superficie_risco.biomas_nos_pontos(mascara, [-50.05, -60.05, -45.0, -80.0], [-10.05, -5.05, -20.0, -10.0])
+    assert biomas.tolist() == ["Cerrado", None, "Mata Atlântica", None]
+
+
+def test_mascara_sem_nenhum_bioma():
+    df = pd.DataFrame({"longitude": [-50.0, -51.0], "latitude": [-10.0, -11.0], "bioma": [None, np.nan]})
+    mascara = superficie_risco.construir_mascara_biomas(df)
+    assert len(mascara["biomas"]) == 0
+    assert (mascara["codigos"] == -1).all()
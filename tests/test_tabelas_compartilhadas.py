@@ -0,0 +1,69 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import tabelas_compartilhadas
+
+
+def mapa_csv(caminho, n=1000, semente=0):
+    rng = np.random.default_rng(semente)
+    df = pd.DataFrame({
+        "ano": rng.integers(2003, 2026, n),
+        "mes": rng.integers(1, 13, n),
+        "bioma": rng.choice(["Cerrado", "Amazônia", "Pantanal"], n),
+        "latitude": rng.uniform(-33, 5, n).round(4),
+        "longitude": rng.uniform(-73, -35, n).round(4),
+        "estado": None,
+        "risco_fogo": rng.integers(0, 2, n).astype(float),
+    })
+    # Colunas que mudam de tipo entre blocos: risco inteiro no começo, estado só no fim
+    df.loc[n - 1, "risco_fogo"] = 0.5
+    df.loc[n - 10:, "estado"] = "Mato Grosso"
+    df.to_csv(caminho, index=False)
+    return df
+
+
+def test_conversao_em_blocos_com_tipos_compactos(tmp_path):
+    caminho = str(tmp_path / "dados_para_mapa.csv")
+    original = mapa_csv(caminho)
+    destino = tabelas_compartilhadas.converter_csv_para_arrow(caminho, tamanho_bloco=128)
+
+    with pa.memory_map(destino, "r") as arquivo:
+        leitor = pa.ipc.open_file(arquivo)
+        # Um único lote: a leitura do app é sem cópia
+        assert leitor.num_record_batches == 1
+
+    df = tabelas_compartilhadas.carregar_tabela_compartilhada(caminho)
+    assert df["ano"].dtype == "int16" and df["mes"].dtype == "int8"
+    assert df["latitude"].dtype == "float32"
+    assert df["bioma"].dtype == "category" and df["estado"].dtype == "category"
+    assert df["risco_fogo"].dtype == "float64"
+    for coluna in ["ano", "mes", "latitude", "longitude", "risco_fogo"]:
+        np.testing.assert_allclose(df[coluna], original[coluna], rtol=1e-6)
+    assert df["bioma"].tolist() == original["bioma"].tolist()
+    assert df["estado"].isna().sum() == len(df) - 10
+    assert not [nome for nome in os.listdir(tmp_path) if nome.endswith(".tmp")]
+
+
+def test_conversoes_simultaneas(tmp_path):
+    caminho = str(tmp_path / "dados_para_mapa.csv")
+    mapa_csv(caminho, n=20_000)
+    erros = []
+
+    def converter():
+        try:
+            tabelas_compartilhadas.converter_csv_para_arrow(caminho, tamanho_bloco=2000)
+        except Exception as erro:
+            erros.append(erro)
+
+    tarefas = [threading.Thread(target=converter) for _ in range(4)]
+    for tarefa in tarefas:
+        tarefa.start()
+    for tarefa in tarefas:
+        tarefa.join()
+    assert not erros
+    assert len(tabelas_compartilhadas.carregar_tabela_compartilhada(caminho)) == 20_000
+    assert not [nome for nome in os.listdir(tmp_path) if nome.endswith(".tmp")]
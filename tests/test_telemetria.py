@@ -0,0 +1,27 @@
+import os
+import threading
+
+import telemetria
+
+
+def test_escrita_prometheus_simultanea(tmp_path):
+    caminho = str(tmp_path / "queimadas.prom")
+    erros = []
+
+    def escrever():
+        try:
+            for _ in range(50):
+                telemetria.escrever_prometheus(caminho)
+        except Exception as erro:
+            erros.append(erro)
+
+    tarefas = [threading.Thread(target=escrever) for _ in range(8)]
+    for tarefa in tarefas:
+        tarefa.start()
+    for tarefa in tarefas:
+        tarefa.join()
+
+    assert not erros
+    assert os.listdir(tmp_path) == ["queimadas.prom"]
+    with open(caminho, encoding="utf-8") as arquivo:
+        assert arquivo.read() == telemetria.texto_prometheus()
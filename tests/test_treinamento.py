@@ -0,0 +1,29 @@
+import pandas as pd
+
+import treinamento
+
+
+def candidatos():
+    return pd.DataFrame({
+        "profundidade": [20, 12, 8, 10, 6],
+        "arvores": [200, 100, 50, 50, 50],
+        "r2": [0.800, 0.795, 0.700, 0.792, 0.780],
+        "nos": [90_000, 30_000, 2_000, 20_000, 5_000],
+    })
+
+
+def test_menos_nos_dentro_da_tolerancia():
+    # Dentro de 0,01 do melhor R² (0,80): 0,800, 0,795 e 0,792 → o de 20 mil nós
+    escolhido = treinamento.escolher_candidato(candidatos(), tolerancia_r2=0.01)
+    assert (escolhido["profundidade"], escolhido["nos"]) == (10, 20_000)
+    # Mais tolerância admite candidatos menores; tolerância zero fica com o melhor
+    assert treinamento.escolher_candidato(candidatos(), tolerancia_r2=0.05)["nos"] == 5_000
+    assert treinamento.escolher_candidato(candidatos(), tolerancia_r2=0.0)["r2"] == 0.800
+
+
+def test_limite_da_tolerancia_incluido_e_empate_pelo_r2():
+    df = pd.DataFrame({"r2": [0.75, 0.5, 0.625], "nos": [100, 10, 10]})
+    # 0,5 fica exatamente no limite (0,75 - 0,25); com o mesmo número de nós, vence o maior R²
+    assert treinamento.escolher_candidato(df, tolerancia_r2=0.25)["r2"] == 0.625
+    assert treinamento.escolher_candidato(df.iloc[:2], tolerancia_r2=0.25)["r2"] == 0.5
+    assert treinamento.escolher_candidato(df.iloc[:2], tolerancia_r2=0.24)["r2"] == 0.75
@@ -0,0 +1,83 @@
+import json
+import os
+
+import joblib
+import pytest
+
+import modelo_risco
+import versoes_modelo
+
+
+def gravar_versao(diretorio, versao, **metadados):
+    base = os.path.join(diretorio, f"{versoes_modelo.PREFIXO}-{versao}")
+    open(base + ".joblib", "w").close()
+    metadados = {"versao": versao, "formato": versoes_modelo.FORMATO_ARTEFATO,
+                 "colunas": list(modelo_risco.COLUNAS_DO_MODELO), "sklearn": versoes_modelo.versao_sklearn(),
+                 **metadados}
+    with open(base + ".json", "w", encoding="utf-8") as arquivo:
+        json.dump(metadados, arquivo)
+    return base + ".joblib"
+
+
+def _outra_versao_menor():
+    maior, menor = versoes_modelo.versao_sklearn().split(".")[:2]
+    return f"{maior}.{int(menor) + 1}.0"
+
+
+def test_escolhe_a_mais_nova_compativel(tmp_path):
+    diretorio = str(tmp_path)
+    maior_menor = ".".join(versoes_modelo.versao_sklearn().split(".")[:2])
+    gravar_versao(diretorio, "20250101-000000")
+    esperado = gravar_versao(diretorio, "20250102-000000", sklearn=f"{maior_menor}.99")  # só o patch muda
+    gravar_versao(diretorio, "20250201-000000", colunas=modelo_risco.COLUNAS_DO_MODELO[:-1])
+    gravar_versao(diretorio, "20250202-000000", colunas=modelo_risco.COLUNAS_DO_MODELO[::-1])
+    gravar_versao(diretorio, "20250301-000000", sklearn=_outra_versao_menor())
+    gravar_versao(diretorio, "20250301-000000-2", formato=versoes_modelo.FORMATO_ARTEFATO + 1)
+    # Treino interrompido (sem metadados) e metadados sem o modelo
+    open(os.path.join(diretorio, f"{versoes_modelo.PREFIXO}-20250401-000000.joblib"), "w").close()
+    os.remove(gravar_versao(diretorio, "20250402-000000"))
+    with open(os.path.join(diretorio, f"{versoes_modelo.PREFIXO}-20250403-000000.json"), "w") as arquivo:
+        arquivo.write("{corrompido")
+
+    assert [m["versao"] for m in versoes_modelo.listar_versoes(diretorio)] == [
+        "20250301-000000-2", "20250301-000000", "20250202-000000", "20250201-000000",
+        "20250102-000000", "20250101-000000"]
+    caminho, metadados = versoes_modelo.escolher_modelo(diretorio, str(tmp_path / "legado.joblib"))
+    assert caminho == esperado and metadados["versao"] == "20250102-000000"
+
+
+def test_sem_versao_compativel_usa_o_legado(tmp_path):
+    diretorio = str(tmp_path / "modelos")
+    legado = str(tmp_path / "modelo_risco_fogo.joblib")
+    with pytest.raises(FileNotFoundError):
+        versoes_modelo.escolher_modelo(diretorio, legado)
+
+    os.makedirs(diretorio)
+    gravar_versao(diretorio, "20250101-000000", sklearn=_outra_versao_menor())
+    open(legado, "w").close()
+    assert versoes_modelo.escolher_modelo(diretorio, legado) == (legado, None)
+
+
+def test_versoes_no_mesmo_segundo(tmp_path, monkeypatch):
+    diretorio = str(tmp_path)
+    monkeypatch.setattr(versoes_modelo.time, "strftime", lambda formato: "20250101-120000")
+    versoes = [versoes_modelo._reservar_versao(diretorio) for _ in range(11)]
+    assert versoes == ["20250101-120000"] + [f"20250101-120000-{n}" for n in range(2, 12)]
+    assert len(os.listdir(diretorio)) == 11
+
+    # A mais nova é a de maior sufixo (e não a alfabeticamente maior, '-9')
+    for versao in versoes:
+        gravar_versao(diretorio, versao)
+    assert [m["versao"] for m in versoes_modelo.listar_versoes(diretorio)] == versoes[::-1]
+    assert versoes_modelo.escolher_modelo(diretorio)[1]["versao"] == "20250101-120000-11"
+
+
+def test_salvar_versao(modelo, tmp_path):
+    diretorio = str(tmp_path / "modelos")
+    salvo = versoes_modelo.salvar_versao(modelo, {"metricas": {"r2": 0.5}}, diretorio)
+    caminho, metadados = versoes_modelo.escolher_modelo(diretorio, str(tmp_path / "legado.joblib"))
+    assert caminho == salvo["caminho"] and metadados == salvo
+    assert metadados["metricas"] == {"r2": 0.5}
+    assert metadados["artefato"]["tamanho_bytes"] == os.path.getsize(caminho)
+    assert not [nome for nome in os.listdir(diretorio) if nome.endswith(".tmp")]
+    assert joblib.load(caminho).n_estimators == modelo.n_estimators
@@ -0,0 +1,327 @@
+# ==============================================================================
+# TREINAMENTO DO MODELO DE RISCO DE FOGO
+# ==============================================================================
+# Refaz o RandomForestRegressor de risco_fogo a partir dos focos do mapa
+# (colunas meteorológicas gravadas por ingestao_inpe.py), com a mesma
+# codificação de COLUNAS_DO_MODELO usada na previsão (codificar_lote).
+#
+# Etapas:
+#   1. leitura em lotes do dataset do mapa (Parquet ou CSV), só das colunas
+#      do modelo e dos meses da janela de treino, com amostragem uniforme
+#      para no máximo --amostra focos;
+#   2. validação temporal: os últimos --meses-validacao meses da janela
+#      ficam fora do ajuste e medem o R²;
+#   3. busca de hiperparâmetros em paralelo (um processo por combinação de
+#      profundidade × folha mínima). Cada combinação ajusta uma única
+#      floresta com o maior número de árvores da grade: as k primeiras
+#      árvores de uma floresta são exatamente a floresta de k árvores com a
+#      mesma semente, então todos os tamanhos são avaliados sem novo ajuste;
+#   4. entre os candidatos com R² até --tolerancia-r2 abaixo do melhor, fica
+#      o de menos nós (arquivo menor e avaliação mais rápida), que é
+#      reajustado com a janela inteira e gravado como nova versão
+#      (versoes_modelo.py).
+#
+# Uso:
+#     python treinamento.py [dados_mapa_parquet] [--desde 2015-01] [--ate 2024-12]
+#                           [--amostra 300000] [--tolerancia-r2 0.01] [--processos 4]
+# ==============================================================================
+import argparse
+import itertools
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+
+import dados_mapa
+import modelo_risco
+import versoes_modelo
+
+ALVO = "risco_fogo"
+COLUNAS_TREINO = ["ano", "mes", "bioma", "satelite", "latitude", "longitude",
+                  "dias_sem_chuva", "precipitacao", ALVO]
+
+# Grade padrão de hiperparâmetros
+PROFUNDIDADES = [8, 12, 16, 20]
+FOLHAS_MINIMAS = [1, 5, 20]
+ARVORES = [10, 25, 50, 100]
+
+AMOSTRA_PADRAO = 300_000
+TOLERANCIA_R2 = 0.01
+MESES_VALIDACAO = 12
+SEMENTE = 42
+
+
+def _mes_absoluto(texto):
+    """'AAAA-MM' → ano * 12 + mês (None passa direto)."""
+    if texto is None:
+        return None
+    ano, mes = (int(p) for p in texto.split("-"))
+    return ano * 12 + mes
+
+
+# ==============================================================================
+# LEITURA DOS DADOS
+# ==============================================================================
+def _filtro_anos(desde, ate):
+    # O ano é partição: os anos fora da janela nem são abertos
+    filtro = ds.field(ALVO).is_valid()
+    if desde is not None:
+        filtro &= ds.field("ano") >= (desde - 1) // 12
+    if ate is not None:
+        filtro &= ds.field("ano") <= (ate - 1) // 12
+    return filtro
+
+
+def _verificar_colunas(fonte, colunas):
+    faltantes = [c for c in COLUNAS_TREINO if c not in colunas]
+    if faltantes:
+        raise ValueError(f"'{fonte}' não tem as colunas {', '.join(faltantes)} (use os dados de ingestao_inpe.py).")
+
+
+def _abrir_dataset_treino(fonte):
+    dataset = dados_mapa.abrir_dataset_mapa(fonte)
+    _verificar_colunas(fonte, dataset.schema.names)
+    return dataset
+
+
+def _lotes_da_fonte(fonte, desde, ate):
+    # Lotes Arrow (RecordBatch): nada vira pandas antes da amostragem
+    if os.path.isdir(fonte):
+        yield from _abrir_dataset_treino(fonte).to_batches(columns=COLUNAS_TREINO, filter=_filtro_anos(desde, ate))
+    else:
+        _verificar_colunas(fonte, pd.read_csv(fonte, nrows=0).columns)
+        # Tipos fixos: deduzidos por bloco, os lotes poderiam não se concatenar
+        tipos = {c: pa.string() if c in ("bioma", "satelite") else pa.float64() for c in COLUNAS_TREINO}
+        opcoes = pa_csv.ConvertOptions(include_columns=COLUNAS_TREINO, column_types=tipos)
+        yield from pa_csv.open_csv(fonte, convert_options=opcoes)
+
+
+def _mascara_lote(lote, desde, ate, fracao, rng):
+    # Focos completos, dentro da janela de meses e sorteados com probabilidade `fracao`
+    dentro = np.ones(lote.num_rows, dtype=bool)
+    for coluna in COLUNAS_TREINO:
+        if coluna not in ("bioma", "satelite") and lote.column(coluna).null_count:
+            dentro &= pc.is_valid(lote.column(coluna)).to_numpy(zero_copy_only=False)
+    if desde is not None or ate is not None:
+        mes_absoluto = (np.nan_to_num(lote.column("ano").to_numpy(zero_copy_only=False)).astype(np.int64) * 12
+                        + np.nan_to_num(lote.column("mes").to_numpy(zero_copy_only=False)).astype(np.int64))
+        if desde is not None:
+            dentro &= mes_absoluto >= desde
+        if ate is not None:
+            dentro &= mes_absoluto <= ate
+    if fracao < 1.0:
+        dentro &= rng.random(lote.num_rows) < fracao
+    return dentro
+
+
+def _menores_chaves(tabelas, chaves, n):
+    # Só as n linhas de menor chave aleatória, na ordem original
+    chaves = np.concatenate(chaves)
+    escolhidas = np.sort(np.argpartition(chaves, n)[:n])
+    return [pa.concat_tables(tabelas).take(pa.array(escolhidas))], [chaves[escolhidas]]
+
+
+def ler_dados_treino(fonte, desde=None, ate=None, amostra=AMOSTRA_PADRAO, semente=SEMENTE):
+    """Focos da janela [desde, ate] ('AAAA-MM'), amostrados uniformemente.
+
+    No dataset Parquet, cada lote é antes sorteado com probabilidade fixa
+    (estimada pela contagem do dataset). Depois, cada foco recebe uma chave
+    aleatória e só os `amostra` de menor chave ficam (amostra uniforme sem
+    reposição): o conjunto é podado sempre que passa de 2 × amostra, então
+    a memória fica limitada pela amostra mesmo num CSV, cujo total não se
+    conhece antes da leitura.
+    """
+    desde, ate = _mes_absoluto(desde), _mes_absoluto(ate)
+    rng = np.random.default_rng(semente)
+    fracao = 1.0
+    if amostra and os.path.isdir(fonte):
+        total = _abrir_dataset_treino(fonte).count_rows(filter=_filtro_anos(desde, ate))
+        fracao = min(1.0, 1.2 * amostra / max(total, 1))
+
+    selecionados, chaves, linhas = [], [], 0
+    for lote in _lotes_da_fonte(fonte, desde, ate):
+        dentro = _mascara_lote(lote, desde, ate, fracao, rng)
+        if not dentro.any():
+            continue
+        selecionados.append(pa.Table.from_batches([lote]).filter(pa.array(dentro)))
+        chaves.append(rng.random(selecionados[-1].num_rows))
+        linhas += selecionados[-1].num_rows
+        if amostra and linhas > 2 * amostra:
+            selecionados, chaves = _menores_chaves(selecionados, chaves, amostra)
+            linhas = amostra
+    if not selecionados:
+        raise ValueError("Nenhum foco com risco_fogo na janela pedida.")
+    if amostra and linhas > amostra:
+        selecionados, chaves = _menores_chaves(selecionados, chaves, amostra)
+    return pa.concat_tables(selecionados).to_pandas().astype({"bioma": str, "satelite": str})
+
+
+def codificar(df):
+    """Matriz no layout exato de COLUNAS_DO_MODELO (a mesma da previsão)."""
+    X = modelo_risco.codificar_lote(df["dias_sem_chuva"], df["precipitacao"], df["mes"], df["latitude"],
+                                    df["longitude"], df["bioma"].to_numpy(), df["satelite"].to_numpy())
+    return X, df[ALVO].to_numpy(dtype=np.float64)
+
+
+def dividir_temporal(df, meses_validacao=MESES_VALIDACAO, semente=SEMENTE):
+    """Máscara de validação: os últimos meses da janela (ou 20% aleatórios, se ela for curta)."""
+    mes_absoluto = df["ano"].to_numpy(np.int64) * 12 + df["mes"].to_numpy(np.int64)
+    meses = np.unique(mes_absoluto)
+    if len(meses) > meses_validacao:
+        return mes_absoluto > meses[-meses_validacao - 1]
+    return np.random.default_rng(semente).random(len(df)) < 0.2
+
+
+# ==============================================================================
+# BUSCA DE HIPERPARÂMETROS
+# ==============================================================================
+def _floresta(n_arvores, profundidade, folha_minima, semente, n_jobs=1):
+    from sklearn.ensemble import RandomForestRegressor
+
+    return RandomForestRegressor(n_estimators=n_arvores, max_depth=profundidade,
+                                 min_samples_leaf=folha_minima, random_state=semente, n_jobs=n_jobs)
+
+
+def _avaliar_combinacao(X_treino, y_treino, X_valid, y_valid, profundidade, folha_minima, arvores, semente):
+    # Roda em um processo de trabalho: uma floresta com o maior número de
+    # árvores, avaliada em cada prefixo de `arvores`
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    inicio = time.perf_counter()
+    floresta = _floresta(max(arvores), profundidade, folha_minima, semente).fit(X_treino, y_treino)
+    tempo_ajuste = time.perf_counter() - inicio
+
+    resultados, soma, nos = [], np.zeros(len(y_valid)), 0
+    for k, arvore in enumerate(floresta.estimators_, start=1):
+        soma += arvore.predict(X_valid)
+        nos += arvore.tree_.node_count
+        if k in arvores:
+            previsao = soma / k
+            resultados.append({
+                "arvores": k, "profundidade": profundidade, "folha_minima": folha_minima,
+                "r2": float(r2_score(y_valid, previsao)),
+                "mae": float(mean_absolute_error(y_valid, previsao)),
+                "nos": int(nos),
+                "profundidade_real": int(max(a.tree_.max_depth for a in floresta.estimators_[:k])),
+                "tempo_ajuste_s": round(tempo_ajuste * k / max(arvores), 2),
+            })
+    return resultados
+
+
+def buscar_hiperparametros(X_treino, y_treino, X_valid, y_valid, profundidades=PROFUNDIDADES,
+                           folhas_minimas=FOLHAS_MINIMAS, arvores=ARVORES, processos=None, semente=SEMENTE):
+    """Avalia a grade em paralelo; devolve um DataFrame com um candidato por linha."""
+    from joblib import Parallel, delayed
+
+    combinacoes = list(itertools.product(profundidades, folhas_minimas))
+    # As matrizes grandes vão para os processos por memory-map (joblib), sem cópia por tarefa
+    resultados = Parallel(n_jobs=processos or -1)(
+        delayed(_avaliar_combinacao)(X_treino, y_treino, X_valid, y_valid, p, f, sorted(arvores), semente)
+        for p, f in combinacoes
+    )
+    return pd.DataFrame([r for lista in resultados for r in lista])
+
+
+def escolher_candidato(candidatos, tolerancia_r2=TOLERANCIA_R2):
+    """O candidato com menos nós entre os que ficam a até `tolerancia_r2` do melhor R²."""
+    melhor = candidatos["r2"].max()
+    aceitos = candidatos[candidatos["r2"] >= melhor - tolerancia_r2]
+    return aceitos.sort_values(["nos", "r2"], ascending=[True, False]).iloc[0]
+
+
+# ==============================================================================
+# PIPELINE
+# ==============================================================================
+def treinar(fonte, desde=None, ate=None, amostra=AMOSTRA_PADRAO, tolerancia_r2=TOLERANCIA_R2,
+            meses_validacao=MESES_VALIDACAO, profundidades=PROFUNDIDADES, folhas_minimas=FOLHAS_MINIMAS,
+            arvores=ARVORES, processos=None, semente=SEMENTE, diretorio=versoes_modelo.DIRETORIO_MODELOS):
+    """Lê, busca, reajusta e grava uma nova versão. Devolve os metadados gravados."""
+    inicio = time.perf_counter()
+    df = ler_dados_treino(fonte, desde, ate, amostra, semente)
+    validacao = dividir_temporal(df, meses_validacao, semente)
+    X, y = codificar(df)
+    tempo_leitura = time.perf_counter() - inicio
+
+    candidatos = buscar_hiperparametros(X[~validacao], y[~validacao], X[validacao], y[validacao],
+                                        profundidades, folhas_minimas, arvores, processos, semente)
+    escolhido = escolher_candidato(candidatos, tolerancia_r2)
+    tempo_busca = time.perf_counter() - inicio - tempo_leitura
+
+    # Reajuste do candidato escolhido com a janela inteira (treino + validação)
+    floresta = _floresta(int(escolhido["arvores"]), int(escolhido["profundidade"]),
+                         int(escolhido["folha_minima"]), semente, n_jobs=processos or -1)
+    floresta.fit(pd.DataFrame(X, columns=modelo_risco.COLUNAS_DO_MODELO), y)
+    floresta.set_params(n_jobs=None)  # previsão sequencial: mesma ordem de soma da floresta compilada
+
+    mes_absoluto = df["ano"].astype(np.int64) * 12 + df["mes"].astype(np.int64)
+    janela = lambda m: f"{(m - 1) // 12:04d}-{(m - 1) % 12 + 1:02d}"  # noqa: E731
+    metadados = {
+        "fonte": os.path.abspath(fonte),
+        "janela": {
+            "desde": janela(int(mes_absoluto.min())), "ate": janela(int(mes_absoluto.max())),
+            "focos": int(len(df)), "focos_validacao": int(validacao.sum()),
+            "validacao": f"últimos {meses_validacao} meses" if len(np.unique(mes_absoluto)) > meses_validacao
+                         else "20% aleatórios",
+        },
+        "hiperparametros": {
+            "n_estimators": int(escolhido["arvores"]), "max_depth": int(escolhido["profundidade"]),
+            "min_samples_leaf": int(escolhido["folha_minima"]), "random_state": semente,
+        },
+        "metricas": {
+            "r2_validacao": round(float(escolhido["r2"]), 4),
+            "mae_validacao": round(float(escolhido["mae"]), 4),
+            "r2_melhor_candidato": round(float(candidatos["r2"].max()), 4),
+            "tolerancia_r2": tolerancia_r2,
+        },
+        "floresta": {
+            "arvores": len(floresta.estimators_),
+            "nos": int(sum(a.tree_.node_count for a in floresta.estimators_)),
+            "profundidade": int(max(a.tree_.max_depth for a in floresta.estimators_)),
+        },
+        "busca": {
+            "candidatos": candidatos.round(4).to_dict(orient="records"),
+            "tempo_leitura_s": round(tempo_leitura, 1),
+            "tempo_busca_s": round(tempo_busca, 1),
+            "tempo_total_s": round(time.perf_counter() - inicio, 1),
+        },
+    }
+    return versoes_modelo.salvar_versao(floresta, metadados, diretorio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treina uma nova versão do modelo de risco de fogo.")
+    parser.add_argument("fonte", nargs="?", default=None,
+                        help="dataset Parquet do mapa ou CSV (padrão: o Parquet, se existir)")
+    parser.add_argument("--desde", help="primeiro mês da janela de treino (AAAA-MM)")
+    parser.add_argument("--ate", help="último mês da janela de treino (AAAA-MM)")
+    parser.add_argument("--amostra", type=int, default=AMOSTRA_PADRAO, help="máximo de focos usados (0 = todos)")
+    parser.add_argument("--tolerancia-r2", type=float, default=TOLERANCIA_R2)
+    parser.add_argument("--meses-validacao", type=int, default=MESES_VALIDACAO)
+    parser.add_argument("--profundidades", type=int, nargs="+", default=PROFUNDIDADES)
+    parser.add_argument("--folhas-minimas", type=int, nargs="+", default=FOLHAS_MINIMAS)
+    parser.add_argument("--arvores", type=int, nargs="+", default=ARVORES)
+    parser.add_argument("--processos", type=int, help="processos da busca (padrão: todos os núcleos)")
+    parser.add_argument("--semente", type=int, default=SEMENTE)
+    parser.add_argument("--diretorio", default=versoes_modelo.DIRETORIO_MODELOS)
+    args = parser.parse_args()
+
+    fonte = args.fonte or (dados_mapa.CAMINHO_PARQUET_MAPA if dados_mapa.existe_parquet_mapa()
+                           else dados_mapa.CAMINHO_CSV_MAPA)
+    metadados = treinar(fonte, args.desde, args.ate, args.amostra, args.tolerancia_r2, args.meses_validacao,
+                        args.profundidades, args.folhas_minimas, args.arvores, args.processos, args.semente,
+                        args.diretorio)
+    floresta, metricas, artefato = metadados["floresta"], metadados["metricas"], metadados["artefato"]
+    print(f"✅ Versão {metadados['versao']}: {floresta['arvores']} árvores, profundidade {floresta['profundidade']}, "
+          f"{floresta['nos']:,} nós | R² validação {metricas['r2_validacao']:.4f} "
+          f"(melhor candidato {metricas['r2_melhor_candidato']:.4f}) | "
+          f"{artefato['tamanho_bytes'] / 1024 ** 2:.1f} MB, carga {artefato['tempo_carga_s']:.2f} s "
+          f"→ '{metadados['caminho']}' ({metadados['busca']['tempo_total_s']:.0f} s)")
+
+
+if __name__ == "__main__":
+    main()
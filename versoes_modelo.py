@@ -0,0 +1,135 @@
+# ==============================================================================
+# VERSÕES DO MODELO DE RISCO DE FOGO (ARTEFATOS COM METADADOS)
+# ==============================================================================
+# Cada treino de treinamento.py grava, em 'modelos/':
+#   - modelo_risco_fogo-<versao>.joblib  o RandomForestRegressor;
+#   - modelo_risco_fogo-<versao>.json    metadados: features (na ordem de
+#     COLUNAS_DO_MODELO), janela de treino, hiperparâmetros, métricas de
+#     validação, número de árvores/nós, tamanho e tempo de carga do arquivo,
+#     e a versão do scikit-learn usada.
+#
+# A versão é o instante do treino (AAAAMMDD-HHMMSS, com sufixo -2, -3...
+# para treinos no mesmo segundo), ordenada pelo instante e depois pelo
+# número do sufixo. O JSON é gravado por último: um artefato sem metadados
+# (treino interrompido) nunca é escolhido.
+#
+# escolher_modelo() devolve a versão mais nova compatível com este código
+# (mesmas features e mesma versão maior.menor do scikit-learn, que não
+# garante ler pickles de outras versões) e, se não houver nenhuma, o
+# arquivo legado 'modelo_risco_fogo.joblib'. Este módulo não importa o
+# scikit-learn, para não pesar na partida do app.
+# ==============================================================================
+import glob
+import itertools
+import json
+import os
+import time
+from importlib import metadata
+
+import modelo_risco
+
+DIRETORIO_MODELOS = "modelos"
+CAMINHO_MODELO_LEGADO = "modelo_risco_fogo.joblib"
+PREFIXO = "modelo_risco_fogo"
+FORMATO_ARTEFATO = 1
+
+
+def versao_sklearn():
+    try:
+        return metadata.version("scikit-learn")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _maior_menor(versao):
+    return ".".join(str(versao).split(".")[:2]) if versao else None
+
+
+def compativel(metadados):
+    """Se o artefato descrito por `metadados` pode ser usado por este código."""
+    return (
+        metadados.get("formato") == FORMATO_ARTEFATO
+        and metadados.get("colunas") == modelo_risco.COLUNAS_DO_MODELO
+        and _maior_menor(metadados.get("sklearn")) == _maior_menor(versao_sklearn())
+    )
+
+
+def _chave_versao(versao):
+    # '20250101-120000-10' vem depois de '...-2' (na ordem alfabética viria antes)
+    instante, _, sufixo = versao.rpartition("-") if versao.count("-") == 2 else (versao, "", "1")
+    return instante, int(sufixo)
+
+
+def listar_versoes(diretorio=DIRETORIO_MODELOS):
+    """Metadados de todas as versões gravadas, da mais nova para a mais antiga."""
+    versoes = []
+    for caminho_json in glob.glob(os.path.join(diretorio, f"{PREFIXO}-*.json")):
+        try:
+            with open(caminho_json, encoding="utf-8") as arquivo:
+                metadados = json.load(arquivo)
+        except (OSError, ValueError):
+            continue
+        caminho = os.path.splitext(caminho_json)[0] + ".joblib"
+        if os.path.exists(caminho):
+            versoes.append({**metadados, "caminho": caminho})
+    return sorted(versoes, key=lambda m: _chave_versao(m.get("versao", "")), reverse=True)
+
+
+def escolher_modelo(diretorio=DIRETORIO_MODELOS, legado=CAMINHO_MODELO_LEGADO):
+    """(caminho, metadados) da versão compatível mais nova.
+
+    Sem versões compatíveis, usa o arquivo legado (metadados None). Levanta
+    FileNotFoundError se não houver nenhum modelo.
+    """
+    for metadados in listar_versoes(diretorio):
+        if compativel(metadados):
+            return metadados["caminho"], metadados
+    if os.path.exists(legado):
+        return legado, None
+    raise FileNotFoundError(f"Nenhum modelo compatível em '{diretorio}/' nem '{legado}'.")
+
+
+def _reservar_versao(diretorio):
+    # Criação exclusiva do .joblib: dois treinos no mesmo segundo nunca
+    # recebem o mesmo nome
+    instante = time.strftime("%Y%m%d-%H%M%S")
+    for n in itertools.count(1):
+        versao = instante if n == 1 else f"{instante}-{n}"
+        try:
+            with open(os.path.join(diretorio, f"{PREFIXO}-{versao}.joblib"), "x"):
+                return versao
+        except FileExistsError:
+            continue
+
+
+def salvar_versao(modelo, metadados, diretorio=DIRETORIO_MODELOS, compressao=3):
+    """Grava o modelo e os metadados como uma nova versão; devolve os metadados completos."""
+    import joblib
+
+    os.makedirs(diretorio, exist_ok=True)
+    versao = _reservar_versao(diretorio)
+    base = os.path.join(diretorio, f"{PREFIXO}-{versao}")
+    joblib.dump(modelo, base + ".joblib", compress=compressao)
+
+    # Tempo de carga medido lendo de volta o próprio arquivo gravado
+    inicio = time.perf_counter()
+    joblib.load(base + ".joblib")
+    tempo_carga = time.perf_counter() - inicio
+
+    metadados = {
+        "versao": versao,
+        "formato": FORMATO_ARTEFATO,
+        "colunas": list(modelo_risco.COLUNAS_DO_MODELO),
+        "sklearn": versao_sklearn(),
+        **metadados,
+        "artefato": {
+            "tamanho_bytes": os.path.getsize(base + ".joblib"),
+            "tempo_carga_s": round(tempo_carga, 4),
+            "compressao": compressao,
+        },
+    }
+    temporario = base + ".json.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(metadados, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, base + ".json")
+    return {**metadados, "caminho": base + ".joblib"}